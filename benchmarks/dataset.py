@@ -0,0 +1,128 @@
+"""Gera um conjunto de dados sintético do tamanho de um ano letivo.
+
+Uso: python -m benchmarks.dataset --alunos 2000 --vendas 500000 --produtos 300 --saida dados_bench
+Grava clients.json e products.json no diretório informado, no mesmo formato
+lido pelo sistema (--formato indexed grava o snapshot indexado de clientes).
+"""
+import argparse
+import os
+import random
+from datetime import date, timedelta
+from utils.client_snapshot import SNAPSHOT_FORMATS, dump_snapshot
+from utils.file_utils import save_json, write_atomic
+
+CATEGORIES = ["Salgados", "Doces", "Bebidas", "Lanches", "Frutas", "Almoço"]
+PRODUCT_WORDS = [
+    "Pão de Queijo", "Coxinha", "Esfiha", "Suco", "Refrigerante", "Bolo",
+    "Brigadeiro", "Misto Quente", "Pastel", "Água", "Salada de Frutas", "Açaí",
+    "Biscoito", "Iogurte", "Torta", "Sanduíche", "Cookie", "Chá Gelado",
+]
+FLAVORS = ["Frango", "Carne", "Queijo", "Chocolate", "Laranja", "Uva", "Integral", "Natural"]
+PAYMENT_METHODS = ["Dinheiro", "PIX", "Cartão", "Crédito Aluno"]
+
+# Ano letivo: dias úteis de fevereiro a meados de dezembro
+YEAR_START = date(2026, 2, 2)
+YEAR_END = date(2026, 12, 15)
+# Vendas no crédito ficam pendentes só no último mês (as anteriores já foram quitadas)
+PENDING_FROM = "2026-11-15"
+
+
+def school_days(start=YEAR_START, end=YEAR_END):
+    """Datas (AAAA-MM-DD) dos dias úteis do período"""
+    days = []
+    current = start
+    while current <= end:
+        if current.weekday() < 5:
+            days.append(current.isoformat())
+        current += timedelta(days=1)
+    return days
+
+
+def generate_products(count, rng):
+    """Lista de produtos com nomes, categorias, preços e estoque variados"""
+    products = []
+    for i in range(count):
+        base = PRODUCT_WORDS[i % len(PRODUCT_WORDS)]
+        flavor = FLAVORS[(i // len(PRODUCT_WORDS)) % len(FLAVORS)]
+        name = f"{base} {flavor}"
+        if i >= len(PRODUCT_WORDS) * len(FLAVORS):
+            name = f"{name} {i}"
+        products.append({
+            "name": name,
+            "price": round(rng.uniform(1.5, 35.0), 2),
+            "stock": rng.randint(0, 500),
+            "category": CATEGORIES[i % len(CATEGORIES)],
+        })
+    return products
+
+
+def generate_dataset(students=2000, sales=500000, products=300, seed=42):
+    """(clientes, produtos) sintéticos com vendas espalhadas pelo ano letivo.
+
+    Os ids de venda são únicos entre todos os clientes, como os gravados pelo caixa.
+    """
+    rng = random.Random(seed)
+    product_list = generate_products(products, rng)
+    days = school_days()
+    clients = {}
+    for i in range(students):
+        clients[f"Aluno {i:05d}"] = {
+            "credits": round(rng.choice([0.0, 0.0, rng.uniform(5, 200)]), 2),
+            "matricula": f"{2026000 + i}",
+            "sales": [],
+        }
+    names = list(clients.keys())
+
+    for sale_id in range(1, sales + 1):
+        items = []
+        for product in rng.sample(product_list, rng.randint(1, 4)):
+            items.append({"name": product["name"], "price": product["price"], "quantity": rng.randint(1, 3)})
+        total = round(sum(item["price"] * item["quantity"] for item in items), 2)
+        method = rng.choice(PAYMENT_METHODS)
+        day = rng.choice(days)
+        paid = method != "Crédito Aluno" or day < PENDING_FROM
+        clients[rng.choice(names)]["sales"].append({
+            "id": sale_id,
+            "items": items,
+            "total": total,
+            "paid": paid,
+            "date": day,
+            "timestamp": f"{day} {rng.randint(7, 17):02d}:{rng.randint(0, 59):02d}:00",
+            "payment_method": method,
+        })
+
+    # Cada cliente com o histórico em ordem cronológica, como no uso real
+    for client in clients.values():
+        client["sales"].sort(key=lambda sale: sale["timestamp"])
+    return clients, product_list
+
+
+def write_dataset(directory, clients, products, snapshot_format="compact"):
+    """Grava clients.json e products.json; retorna os caminhos"""
+    os.makedirs(directory, exist_ok=True)
+    clients_path = os.path.join(directory, "clients.json")
+    products_path = os.path.join(directory, "products.json")
+    write_atomic(clients_path, dump_snapshot(clients, snapshot_format))
+    save_json(products_path, products)
+    return clients_path, products_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera dados sintéticos de um ano letivo")
+    parser.add_argument("--alunos", type=int, default=2000)
+    parser.add_argument("--vendas", type=int, default=500000)
+    parser.add_argument("--produtos", type=int, default=300)
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--formato", choices=SNAPSHOT_FORMATS, default="compact")
+    parser.add_argument("--saida", default="dados_bench")
+    args = parser.parse_args()
+
+    clients, products = generate_dataset(args.alunos, args.vendas, args.produtos, args.semente)
+    clients_path, products_path = write_dataset(args.saida, clients, products, args.formato)
+    print(f"{len(clients)} alunos, {args.vendas} vendas, {len(products)} produtos")
+    print(clients_path)
+    print(products_path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""Injeção de quedas no save_json: a leitura deve sempre ver a versão anterior ou a nova.
+
+Cenários (1 e 4 em processos filhos encerrados com os._exit/SIGKILL):
+  1. queda logo após cada fsync/rename do save_json (determinístico);
+  2. arquivo principal truncado no meio (gravação rasgada fora do save_json),
+     também no snapshot indexado de clientes;
+  3. soma divergente: o backup é usado e o arquivo recusado fica em .rejeitado;
+     sem o arquivo de soma, a edição manual é aceita;
+  4. SIGKILL em instantes aleatórios durante gravações seguidas.
+Ao final mede o tempo médio de uma gravação.
+
+Uso: python -m benchmarks.durability_check --quedas 50
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import signal
+import tempfile
+import time
+from benchmarks.export_benchmark import generate_clients
+from utils.client_snapshot import ClientSnapshot, dump_snapshot
+from utils.file_utils import (
+    CHECKSUM_SUFFIX, REJECTED_SUFFIX, load_json, load_verified, save_json, write_atomic,
+)
+
+
+def _version(value):
+    return {"version": value, "clients": generate_clients(50, clients_count=10, seed=value)}
+
+
+def _crash_at(path, data, step):
+    """Processo filho: grava e morre logo após a step-ésima operação de disco"""
+    calls = {"count": 0}
+
+    def wrap(func):
+        def wrapped(*args):
+            result = func(*args)
+            calls["count"] += 1
+            if calls["count"] == step:
+                os._exit(1)
+            return result
+        return wrapped
+
+    os.fsync = wrap(os.fsync)
+    os.replace = wrap(os.replace)
+    save_json(path, data)
+    os._exit(0)
+
+
+def _save_forever(path, first_version):
+    version = first_version
+    while True:
+        version += 1
+        save_json(path, _version(version))
+
+
+def _run(context, target, *args):
+    process = context.Process(target=target, args=args)
+    process.start()
+    process.join()
+    return process.exitcode
+
+
+def check_crash_points(context, tmp):
+    """Retorna (pontos testados, falhas)"""
+    failures = []
+    step = 0
+    while True:
+        step += 1
+        path = os.path.join(tmp, f"pontos_{step}.json")
+        save_json(path, _version(1))
+        save_json(path, _version(2))
+        exitcode = _run(context, _crash_at, path, _version(3), step)
+        loaded = load_json(path, None)
+        version = loaded.get("version") if loaded else None
+        if version not in (2, 3) or (exitcode == 0 and version != 3):
+            failures.append((step, version))
+        if exitcode == 0:
+            # O save_json terminou antes da operação: todos os pontos foram cobertos
+            return step - 1, failures
+
+
+def check_torn_write(tmp):
+    path = os.path.join(tmp, "rasgado.json")
+    save_json(path, _version(1))
+    save_json(path, _version(2))
+    with open(path, "rb") as f:
+        content = f.read()
+    with open(path, "wb") as f:
+        f.write(content[:len(content) // 2])
+    loaded = load_json(path, None)
+    return loaded is not None and loaded.get("version") == 1
+
+
+def check_hand_edit(tmp):
+    """Soma divergente: usa o backup e guarda a cópia recusada; sem arquivo de soma, aceita a edição"""
+    path = os.path.join(tmp, "editado.json")
+    save_json(path, _version(1))
+    save_json(path, _version(2))
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"version": 20}, f)
+    if (load_json(path, None) or {}).get("version") != 1:
+        return False
+    with open(f"{path}{REJECTED_SUFFIX}", "r", encoding="utf-8") as f:
+        if json.load(f).get("version") != 20:
+            return False
+    # Edição manual intencional: remove-se o arquivo de soma
+    os.remove(f"{path}{CHECKSUM_SUFFIX}")
+    return (load_json(path, None) or {}).get("version") == 20
+
+
+def check_torn_snapshot(tmp):
+    """Snapshot indexado de clientes truncado no histórico: volta ao backup"""
+    path = os.path.join(tmp, "clients.json")
+    write_atomic(path, dump_snapshot(generate_clients(50, clients_count=10, seed=1), "indexed"))
+    write_atomic(path, dump_snapshot(generate_clients(60, clients_count=10, seed=2), "indexed"))
+    with open(path, "rb") as f:
+        content = f.read()
+    with open(path, "wb") as f:
+        f.write(content[:len(content) - 20])
+    snapshot = load_verified(path, ClientSnapshot, None)
+    return snapshot is not None and sum(len(client["sales"]) for client in snapshot.full().values()) == 50
+
+
+def check_random_kills(context, tmp, kills, seed=7):
+    rng = random.Random(seed)
+    path = os.path.join(tmp, "aleatorio.json")
+    save_json(path, _version(1))
+    failures = 0
+    last_version = 1
+    for _ in range(kills):
+        process = context.Process(target=_save_forever, args=(path, last_version))
+        process.start()
+        time.sleep(rng.uniform(0.005, 0.05))
+        os.kill(process.pid, signal.SIGKILL)
+        process.join()
+        loaded = load_json(path, None)
+        if not loaded or loaded.get("version", 0) < last_version:
+            failures += 1
+        else:
+            last_version = loaded["version"]
+    return failures
+
+
+def measure_save(tmp, rounds=50):
+    path = os.path.join(tmp, "tempo.json")
+    data = _version(1)
+    started = time.perf_counter()
+    for _ in range(rounds):
+        save_json(path, data)
+    return (time.perf_counter() - started) / rounds * 1000, os.path.getsize(path) / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Injeção de quedas na gravação dos arquivos")
+    parser.add_argument("--quedas", type=int, default=50)
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context("fork")
+    with tempfile.TemporaryDirectory() as tmp:
+        points, failures = check_crash_points(context, tmp)
+        print(f"Quedas após cada fsync/rename: {points} pontos, {len(failures)} falhas {failures or ''}")
+        print(f"Arquivo truncado recuperado do backup: {'sim' if check_torn_write(tmp) else 'NÃO'}")
+        print(f"Snapshot de clientes truncado recuperado do backup: {'sim' if check_torn_snapshot(tmp) else 'NÃO'}")
+        print(f"Soma divergente recusada e edição sem soma aceita: {'sim' if check_hand_edit(tmp) else 'NÃO'}")
+        print(f"SIGKILL aleatório: {args.quedas} quedas, {check_random_kills(context, tmp, args.quedas)} falhas")
+        elapsed_ms, size_kb = measure_save(tmp)
+        print(f"Gravação: {elapsed_ms:.2f} ms por arquivo de {size_kb:.0f} KB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Compara a exportação em memória (Workbook normal) com o streaming e o CSV.
+
+Uso: python -m benchmarks.export_benchmark --vendas 50000
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+from openpyxl import Workbook
+from reports.excel_export import (
+    PRODUCTS_HEADER, SALES_HEADER, export_range_csv, export_range_report, sale_cells
+)
+from reports.range_report import build_range_report
+
+START_DATE = "2026-01-01"
+END_DATE = "2026-01-31"
+
+
+def generate_clients(sales_count, clients_count=200, seed=42):
+    """Histórico sintético com vendas distribuídas pelo mês"""
+    rng = random.Random(seed)
+    products = [(f"Produto {i}", round(rng.uniform(2, 80), 2)) for i in range(120)]
+    clients = {f"Cliente {i}": {"credits": 0.0, "sales": []} for i in range(clients_count)}
+    names = list(clients.keys())
+
+    for _ in range(sales_count):
+        sales = clients[rng.choice(names)]["sales"]
+        items = []
+        for name, price in rng.sample(products, rng.randint(1, 5)):
+            items.append({"name": name, "price": price, "quantity": rng.randint(1, 3)})
+        total = round(sum(item["price"] * item["quantity"] for item in items), 2)
+        paid = rng.random() < 0.7
+        sales.append({
+            "id": len(sales) + 1,
+            "date": f"2026-01-{rng.randint(1, 31):02d}",
+            "items": items,
+            "total": total,
+            "paid": paid,
+            "paid_amount": total if paid else 0.0,
+            "payment_method": rng.choice(["dinheiro", "pix", "cartao"])
+        })
+    return clients
+
+
+def export_in_memory(clients_data, output_path):
+    """Implementação anterior: relatório completo + Workbook normal"""
+    report = build_range_report(clients_data, START_DATE, END_DATE)
+    wb = Workbook()
+    ws_sales = wb.active
+    ws_sales.title = "Vendas"
+    ws_sales.append(SALES_HEADER)
+    for row in report["sales_rows"]:
+        ws_sales.append(sale_cells(row))
+    ws_products = wb.create_sheet("Produtos")
+    ws_products.append(PRODUCTS_HEADER)
+    for row in report["products_rows"]:
+        ws_products.append([row["name"], row["qty"], row["total"]])
+    wb.save(output_path)
+
+
+def measure(func, *args):
+    """Retorna (segundos, pico de memória em MB) de uma execução"""
+    start = time.perf_counter()
+    func(*args)
+    elapsed = time.perf_counter() - start
+
+    # O tracemalloc deixa a execução mais lenta, então o pico é medido à parte
+    tracemalloc.start()
+    func(*args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak / (1024 * 1024)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da exportação de relatórios")
+    parser.add_argument("--vendas", type=int, default=20000)
+    args = parser.parse_args()
+
+    clients_data = generate_clients(args.vendas)
+    with tempfile.TemporaryDirectory() as tmp:
+        cases = [
+            ("Workbook em memória", export_in_memory, os.path.join(tmp, "memoria.xlsx")),
+            ("Write-only streaming", lambda data, path: export_range_report(data, START_DATE, END_DATE, path),
+             os.path.join(tmp, "streaming.xlsx")),
+            ("CSV", lambda data, path: export_range_csv(data, START_DATE, END_DATE, path),
+             os.path.join(tmp, "vendas.csv")),
+        ]
+        print(f"{args.vendas} vendas")
+        for label, func, path in cases:
+            elapsed, peak_mb = measure(func, clients_data, path)
+            print(f"{label:<22} {elapsed:8.2f} s  pico {peak_mb:8.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
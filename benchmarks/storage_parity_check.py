@@ -0,0 +1,53 @@
+"""Confere se os backends JSON e SQLite chegam ao mesmo estado com as mesmas operações.
+
+Cobre o caso de produtos com nome repetido, em que a baixa de estoque vale
+só para o primeiro da lista.
+
+Uso: python -m benchmarks.storage_parity_check
+"""
+import os
+import tempfile
+from storage.data_store import DataStore
+from storage.json_repository import JsonRepository
+from storage.sqlite_repository import SQLiteRepository
+
+PRODUCTS = [
+    {"name": "Coxinha", "price": 6.0, "stock": 10, "category": "Salgados"},
+    {"name": "Suco", "price": 5.0, "stock": 8, "category": "Bebidas"},
+    {"name": "Coxinha", "price": 6.5, "stock": 4, "category": "Salgados"},
+    {"name": "Bolo", "price": 7.0, "stock": 0, "category": "Doces"},
+]
+DELTAS = [{"Coxinha": -3, "Suco": -1}, {"Coxinha": -2, "Bolo": 5, "Inexistente": -1}, {"Suco": 0}]
+
+
+def run_backend(repository):
+    """Estoques (no repositório e no DataStore) após as baixas"""
+    repository.save_products([dict(product) for product in PRODUCTS])
+    store = DataStore(repository)
+    store.get_products()
+    for deltas in DELTAS:
+        store.adjust_stock(deltas)
+    stored = [product["stock"] for product in repository.load_products()]
+    in_memory = [product["stock"] for product in store.get_products()]
+    return stored, in_memory
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        json_result = run_backend(JsonRepository(
+            os.path.join(tmp, "clients.json"),
+            os.path.join(tmp, "products.json"),
+            os.path.join(tmp, "company.json"),
+        ))
+        sqlite_repository = SQLiteRepository(os.path.join(tmp, "sistema.db"))
+        sqlite_result = run_backend(sqlite_repository)
+        sqlite_repository.close()
+
+    print(f"JSON   (arquivo, memória): {json_result}")
+    print(f"SQLite (arquivo, memória): {sqlite_result}")
+    same = json_result == sqlite_result and json_result[0] == json_result[1]
+    print(f"Estoque igual nos backends com nomes repetidos: {'sim' if same else 'NÃO'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+"""Mede os caminhos de dados e relatórios sobre um ano letivo sintético, sem interface.
+
+Uso: python -m benchmarks.suite --alunos 2000 --vendas 500000 --produtos 300 --saida resultados.json
+     python -m benchmarks.suite --vendas 50000 --comparar resultados.json
+
+Os resultados (segundos por caso, parâmetros, versão) vão para um JSON; com
+--comparar, cada caso é mostrado ao lado do valor de uma execução anterior.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime
+from benchmarks.dataset import generate_dataset, write_dataset
+from reports.excel_export import export_day_report
+from reports.receipt_generator import generate_receipt_pdf
+from reports.receipt_service import sale_to_order
+from reports.report_generator import build_day_report
+from storage.data_store import DataStore
+from storage.json_repository import JsonRepository
+from utils.client_snapshot import SNAPSHOT_FORMATS
+from utils.file_utils import load_json, save_json
+from utils.sales_journal import SNAPSHOT_FORMAT_ENV
+from utils.search_index import ProductSearchIndex
+
+SEARCH_QUERIES = ["", "pao", "pão de q", "coxinha frango", "suco lar", "choc", "integral", "xyz"]
+
+
+def git_version():
+    """Commit atual (vazio fora de um repositório git)"""
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5
+        )
+    except (OSError, subprocess.SubprocessError):
+        return ""
+    return result.stdout.strip()
+
+
+def timed(func, repeat=1):
+    """Executa func repeat vezes; retorna o melhor tempo e a média (segundos)"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return {"seconds": min(times), "mean": sum(times) / len(times), "runs": repeat}
+
+
+def open_store(directory, storage):
+    """DataStore sobre os arquivos gerados (JSON ou SQLite importado deles)"""
+    json_repository = JsonRepository(
+        os.path.join(directory, "clients.json"),
+        os.path.join(directory, "products.json"),
+        os.path.join(directory, "company.json"),
+    )
+    if storage == "sqlite":
+        from storage.sqlite_repository import SQLiteRepository
+        repository = SQLiteRepository(os.path.join(directory, "sistema.db"))
+        repository.import_from(json_repository)
+        return DataStore(repository)
+    return DataStore(json_repository)
+
+
+def add_orders(store, names, count):
+    """Mesma gravação feita por MainWindow.add_order_to_client ao finalizar vendas"""
+    for index in range(count):
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        store.add_sale(names[index % len(names)], {
+            "id": store.next_sale_id(),
+            "items": [{"name": "Pão de Queijo Frango", "price": 4.5, "quantity": 2}],
+            "total": 9.0,
+            "paid": True,
+            "date": timestamp.split(" ")[0],
+            "timestamp": timestamp,
+            "payment_method": "PIX",
+        })
+
+
+def settle_debts(store):
+    """Parte de dados de ClientManager.settle_debts (sem as caixas de diálogo)"""
+    updates = {}
+    for name, ledger in store.get_ledgers().items():
+        owes = round(ledger.owed, 2)
+        if owes > 0 and ledger.credits >= owes:
+            updates[name] = round(ledger.credits - owes, 2)
+    if updates:
+        store.settle_clients(updates)
+    return len(updates)
+
+
+def cancel_sales(store, sales):
+    """Mesma gravação de SalesHistoryManager.cancel_sale (sem o estorno de estoque)"""
+    for client_name, sale in sales:
+        store.update_sale(client_name, dict(sale, cancelled=True, paid=True, paid_amount=0.0))
+
+
+def cancellation_scaling(args, tmp, count=20):
+    """Tempo por cancelamento com 1/10 e com todas as vendas: deve ficar estável"""
+    per_cancel = {}
+    for sales_count in (max(args.vendas // 10, count), args.vendas):
+        directory = os.path.join(tmp, f"cancelamento_{sales_count}")
+        clients, products = generate_dataset(args.alunos, sales_count, args.produtos, args.semente)
+        write_dataset(directory, clients, products, args.formato)
+        store = open_store(directory, args.armazenamento)
+        store.get_client_index()
+        targets = [
+            (name, client["sales"][-1]) for name, client in clients.items() if client["sales"]
+        ][:count]
+        for name, _ in targets:
+            store.get_client(name)  # histórico já em memória, como ao abrir o histórico de vendas
+        elapsed = timed(lambda: cancel_sales(store, targets))["seconds"]
+        per_cancel[str(sales_count)] = elapsed * 1000 / len(targets)
+    small, large = per_cancel.values()
+    return {"per_cancel_ms": per_cancel, "growth": large / small if small else 0.0}
+
+
+def run(args, tmp):
+    results = {}
+
+    def case(name, func, repeat=1, **extra):
+        results[name] = dict(timed(func, repeat), **extra)
+        print(f"{name:<36} {results[name]['seconds'] * 1000:10.1f} ms")
+
+    start = time.perf_counter()
+    clients, products = generate_dataset(args.alunos, args.vendas, args.produtos, args.semente)
+    print(f"Dados gerados em {time.perf_counter() - start:.1f} s")
+    write_dataset(tmp, clients, products, args.formato)
+
+    # Arquivos JSON completos (load_json/save_json)
+    full_path = os.path.join(tmp, "clients_full.json")
+    products_path = os.path.join(tmp, "products.json")
+    case("save_json clientes", lambda: save_json(full_path, clients, compact=True))
+    case("load_json clientes", lambda: load_json(full_path, {}))
+    case("save_json produtos", lambda: save_json(products_path, products), repeat=5)
+    case("load_json produtos", lambda: load_json(products_path, []), repeat=5)
+    clients_size = os.path.getsize(full_path)
+
+    # Abertura do caixa: índice de clientes e, depois, todos os históricos
+    store = open_store(tmp, args.armazenamento)
+    case("abrir índice de clientes", store.get_client_index)
+    case("carregar todos os históricos", store.get_clients)
+
+    # Relatório do dia mais movimentado
+    busiest_day = Counter(
+        sale["date"] for client in clients.values() for sale in client["sales"]
+    ).most_common(1)[0][0]
+    report = build_day_report(clients, busiest_day)
+    case("build_day_report", lambda: build_day_report(clients, busiest_day), repeat=3,
+         sales=len(report["sales_rows"]))
+    xlsx_path = os.path.join(tmp, "relatorio.xlsx")
+    case("export_day_report", lambda: export_day_report(report, xlsx_path, busiest_day), repeat=3)
+
+    # Comprovante em PDF da última venda de um aluno
+    client_name = next(name for name, client in clients.items() if client["sales"])
+    client = clients[client_name]
+    order = sale_to_order(client["sales"][-1])
+    pdf_path = os.path.join(tmp, "comprovante.pdf")
+    case("generate_receipt_pdf", lambda: generate_receipt_pdf(client_name, client, order, pdf_path), repeat=10)
+
+    # Busca de produtos como em MainWindow.apply_product_filters
+    index = ProductSearchIndex(products)
+    case("índice de busca", lambda: ProductSearchIndex(products), repeat=5)
+
+    def search_all():
+        for query in SEARCH_QUERIES:
+            [products[doc_id] for doc_id in index.search(query)]
+    case("busca de produtos", search_all, repeat=20, queries=len(SEARCH_QUERIES))
+
+    # Persistência das vendas finalizadas no caixa
+    names = list(clients.keys())
+    case("add_order_to_client", lambda: add_orders(store, names, args.pedidos), orders=args.pedidos)
+    results["add_order_to_client"]["per_order_ms"] = results["add_order_to_client"]["seconds"] * 1000 / args.pedidos
+    if args.armazenamento == "json":
+        store.repository.journal.wait()
+
+    scaling = cancellation_scaling(args, tmp)
+    results["cancelar venda"] = dict(
+        seconds=list(scaling["per_cancel_ms"].values())[-1] / 1000, runs=1, **scaling
+    )
+    sizes = "  ".join(f"{size} vendas: {ms:.2f} ms" for size, ms in scaling["per_cancel_ms"].items())
+    print(f"{'cancelar venda (por venda)':<36} {sizes}  ({scaling['growth']:.1f}x)")
+
+    settled = {}
+    case("settle_debts", lambda: settled.update(count=settle_debts(store)))
+    results["settle_debts"]["clients"] = settled["count"]
+
+    return results, {"busiest_day": busiest_day, "clients_json_bytes": clients_size}
+
+
+def compare(results, previous_path):
+    """Mostra cada caso ao lado da execução anterior"""
+    with open(previous_path, "r", encoding="utf-8") as f:
+        previous = json.load(f)
+    print(f"\nComparação com {previous_path} ({previous.get('version') or 'sem versão'})")
+    for name, values in results.items():
+        before = previous.get("results", {}).get(name)
+        if before is None:
+            print(f"{name:<36} {'novo':>10}")
+            continue
+        change = (values["seconds"] / before["seconds"] - 1) * 100 if before["seconds"] else 0.0
+        print(f"{name:<36} {before['seconds'] * 1000:10.1f} -> {values['seconds'] * 1000:10.1f} ms  ({change:+.0f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dos caminhos de dados e relatórios")
+    parser.add_argument("--alunos", type=int, default=2000)
+    parser.add_argument("--vendas", type=int, default=500000)
+    parser.add_argument("--produtos", type=int, default=300)
+    parser.add_argument("--pedidos", type=int, default=200, help="vendas gravadas como no caixa")
+    parser.add_argument("--armazenamento", choices=["json", "sqlite"], default="json")
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--formato", choices=SNAPSHOT_FORMATS, default="compact",
+                        help="formato do clients.json (PDV_SNAPSHOT_FORMAT)")
+    parser.add_argument("--saida", default="benchmark_resultados.json")
+    parser.add_argument("--comparar", help="JSON de uma execução anterior")
+    args = parser.parse_args()
+    # As compactações do diário gravam no mesmo formato dos dados gerados
+    os.environ[SNAPSHOT_FORMAT_ENV] = args.formato
+
+    with tempfile.TemporaryDirectory() as tmp:
+        results, info = run(args, tmp)
+
+    output = {
+        "version": git_version(),
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "params": {
+            "students": args.alunos, "sales": args.vendas, "products": args.produtos,
+            "orders": args.pedidos, "storage": args.armazenamento, "seed": args.semente,
+            "format": args.formato,
+        },
+        "info": info,
+        "results": results,
+    }
+    with open(args.saida, "w", encoding="utf-8") as f:
+        json.dump(output, f, ensure_ascii=False, indent=2)
+    print(f"Resultados em {args.saida}")
+
+    if args.comparar:
+        compare(results, args.comparar)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,39 @@
 import sys
-import customtkinter as ctk
-from ui.main_window import MainWindow
+
+PROFILE_FLAG = "--profile-startup"
+
 
 def main():
+    profile = None
+    if PROFILE_FLAG in sys.argv:
+        # Instalado antes dos imports pesados para medi-los
+        from utils.startup_profile import StartupProfile
+        profile = StartupProfile()
+        profile.install()
+
+    import customtkinter as ctk
+    from ui.main_window import MainWindow
+    if profile is not None:
+        profile.mark("Imports concluídos")
+
     # Inicializar CustomTkinter
     ctk.set_appearance_mode("dark")
     ctk.set_default_color_theme("blue")
     
     # Criar e executar aplicação
     app = MainWindow()
+
+    if profile is not None:
+        profile.uninstall()
+        profile.mark("Janela criada")
+
+        def first_frame():
+            # Executado quando o laço de eventos fica ocioso: janela desenhada e pronta
+            app.update_idletasks()
+            profile.mark("Primeiro quadro interativo")
+            print(profile.report(), flush=True)
+        app.after_idle(first_frame)
+
     app.mainloop()
 
 if __name__ == "__main__":
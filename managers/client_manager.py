@@ -1,4 +1,3 @@
-import json
 from PySide6.QtWidgets import (
     QWidget, QHBoxLayout, QVBoxLayout,
     QPushButton, QMessageBox, QDialog,
@@ -6,8 +5,7 @@ from PySide6.QtWidgets import (
 )
 from PySide6.QtCore import Qt
 from PySide6.QtGui import QColor, QPalette
-
-CLIENTS_FILE = "data/clients.json"
+from storage.data_store import get_data_store
 
 # Cores do tema escuro
 COLORS = {
@@ -19,19 +17,10 @@ COLORS = {
     "text_gray": "#a0a0a0"
 }
 
-def load_clients():
-    with open(CLIENTS_FILE, "r", encoding="utf-8") as f:
-        return json.load(f)
-
-
-def save_clients(data):
-    with open(CLIENTS_FILE, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=4, ensure_ascii=False)
-
-
 class ClientManager(QDialog):
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, store=None):
         super().__init__(parent)
+        self.store = store or get_data_store()
         self.setWindowTitle("Gerenciar Clientes")
         self.resize(600, 400)
         
@@ -116,16 +105,16 @@ class ClientManager(QDialog):
             }}
         """)
 
-        self.clients = load_clients()
+        self.clients = self.store.get_client_index()
 
         layout = QVBoxLayout(self)
         layout.setContentsMargins(15, 15, 15, 15)
         layout.setSpacing(15)
 
         self.table = QTableWidget()
-        self.table.setColumnCount(3)
+        self.table.setColumnCount(4)
         self.table.setHorizontalHeaderLabels([
-            "Nome", "Créditos (R$)", "Deve (R$)"
+            "Nome", "Créditos (R$)", "Deve (R$)", "Última Compra"
         ])
         self.table.horizontalHeader().setStretchLastSection(True)
 
@@ -195,46 +184,90 @@ class ClientManager(QDialog):
 
         self.load_table()
 
+        # Atualizar a tabela quando os dados mudarem em qualquer janela
+        self.store_events = {
+            "sale_added": self.on_client_sale_changed,
+            "sale_updated": self.on_client_sale_changed,
+            "clients_changed": self.on_clients_changed,
+            "reloaded": self.load_table,
+        }
+        for event, callback in self.store_events.items():
+            self.store.subscribe(event, callback)
+        self.finished.connect(self.unsubscribe_store_events)
+
+    def unsubscribe_store_events(self):
+        for event, callback in self.store_events.items():
+            self.store.unsubscribe(event, callback)
+
     def load_table(self):
-        self.clients = load_clients()
+        self.clients = self.store.get_client_index()
         self.table.setRowCount(len(self.clients))
-
-        for row, (name, data) in enumerate(self.clients.items()):
-            credits = data.get("credits", 0.0)
-
-            owes = sum(
-                sale["total"]
-                for sale in data.get("sales", [])
-                if not sale.get("paid", False)
-            )
-
-            # Name (read-only)
-            name_item = QTableWidgetItem(name)
-            name_item.setFlags(Qt.ItemIsSelectable | Qt.ItemIsEnabled)
-            self.table.setItem(row, 0, name_item)
-
-            # Credits (editable)
-            credits_item = QTableWidgetItem(f"{credits:.2f}")
-            credits_item.setTextAlignment(Qt.AlignCenter)
-            self.table.setItem(row, 1, credits_item)
-
-            # Owes (read-only)
-            owes_item = QTableWidgetItem(f"{owes:.2f}")
-            owes_item.setFlags(Qt.ItemIsSelectable | Qt.ItemIsEnabled)
-            owes_item.setTextAlignment(Qt.AlignCenter)
-            self.table.setItem(row, 2, owes_item)
+        self.client_rows = {}
+
+        # Resumo mantido pelo DataStore: não percorre as vendas de cada cliente
+        ledgers = self.store.get_ledgers()
+        for row, name in enumerate(self.clients):
+            self.client_rows[name] = row
+            self.fill_row(row, name, ledgers[name])
+
+    def fill_row(self, row, name, ledger):
+        credits = ledger.credits
+        owes = ledger.owed
+
+        # Name (read-only)
+        name_item = QTableWidgetItem(name)
+        name_item.setFlags(Qt.ItemIsSelectable | Qt.ItemIsEnabled)
+        self.table.setItem(row, 0, name_item)
+
+        # Credits (editable)
+        credits_item = QTableWidgetItem(f"{credits:.2f}")
+        credits_item.setTextAlignment(Qt.AlignCenter)
+        self.table.setItem(row, 1, credits_item)
+
+        # Owes (read-only)
+        owes_item = QTableWidgetItem(f"{owes:.2f}")
+        owes_item.setFlags(Qt.ItemIsSelectable | Qt.ItemIsEnabled)
+        owes_item.setTextAlignment(Qt.AlignCenter)
+        self.table.setItem(row, 2, owes_item)
+
+        # Last sale date (read-only)
+        last_sale_item = QTableWidgetItem(ledger.last_sale_date or "-")
+        last_sale_item.setFlags(Qt.ItemIsSelectable | Qt.ItemIsEnabled)
+        last_sale_item.setTextAlignment(Qt.AlignCenter)
+        self.table.setItem(row, 3, last_sale_item)
+
+    def refresh_clients(self, names):
+        """Atualiza apenas as linhas dos clientes informados"""
+        for name in names:
+            row = self.client_rows.get(name)
+            if row is None:
+                # Cliente novo: reconstruir a tabela
+                self.load_table()
+                return
+            self.fill_row(row, name, self.store.get_ledger(name))
+
+    def on_client_sale_changed(self, client_name, sale):
+        self.refresh_clients([client_name])
+
+    def on_clients_changed(self, names):
+        if names is None:
+            self.load_table()
+        else:
+            self.refresh_clients(names)
 
     def save_changes(self):
         self.table.clearFocus()
-        data = load_clients()
 
+        updates = {}
         for row in range(self.table.rowCount()):
             name = self.table.item(row, 0).text()
             credits = float(self.table.item(row, 1).text())
 
-            data[name]["credits"] = credits
+            if credits != self.clients[name].get("credits", 0.0):
+                updates[name] = credits
 
-        save_clients(data)
+        if updates:
+            self.store.set_credits(updates)
 
         msg = QMessageBox(self)
         msg.setWindowTitle("Salvo")
@@ -264,21 +297,13 @@ class ClientManager(QDialog):
         """)
         msg.exec()
 
-        self.load_table()
-
     def settle_debts(self):
-        data = load_clients()
-
         payable_clients = []
 
         # Identifica quem pode quitar
-        for name, client in data.items():
-            credits = client.get("credits", 0.0)
-            owes = sum(
-                sale["total"]
-                for sale in client.get("sales", [])
-                if not sale.get("paid", False)
-            )
+        for name, ledger in self.store.get_ledgers().items():
+            credits = ledger.credits
+            owes = round(ledger.owed, 2)
 
             if owes > 0 and credits >= owes:
                 payable_clients.append((name, credits, owes))
@@ -353,15 +378,10 @@ class ClientManager(QDialog):
             return
 
         # Aplica abatimento
-        for name, credits, owes in payable_clients:
-            client = data[name]
-
-            client["credits"] = round(credits - owes, 2)
-
-            for sale in client.get("sales", []):
-                sale["paid"] = True
-
-        save_clients(data)
+        self.store.settle_clients({
+            name: round(credits - owes, 2)
+            for name, credits, owes in payable_clients
+        })
 
         msg = QMessageBox(self)
         msg.setWindowTitle("Concluído")
@@ -390,5 +410,3 @@ class ClientManager(QDialog):
             }}
         """)
         msg.exec()
-
-        self.load_table()
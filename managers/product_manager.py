@@ -1,4 +1,3 @@
-import json
 from PySide6.QtWidgets import (
     QHBoxLayout, QVBoxLayout, QLabel,
     QPushButton, QListWidget, QMessageBox, QDialog, QInputDialog, 
@@ -6,6 +5,7 @@ from PySide6.QtWidgets import (
 from PySide6.QtCore import Qt
 from PySide6.QtGui import QFont
 from widgets.product_dialog import ProductDialog
+from storage.data_store import get_data_store
 
 # Cores do tema escuro
 COLORS = {
@@ -18,10 +18,11 @@ COLORS = {
 }
 
 class ProductManager(QDialog):
-    def __init__(self, parent, products_file="data/products.json"):
+    def __init__(self, parent, store=None):
         super().__init__(parent)
         self.parent = parent
-        self.products_file = products_file
+        self.store = store or get_data_store()
+        self._saving = False
 
         self.setWindowTitle("Gerenciar Produtos")
         self.setMinimumWidth(420)
@@ -71,6 +72,19 @@ class ProductManager(QDialog):
         self.build_ui()
         self.load_list()
 
+        # Recarregar a lista se os produtos forem alterados fora deste diálogo
+        self.store.subscribe("products_changed", self.on_products_changed)
+        self.store.subscribe("reloaded", self.load_list)
+        self.finished.connect(self.unsubscribe_store_events)
+
+    def unsubscribe_store_events(self):
+        self.store.unsubscribe("products_changed", self.on_products_changed)
+        self.store.unsubscribe("reloaded", self.load_list)
+
+    def on_products_changed(self):
+        if not self._saving:
+            self.load_list()
+
     def build_ui(self):
         layout = QVBoxLayout(self)
 
@@ -149,14 +163,9 @@ class ProductManager(QDialog):
         # Limpar lista atual
         self.list_widget.clear()
 
-        # Recarregar produtos do arquivo
+        # Copiar produtos do DataStore (as alterações só valem após salvar)
         try:
-            with open(self.products_file, "r", encoding="utf-8") as f:
-                self.products = json.load(f)
-        except FileNotFoundError:
-            self.products = []
-        except json.JSONDecodeError:
-            self.products = []
+            self.products = [dict(product) for product in self.store.get_products()]
         except Exception:
             self.products = []
 
@@ -195,27 +204,12 @@ class ProductManager(QDialog):
     # SAVE PRODUCTS
     # -----------------------------
     def save_products(self):
-        # Garantir que o diretório existe
-        import os
-        os.makedirs(os.path.dirname(self.products_file) if os.path.dirname(self.products_file) else ".", exist_ok=True)
-        
-        # Salvar produtos no arquivo
-        with open(self.products_file, "w", encoding="utf-8") as f:
-            json.dump(self.products, f, indent=4, ensure_ascii=False)
-        
-        # Forçar escrita no disco
-        import sys
-        if hasattr(sys, 'flush'):
-            sys.stdout.flush()
-
-        # Refresh main window grid (se o parent tiver o método)
-        if self.parent and hasattr(self.parent, 'load_products'):
-            try:
-                # Tenta chamar o método sem parâmetros (CustomTkinter)
-                self.parent.load_products()
-            except (TypeError, AttributeError):
-                # Se falhar, ignora silenciosamente
-                pass
+        # Salvar produtos; a janela principal é atualizada pelo evento "products_changed"
+        self._saving = True
+        try:
+            self.store.save_products(list(self.products))
+        finally:
+            self._saving = False
 
     # -----------------------------
     # ADD PRODUCT
@@ -1,16 +1,18 @@
+from datetime import datetime
 from PySide6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLabel, QComboBox,
-    QLineEdit, QPushButton, QTableWidget, QTableWidgetItem,
-    QMessageBox
+    QLineEdit, QPushButton, QTableView, QMessageBox, QAbstractItemView
 )
-from PySide6.QtCore import Qt
-from utils.file_utils import load_json, save_json
+from storage.data_store import get_data_store
+from managers.sales_table_model import SalesTableModel
+
+# Formato das datas do filtro (o mesmo gravado nas vendas)
+DATE_FORMAT = "%Y-%m-%d"
 
 class SalesHistoryManager(QDialog):
-    def __init__(self, parent=None, clients_path="data/clients.json", products_path="data/products.json"):
+    def __init__(self, parent=None, store=None):
         super().__init__(parent)
-        self.clients_path = clients_path
-        self.products_path = products_path
+        self.store = store or get_data_store()
         self.setWindowTitle("Histórico de Vendas")
         self.resize(900, 500)
 
@@ -21,9 +23,13 @@ class SalesHistoryManager(QDialog):
         self.client_filter = QComboBox()
         filters.addWidget(self.client_filter)
 
-        filters.addWidget(QLabel("Data (YYYY-MM-DD):"))
-        self.date_filter = QLineEdit()
-        filters.addWidget(self.date_filter)
+        filters.addWidget(QLabel("De (YYYY-MM-DD):"))
+        self.date_start_filter = QLineEdit()
+        filters.addWidget(self.date_start_filter)
+
+        filters.addWidget(QLabel("Até:"))
+        self.date_end_filter = QLineEdit()
+        filters.addWidget(self.date_end_filter)
 
         self.btn_apply = QPushButton("Filtrar")
         self.btn_apply.clicked.connect(self.load_table)
@@ -31,11 +37,12 @@ class SalesHistoryManager(QDialog):
 
         layout.addLayout(filters)
 
-        self.table = QTableWidget()
-        self.table.setColumnCount(9)
-        self.table.setHorizontalHeaderLabels([
-            "Cliente", "Venda", "Data", "Total", "Modalidade", "Parcelas", "Pago", "Valor Pago", "Pendente"
-        ])
+        # Modelo com índices por cliente/data; as linhas são carregadas ao rolar
+        self.model = SalesTableModel(self)
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SingleSelection)
         self.table.horizontalHeader().setStretchLastSection(True)
         layout.addWidget(self.table)
 
@@ -50,87 +57,69 @@ class SalesHistoryManager(QDialog):
         layout.addLayout(actions)
 
         self.load_filters()
+        self.model.load(self.store.get_clients())
         self.load_table()
 
-    def load_clients(self):
-        return load_json(self.clients_path, {})
-
-    def save_clients(self, data):
-        save_json(self.clients_path, data)
-
-    def load_products(self):
-        return load_json(self.products_path, [])
-
-    def save_products(self, products):
-        save_json(self.products_path, products)
+        # Atualizar a tabela quando os dados mudarem em qualquer janela
+        self.store_events = {
+            "sale_added": self.on_sale_added,
+            "sale_updated": self.on_sale_updated,
+            "clients_changed": self.on_clients_changed,
+            "reloaded": self.reload,
+        }
+        for event, callback in self.store_events.items():
+            self.store.subscribe(event, callback)
+        self.finished.connect(self.unsubscribe_store_events)
+
+    def unsubscribe_store_events(self):
+        for event, callback in self.store_events.items():
+            self.store.unsubscribe(event, callback)
 
     def load_filters(self):
         self.client_filter.clear()
         self.client_filter.addItem("Todos")
-        data = self.load_clients()
+        data = self.store.get_client_index()
         for client_name in sorted(data.keys()):
             self.client_filter.addItem(client_name)
 
-    def load_table(self):
-        data = self.load_clients()
-        client_filter = self.client_filter.currentText()
-        date_filter = self.date_filter.text().strip()
-
-        rows = []
-        for client_name, client in data.items():
-            if client_filter != "Todos" and client_name != client_filter:
+    def read_date_filters(self):
+        """(início, fim) válidos no formato YYYY-MM-DD; None se alguma data for inválida"""
+        dates = []
+        for field in (self.date_start_filter, self.date_end_filter):
+            text = field.text().strip()
+            if not text:
+                dates.append(None)
                 continue
-            for sale in client.get("sales", []):
-                if date_filter and sale.get("date") != date_filter:
-                    continue
-                rows.append((client_name, sale))
-
-        self.table.setRowCount(len(rows))
-        for row, (client_name, sale) in enumerate(rows):
-            total = float(sale.get("total", 0.0))
-            paid_amount = float(sale.get("paid_amount", 0.0))
-            if sale.get("paid", False) and paid_amount == 0.0:
-                paid_amount = total
-            remaining = max(total - paid_amount, 0.0)
-            status = "Cancelada" if sale.get("cancelled", False) else "Ativa"
-            if sale.get("cancelled", False):
-                paid_amount = 0.0
-                remaining = 0.0
-
-            payment_method = sale.get("payment_method_display", sale.get("payment_method", "N/A"))
-            installments = sale.get("installments", 1)
-            installments_text = f"{installments}x" if installments > 1 else "-"
-            
-            values = [
-                client_name,
-                str(sale.get("id", "")),
-                sale.get("date", ""),
-                f"{total:.2f}",
-                payment_method,
-                installments_text,
-                "Sim" if sale.get("paid", False) else "Não",
-                f"{paid_amount:.2f}",
-                f"{remaining:.2f}"
-            ]
-
-            for col, value in enumerate(values):
-                item = QTableWidgetItem(value)
-                if col in (3, 6, 7, 8):
-                    item.setTextAlignment(Qt.AlignCenter)
-                self.table.setItem(row, col, item)
-
-            self.table.item(row, 0).setData(Qt.UserRole, {"client": client_name, "sale_id": sale.get("id")})
+            try:
+                # Normaliza "2026-3-1" para "2026-03-01" (comparação como texto)
+                dates.append(datetime.strptime(text, DATE_FORMAT).strftime(DATE_FORMAT))
+            except ValueError:
+                QMessageBox.warning(self, "Aviso", f"Data inválida: {text}\nUse o formato YYYY-MM-DD.")
+                return None
+        start_date, end_date = dates
+        if start_date and end_date and start_date > end_date:
+            # Intervalo invertido: trocar as datas também nos campos
+            start_date, end_date = end_date, start_date
+        self.date_start_filter.setText(start_date or "")
+        self.date_end_filter.setText(end_date or "")
+        return start_date, end_date
 
-    def cancel_sale(self):
-        current = self.table.currentRow()
-        if current < 0:
+    def load_table(self):
+        dates = self.read_date_filters()
+        if dates is None:
             return
+        client_filter = self.client_filter.currentText()
+        self.model.set_filters(
+            client_name=None if client_filter == "Todos" else client_filter,
+            start_date=dates[0],
+            end_date=dates[1]
+        )
 
-        data_info = self.table.item(current, 0).data(Qt.UserRole) or {}
-        client_name = data_info.get("client")
-        sale_id = data_info.get("sale_id")
-        if not client_name or sale_id is None:
+    def cancel_sale(self):
+        key = self.model.sale_key(self.table.currentIndex().row())
+        if key is None:
             return
+        client_name, sale_id = key
 
         confirm = QMessageBox.question(
             self,
@@ -141,26 +130,44 @@ class SalesHistoryManager(QDialog):
         if confirm != QMessageBox.Yes:
             return
 
-        data = self.load_clients()
-        products = self.load_products()
-
-        client = data.get(client_name, {})
-        for sale in client.get("sales", []):
-            if sale.get("id") == sale_id:
-                if sale.get("cancelled", False):
-                    QMessageBox.information(self, "Cancelar Venda", "Esta venda já está cancelada.")
-                    return
-                sale["cancelled"] = True
-                sale["paid"] = True
-                sale["paid_amount"] = 0.0
-
-                for item in sale.get("items", []):
-                    for product in products:
-                        if product.get("name") == item.get("name"):
-                            qty = int(item.get("quantity", 1))
-                            product["stock"] = int(product.get("stock", 0)) + qty
-                break
-
-        self.save_clients(data)
-        self.save_products(products)
+        sale = self.store.get_sale(client_name, sale_id)
+        if sale is None:
+            return
+        if sale.get("cancelled", False):
+            QMessageBox.information(self, "Cancelar Venda", "Esta venda já está cancelada.")
+            return
+
+        # A linha é atualizada pelo evento "sale_updated"
+        self.store.update_sale(client_name, dict(sale, cancelled=True, paid=True, paid_amount=0.0))
+
+        restock = {}
+        for item in sale.get("items", []):
+            name = item.get("name")
+            restock[name] = restock.get(name, 0) + int(item.get("quantity", 1))
+        self.store.adjust_stock(restock)
+
+    def on_sale_added(self, client_name, sale):
+        if self.client_filter.findText(client_name) < 0:
+            self.client_filter.addItem(client_name)
+        self.model.add_sale(client_name, sale)
+
+    def on_sale_updated(self, client_name, sale):
+        self.model.update_sale(client_name, sale)
+
+    def on_clients_changed(self, names):
+        if names is None:
+            self.reload()
+            return
+
+        # Quitação de dívidas altera o status "Pago" das vendas desses clientes
+        for client_name in names:
+            for sale in (self.store.get_client(client_name) or {}).get("sales", []):
+                self.model.update_sale(client_name, sale)
+
+    def reload(self):
+        current_client = self.client_filter.currentText()
+        self.load_filters()
+        index = self.client_filter.findText(current_client)
+        self.client_filter.setCurrentIndex(max(index, 0))
+        self.model.load(self.store.get_clients())
         self.load_table()
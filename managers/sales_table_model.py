@@ -0,0 +1,190 @@
+import bisect
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex
+
+HEADERS = ["Cliente", "Venda", "Data", "Total", "Modalidade", "Parcelas", "Pago", "Valor Pago", "Pendente"]
+CENTERED_COLUMNS = (3, 6, 7, 8)
+
+# Linhas entregues à tabela por vez conforme o usuário rola (fetchMore)
+FETCH_BATCH = 200
+
+# Maior data possível nas buscas por intervalo (datas são YYYY-MM-DD)
+_MAX_DATE = "9999-99-99"
+
+
+def sale_columns(client_name, sale):
+    """Textos das colunas da tabela para uma venda"""
+    total = float(sale.get("total", 0.0))
+    paid_amount = float(sale.get("paid_amount", 0.0))
+    if sale.get("paid", False) and paid_amount == 0.0:
+        paid_amount = total
+    remaining = max(total - paid_amount, 0.0)
+    if sale.get("cancelled", False):
+        paid_amount = 0.0
+        remaining = 0.0
+
+    installments = sale.get("installments", 1)
+    return (
+        client_name,
+        str(sale.get("id", "")),
+        sale.get("date", ""),
+        f"{total:.2f}",
+        sale.get("payment_method_display", sale.get("payment_method", "N/A")),
+        f"{installments}x" if installments > 1 else "-",
+        "Sim" if sale.get("paid", False) else "Não",
+        f"{paid_amount:.2f}",
+        f"{remaining:.2f}"
+    )
+
+
+class SalesIndex:
+    """Colunas pré-calculadas do histórico com índices por cliente e por data.
+
+    Cada venda vira um registro (cliente, id, data, colunas). As listas
+    ordenadas de (data, registro) permitem filtrar um intervalo de datas,
+    de um cliente ou de todos, com busca binária.
+    """
+
+    def __init__(self, clients_data):
+        self.records = []
+        self.by_key = {}  # {(cliente, id da venda): registro}
+        self.by_date = []  # [(data, registro)] ordenada
+        self.by_client = {}  # {cliente: [(data, registro)] ordenada}
+
+        entries = []
+        for client_name, client in clients_data.items():
+            for sale in client.get("sales", []):
+                entries.append(self._store(client_name, sale))
+        # Montagem inicial: ordenar uma vez em vez de inserir uma a uma
+        entries.sort()
+        self.by_date = entries
+        for date_str, record_id in entries:
+            self.by_client.setdefault(self.records[record_id][0], []).append((date_str, record_id))
+
+    def _store(self, client_name, sale):
+        record_id = len(self.records)
+        date_str = sale.get("date") or ""
+        self.records.append((client_name, sale.get("id"), date_str, sale_columns(client_name, sale)))
+        self.by_key[(client_name, sale.get("id"))] = record_id
+        return date_str, record_id
+
+    def add(self, client_name, sale):
+        entry = self._store(client_name, sale)
+        bisect.insort(self.by_date, entry)
+        bisect.insort(self.by_client.setdefault(client_name, []), entry)
+        return entry[1]
+
+    def update(self, client_name, sale):
+        """Recalcula as colunas de uma venda (a data não muda); retorna o registro"""
+        record_id = self.by_key.get((client_name, sale.get("id")))
+        if record_id is not None:
+            client_name, sale_id, date_str, _ = self.records[record_id]
+            self.records[record_id] = (client_name, sale_id, date_str, sale_columns(client_name, sale))
+        return record_id
+
+    def query(self, client_name=None, start_date=None, end_date=None):
+        """Registros do cliente (ou de todos) entre as datas, em ordem cronológica"""
+        entries = self.by_date if client_name is None else self.by_client.get(client_name, [])
+        low = bisect.bisect_left(entries, (start_date or "", -1))
+        high = bisect.bisect_right(entries, (end_date or _MAX_DATE, len(self.records)))
+        return [record_id for _, record_id in entries[low:high]]
+
+    def matches(self, record_id, client_name=None, start_date=None, end_date=None):
+        record_client, _, date_str, _ = self.records[record_id]
+        if client_name is not None and record_client != client_name:
+            return False
+        if start_date and date_str < start_date:
+            return False
+        return not end_date or date_str <= end_date
+
+
+class SalesTableModel(QAbstractTableModel):
+    """Modelo da tabela de histórico: exibe o resultado de um filtro sob demanda"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.sales_index = SalesIndex({})
+        self.result = []  # registros que atendem ao filtro
+        self.loaded = 0  # quantos deles já foram entregues à tabela
+        self.rows_by_record = {}
+        self.filters = (None, None, None)
+
+    def load(self, clients_data):
+        self.beginResetModel()
+        self.sales_index = SalesIndex(clients_data)
+        self._apply(*self.filters)
+        self.endResetModel()
+
+    def set_filters(self, client_name=None, start_date=None, end_date=None):
+        self.beginResetModel()
+        self._apply(client_name, start_date, end_date)
+        self.endResetModel()
+
+    def _apply(self, client_name, start_date, end_date):
+        self.filters = (client_name, start_date, end_date)
+        self.result = self.sales_index.query(client_name, start_date, end_date)
+        self.rows_by_record = {record_id: row for row, record_id in enumerate(self.result)}
+        self.loaded = min(FETCH_BATCH, len(self.result))
+
+    # Interface do Qt
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.loaded
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(HEADERS)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self.loaded < len(self.result)
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+        count = min(FETCH_BATCH, len(self.result) - self.loaded)
+        if count <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self.loaded, self.loaded + count - 1)
+        self.loaded += count
+        self.endInsertRows()
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= self.loaded:
+            return None
+        record = self.sales_index.records[self.result[index.row()]]
+        if role == Qt.DisplayRole:
+            return record[3][index.column()]
+        if role == Qt.TextAlignmentRole and index.column() in CENTERED_COLUMNS:
+            return int(Qt.AlignCenter)
+        if role == Qt.UserRole:
+            return {"client": record[0], "sale_id": record[1]}
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    # Atualizações incrementais
+    def sale_key(self, row):
+        """(cliente, id da venda) da linha, ou None"""
+        if row < 0 or row >= self.loaded:
+            return None
+        client_name, sale_id, _, _ = self.sales_index.records[self.result[row]]
+        return client_name, sale_id
+
+    def add_sale(self, client_name, sale):
+        record_id = self.sales_index.add(client_name, sale)
+        if not self.sales_index.matches(record_id, *self.filters):
+            return
+        # Vendas novas são as mais recentes: entram no fim do resultado
+        row = len(self.result)
+        self.rows_by_record[record_id] = row
+        self.result.append(record_id)
+        if self.loaded == row:
+            self.beginInsertRows(QModelIndex(), row, row)
+            self.loaded += 1
+            self.endInsertRows()
+
+    def update_sale(self, client_name, sale):
+        record_id = self.sales_index.update(client_name, sale)
+        row = self.rows_by_record.get(record_id)
+        if row is not None and row < self.loaded:
+            self.dataChanged.emit(self.createIndex(row, 0), self.createIndex(row, len(HEADERS) - 1))
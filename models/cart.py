@@ -0,0 +1,112 @@
+from dataclasses import dataclass
+
+# Valor máximo de uma compra, em centavos (R$ 9.999,00)
+CART_LIMIT_CENTS = 999900
+
+
+def to_cents(value):
+    return int(round(float(value) * 100))
+
+
+@dataclass
+class CartItem:
+    name: str
+    price_cents: int
+    qty: int = 1
+
+    @property
+    def price(self):
+        return self.price_cents / 100
+
+    @property
+    def subtotal_cents(self):
+        return self.price_cents * self.qty
+
+    @property
+    def subtotal(self):
+        return self.subtotal_cents / 100
+
+
+class Cart:
+    """Carrinho com total mantido incrementalmente em centavos.
+
+    Cada alteração publica um evento para os ouvintes (callback(event, name)):
+    "added", "changed" e "removed" com o nome do item, ou "cleared" com None.
+    """
+
+    def __init__(self):
+        self.items = {}  # {nome: CartItem}, na ordem de inclusão
+        self.total_cents = 0
+        self._listeners = []
+
+    def subscribe(self, callback):
+        self._listeners.append(callback)
+
+    def _publish(self, event, name=None):
+        for callback in list(self._listeners):
+            callback(event, name)
+
+    @property
+    def total(self):
+        return self.total_cents / 100
+
+    def __contains__(self, name):
+        return name in self.items
+
+    def __len__(self):
+        return len(self.items)
+
+    def __bool__(self):
+        return bool(self.items)
+
+    def last_name(self):
+        """Nome do último item incluído (ou None)"""
+        return next(reversed(self.items), None)
+
+    def fits(self, price):
+        """Indica se mais uma unidade de price cabe no limite da compra"""
+        return self.total_cents + to_cents(price) <= CART_LIMIT_CENTS
+
+    def add(self, name, price):
+        """Inclui uma unidade do produto"""
+        item = self.items.get(name)
+        if item is None:
+            item = CartItem(name, to_cents(price))
+            self.items[name] = item
+            self.total_cents += item.price_cents
+            self._publish("added", name)
+        else:
+            self.increase(name)
+
+    def increase(self, name):
+        item = self.items[name]
+        item.qty += 1
+        self.total_cents += item.price_cents
+        self._publish("changed", name)
+
+    def decrease(self, name):
+        """Retira uma unidade; o item sai do carrinho ao chegar a zero"""
+        item = self.items[name]
+        if item.qty > 1:
+            item.qty -= 1
+            self.total_cents -= item.price_cents
+            self._publish("changed", name)
+        else:
+            self.remove(name)
+
+    def remove(self, name):
+        item = self.items.pop(name)
+        self.total_cents -= item.subtotal_cents
+        self._publish("removed", name)
+
+    def clear(self):
+        self.items = {}
+        self.total_cents = 0
+        self._publish("cleared")
+
+    def to_order_items(self):
+        """Itens no formato gravado na venda"""
+        return [
+            {"name": item.name, "price": item.price, "quantity": item.qty}
+            for item in self.items.values()
+        ]
@@ -0,0 +1,48 @@
+from dataclasses import dataclass
+
+
+def sale_outstanding(sale):
+    """Valor em aberto da venda; vendas pagas ou canceladas não devem nada"""
+    if sale.get("paid", False) or sale.get("cancelled", False):
+        return 0.0
+    return float(sale.get("total", 0.0))
+
+
+@dataclass
+class ClientLedger:
+    """Resumo da conta do cliente mantido a cada venda, pagamento e quitação"""
+    credits: float = 0.0
+    owed: float = 0.0
+    last_sale_id: int = 0
+    last_sale_date: str = ""
+
+    @classmethod
+    def from_client(cls, client):
+        ledger = cls(credits=float(client.get("credits", 0.0)))
+        for sale in client.get("sales", []):
+            ledger.add_sale(sale)
+        return ledger
+
+    def summary(self):
+        """(pendente, maior id de venda, data da última venda), como gravado no índice"""
+        return self.owed, self.last_sale_id, self.last_sale_date
+
+    def add_sale(self, sale):
+        self.owed += sale_outstanding(sale)
+        sale_id = sale.get("id")
+        if isinstance(sale_id, int) and sale_id > self.last_sale_id:
+            self.last_sale_id = sale_id
+        date_str = sale.get("date") or ""
+        if date_str > self.last_sale_date:
+            self.last_sale_date = date_str
+
+    def replace_sale(self, old_sale, new_sale):
+        """Pagamento ou cancelamento: só o valor em aberto muda"""
+        self.owed += sale_outstanding(new_sale) - sale_outstanding(old_sale)
+        # Evitar resíduos de ponto flutuante ao zerar a dívida
+        if abs(self.owed) < 0.005:
+            self.owed = 0.0
+
+    def settle(self, credits):
+        self.credits = float(credits)
+        self.owed = 0.0
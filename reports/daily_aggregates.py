@@ -0,0 +1,129 @@
+import bisect
+from reports.report_generator import build_sale_row, iter_item_totals
+from reports.range_report import RangeReportAggregator
+from utils.instrumentation import timed
+
+
+def _to_cents(value):
+    return int(round(float(value) * 100))
+
+
+class DayBucket:
+    """Agregados de um dia: linhas de venda, totais por produto e pago/pendente.
+
+    Os totais são mantidos em centavos (inteiros) para que somas e subtrações
+    incrementais não acumulem erro de ponto flutuante.
+    """
+
+    def __init__(self):
+        self.sales = {}  # {(cliente, id da venda): (linha, [(produto, qtd, centavos)])}
+        self.products = {}  # {produto: [quantidade, centavos]}
+        self.total_cents = 0
+        self.paid_cents = 0
+
+    def add(self, key, row, items):
+        # Uma venda já contabilizada é substituída mantendo sua posição
+        if key in self.sales:
+            self._subtract(*self.sales[key])
+        self.sales[key] = (row, items)
+        self.total_cents += _to_cents(row["total"])
+        self.paid_cents += _to_cents(row["paid_amount"])
+        for name, qty, cents in items:
+            totals = self.products.setdefault(name, [0, 0])
+            totals[0] += qty
+            totals[1] += cents
+
+    def remove(self, key):
+        self._subtract(*self.sales.pop(key))
+
+    def _subtract(self, row, items):
+        self.total_cents -= _to_cents(row["total"])
+        self.paid_cents -= _to_cents(row["paid_amount"])
+        for name, qty, cents in items:
+            totals = self.products[name]
+            totals[0] -= qty
+            totals[1] -= cents
+            if totals[0] == 0 and totals[1] == 0:
+                del self.products[name]
+
+    def is_empty(self):
+        return not self.sales
+
+
+class DailyAggregates:
+    """Índice de relatórios diários mantido incrementalmente a cada venda.
+
+    Substitui a varredura de todo o histórico de `build_day_report`: o
+    relatório de um dia (ou de um intervalo) passa a custar O(dias).
+    """
+
+    def __init__(self, clients_data=None):
+        self.buckets = {}
+        self.dates = []  # datas com vendas, ordenadas (para intervalos)
+        if clients_data:
+            for client_name, client in clients_data.items():
+                for sale in client.get("sales", []):
+                    self.add_sale(client_name, sale)
+
+    def _bucket(self, date_str):
+        bucket = self.buckets.get(date_str)
+        if bucket is None:
+            bucket = DayBucket()
+            self.buckets[date_str] = bucket
+            bisect.insort(self.dates, date_str)
+        return bucket
+
+    def _drop_if_empty(self, date_str):
+        bucket = self.buckets.get(date_str)
+        if bucket is not None and bucket.is_empty():
+            del self.buckets[date_str]
+            index = bisect.bisect_left(self.dates, date_str)
+            del self.dates[index]
+
+    def add_sale(self, client_name, sale):
+        """Contabiliza uma venda (vendas canceladas não entram no relatório)"""
+        date_str = sale.get("date")
+        if not date_str or sale.get("cancelled", False):
+            return
+
+        items = [
+            (name, qty, _to_cents(line_total))
+            for name, qty, line_total in iter_item_totals(sale)
+        ]
+        key = (client_name, sale.get("id"))
+        bucket = self._bucket(date_str)
+        bucket.add(key, build_sale_row(client_name, sale), items)
+
+    def remove_sale(self, client_name, sale):
+        date_str = sale.get("date")
+        bucket = self.buckets.get(date_str)
+        key = (client_name, sale.get("id"))
+        if bucket is None or key not in bucket.sales:
+            return
+        bucket.remove(key)
+        self._drop_if_empty(date_str)
+
+    def update_sale(self, client_name, old_sale, new_sale):
+        """Aplica a alteração de uma venda (cancelamento, quitação...)"""
+        if new_sale.get("cancelled", False) or old_sale.get("date") != new_sale.get("date"):
+            self.remove_sale(client_name, old_sale)
+        self.add_sale(client_name, new_sale)
+
+    @timed("DailyAggregates.day_report")
+    def day_report(self, date_str, product_categories=None):
+        """Relatório do dia no mesmo formato de `build_day_report`"""
+        return self.range_report(date_str, date_str, product_categories)
+
+    def iter_entries(self, start_date, end_date):
+        """Gera (linha, itens em centavos) das vendas entre as datas, dia a dia"""
+        start = bisect.bisect_left(self.dates, start_date)
+        end = bisect.bisect_right(self.dates, end_date)
+        for date_str in self.dates[start:end]:
+            for row, items in self.buckets[date_str].sales.values():
+                yield dict(row), items
+
+    @timed("DailyAggregates.range_report")
+    def range_report(self, start_date, end_date, product_categories=None):
+        """Relatório entre start_date e end_date (inclusive) a partir do índice"""
+        aggregator = RangeReportAggregator(start_date, end_date, product_categories)
+        return aggregator.consume(self.iter_entries(start_date, end_date)).result()
@@ -0,0 +1,157 @@
+import os
+from datetime import datetime
+from reports.receipt_format import number_to_words, company_lines
+from utils.logger import get_logger
+
+# Impressora térmica: caminho do dispositivo ou arquivo (ex.: /dev/usb/lp0, COM3)
+PRINTER_ENV = "PDV_PRINTER"
+# Largura da bobina em mm: 80 (padrão) ou 58
+PAPER_ENV = "PDV_PRINTER_PAPER"
+# Sem impressora configurada, o comprovante é gravado em texto neste arquivo
+STAND_IN_PATH = os.path.join("data", "comprovante_termico.txt")
+
+# Colunas por linha na fonte padrão (Font A) para cada largura de bobina
+PAPER_COLUMNS = {58: 32, 80: 48}
+
+# Comandos ESC/POS
+ESC = b"\x1b"
+GS = b"\x1d"
+INIT = ESC + b"@"
+CODEPAGE_PC860 = ESC + b"t\x03"  # português
+ALIGN = {"left": ESC + b"a\x00", "center": ESC + b"a\x01", "right": ESC + b"a\x02"}
+BOLD_ON = ESC + b"E\x01"
+BOLD_OFF = ESC + b"E\x00"
+DOUBLE_ON = GS + b"!\x11"  # altura e largura dobradas
+DOUBLE_OFF = GS + b"!\x00"
+FEED_AND_CUT = ESC + b"d\x04" + GS + b"V\x42\x00"
+
+ENCODING = "cp860"
+
+
+def _money(value):
+    return f"R$ {value:.2f}"
+
+
+class EscPosReceipt:
+    """Comprovante de balcão para impressora térmica (bobina de 58 ou 80 mm).
+
+    As linhas são guardadas com a formatação e convertidas em bytes ESC/POS
+    (`to_bytes`) ou em texto simples (`to_text`) para conferência.
+    """
+
+    def __init__(self, paper_mm=80):
+        self.columns = PAPER_COLUMNS.get(paper_mm, PAPER_COLUMNS[80])
+        self.lines = []  # [(texto, alinhamento, negrito, dobrado)]
+
+    def line(self, text="", align="left", bold=False, double=False):
+        width = self.columns // 2 if double else self.columns
+        text = str(text)
+        # Quebrar textos longos na largura da bobina
+        while len(text) > width:
+            self.lines.append((text[:width], align, bold, double))
+            text = text[width:]
+        self.lines.append((text, align, bold, double))
+
+    def columns_line(self, left, right, bold=False):
+        """Texto à esquerda e valor à direita na mesma linha"""
+        right = str(right)
+        left = str(left)[:max(self.columns - len(right) - 1, 0)]
+        self.line(left + " " * (self.columns - len(left) - len(right)) + right, bold=bold)
+
+    def separator(self, char="-"):
+        self.line(char * self.columns)
+
+    def to_bytes(self):
+        data = bytearray(INIT + CODEPAGE_PC860)
+        for text, align, bold, double in self.lines:
+            data += ALIGN[align]
+            data += BOLD_ON if bold else BOLD_OFF
+            data += DOUBLE_ON if double else DOUBLE_OFF
+            data += text.encode(ENCODING, errors="replace") + b"\n"
+        data += ALIGN["left"] + BOLD_OFF + DOUBLE_OFF + FEED_AND_CUT
+        return bytes(data)
+
+    def to_text(self):
+        rows = []
+        for text, align, _, double in self.lines:
+            width = self.columns // 2 if double else self.columns
+            if align == "center":
+                text = text.center(width)
+            elif align == "right":
+                text = text.rjust(width)
+            rows.append(text.rstrip())
+        return "\n".join(rows) + "\n"
+
+
+def render_receipt(client_name, client_data, order, company_data=None, paper_mm=80):
+    """Monta o comprovante térmico a partir da venda (formato de order)"""
+    company_name, company_address, company_cnpj, company_phone = company_lines(company_data)
+    receipt = EscPosReceipt(paper_mm)
+
+    receipt.line(company_name, align="center", bold=True, double=True)
+    receipt.line(company_address, align="center")
+    receipt.line(company_cnpj, align="center")
+    receipt.line(company_phone, align="center")
+    receipt.separator()
+    receipt.line("COMPROVANTE DE PAGAMENTO", align="center", bold=True)
+    receipt.separator()
+
+    receipt.line(f"NOME: {client_name}", bold=True)
+    if client_data:
+        if client_data.get("cpf"):
+            receipt.line(f"CPF: {client_data['cpf']}")
+        if client_data.get("matricula"):
+            receipt.line(f"Nº MATRÍCULA: {client_data['matricula']}")
+    receipt.separator()
+
+    for item in order.get("items", []):
+        quantity = item.get("quantity", 1)
+        price = item.get("price", 0.0)
+        receipt.line(item.get("name", ""))
+        receipt.columns_line(f"  {quantity} x {_money(price)}", _money(price * quantity))
+    receipt.separator()
+
+    total = order.get("total", 0.0)
+    receipt.columns_line("TOTAL", _money(total), bold=True)
+    receipt.line(f"({number_to_words(total)})")
+    receipt.line(f"Pagamento: {order.get('payment_method', 'Não especificado')}")
+    receipt.separator()
+    receipt.line(f"EMITIDO EM: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}", align="center")
+    return receipt
+
+
+def print_receipt(receipt, target=None):
+    """Envia o comprovante à impressora (ou arquivo) e retorna o destino usado.
+
+    Sem destino informado, usa a variável PDV_PRINTER; sem ela, grava o
+    texto do comprovante em data/comprovante_termico.txt.
+    """
+    target = target or os.environ.get(PRINTER_ENV)
+    if target:
+        with open(target, "wb") as printer:
+            printer.write(receipt.to_bytes())
+        return target
+
+    os.makedirs(os.path.dirname(STAND_IN_PATH), exist_ok=True)
+    with open(STAND_IN_PATH, "w", encoding="utf-8") as f:
+        f.write(receipt.to_text())
+    return STAND_IN_PATH
+
+
+def printer_paper_mm():
+    """Largura da bobina configurada em PDV_PRINTER_PAPER (58 ou 80; padrão 80)"""
+    value = os.environ.get(PAPER_ENV, "").strip().lower().removesuffix("mm")
+    if not value:
+        return 80
+    try:
+        paper_mm = int(value)
+    except ValueError:
+        paper_mm = None
+    if paper_mm not in PAPER_COLUMNS:
+        get_logger().warning("%s inválido (%s); usando bobina de 80 mm", PAPER_ENV, value)
+        return 80
+    return paper_mm
+
+
+def thermal_printer_configured():
+    return bool(os.environ.get(PRINTER_ENV))
@@ -1,36 +1,141 @@
+import csv
 from openpyxl import Workbook
+from reports.range_report import RangeReportAggregator, iter_sale_entries, product_categories
+from utils.instrumentation import timed
+
+SALES_HEADER = ["Cliente", "Venda", "Data", "Total", "Modalidade", "Parcelas", "Pago", "Valor Pago", "Pendente"]
+PRODUCTS_HEADER = ["Produto", "Quantidade", "Total"]
+
+
+def sale_cells(row):
+    """Células de uma linha de venda na planilha/CSV"""
+    installments = row.get("installments", 1)
+    return [
+        row["client"],
+        row["sale_id"],
+        row["date"],
+        row["total"],
+        row.get("payment_method", "N/A"),
+        f"{installments}x" if installments > 1 else "-",
+        "Sim" if row["paid"] else "Não",
+        row["paid_amount"],
+        row["remaining"]
+    ]
+
+
+def summary_cells(report, period_label, period_value):
+    summary = report["summary"]
+    return [
+        [period_label, period_value],
+        ["Total de Vendas", summary["total_sales"]],
+        ["Total Pago", summary["total_paid"]],
+        ["Total Pendente", summary["total_pending"]]
+    ]
+
 
 def export_day_report(report, output_path, date_str):
-    wb = Workbook()
+    export_report(report, output_path, "Data", date_str)
+
+
+@timed("export_report")
+def export_report(report, output_path, period_label, period_value):
+    """Exporta um relatório já montado (workbook em modo write-only)"""
+    wb = Workbook(write_only=True)
 
-    ws_summary = wb.active
-    ws_summary.title = "Resumo"
-    ws_summary.append(["Data", date_str])
-    ws_summary.append(["Total de Vendas", report["summary"]["total_sales"]])
-    ws_summary.append(["Total Pago", report["summary"]["total_paid"]])
-    ws_summary.append(["Total Pendente", report["summary"]["total_pending"]])
+    ws_summary = wb.create_sheet("Resumo")
+    for cells in summary_cells(report, period_label, period_value):
+        ws_summary.append(cells)
 
     ws_sales = wb.create_sheet("Vendas")
-    ws_sales.append(["Cliente", "Venda", "Data", "Total", "Modalidade", "Parcelas", "Pago", "Valor Pago", "Pendente"])
+    ws_sales.append(SALES_HEADER)
     for row in report["sales_rows"]:
-        payment_method = row.get("payment_method", "N/A")
-        installments = row.get("installments", 1)
-        installments_text = f"{installments}x" if installments > 1 else "-"
-        ws_sales.append([
-            row["client"],
-            row["sale_id"],
-            row["date"],
-            row["total"],
-            payment_method,
-            installments_text,
-            "Sim" if row["paid"] else "Não",
-            row["paid_amount"],
-            row["remaining"]
-        ])
+        ws_sales.append(sale_cells(row))
 
     ws_products = wb.create_sheet("Produtos")
-    ws_products.append(["Produto", "Quantidade", "Total"])
+    ws_products.append(PRODUCTS_HEADER)
     for row in report["products_rows"]:
         ws_products.append([row["name"], row["qty"], row["total"]])
 
     wb.save(output_path)
+
+
+@timed("export_range_stream")
+def export_range_stream(aggregator, entries, output_path):
+    """Exporta um intervalo consumindo as vendas de um gerador.
+
+    As linhas vão direto para o arquivo temporário da planilha e o agregador
+    (criado com keep_rows=False) guarda apenas os totais, então a memória
+    não cresce com a quantidade de vendas. Retorna o relatório resumido.
+    """
+    wb = Workbook(write_only=True)
+
+    # Em modo write-only cada aba é gravada em seu próprio arquivo temporário,
+    # então o resumo pode ser preenchido depois das vendas
+    ws_summary = wb.create_sheet("Resumo")
+    ws_sales = wb.create_sheet("Vendas")
+    ws_products = wb.create_sheet("Produtos")
+    ws_days = wb.create_sheet("Por Dia")
+    ws_categories = wb.create_sheet("Por Categoria")
+    ws_payments = wb.create_sheet("Por Pagamento")
+    ws_clients = wb.create_sheet("Por Cliente")
+
+    ws_sales.append(SALES_HEADER)
+    for row in aggregator.stream(entries):
+        ws_sales.append(sale_cells(row))
+
+    report = aggregator.result()
+    period = f"{aggregator.start_date} a {aggregator.end_date}"
+    for cells in summary_cells(report, "Período", period):
+        ws_summary.append(cells)
+    ws_summary.append(["Quantidade de Vendas", report["summary"]["sales_count"]])
+
+    ws_products.append(PRODUCTS_HEADER)
+    for row in report["products_rows"]:
+        ws_products.append([row["name"], row["qty"], row["total"]])
+
+    group_header = ["Vendas", "Total", "Pago", "Pendente"]
+    ws_days.append(["Data"] + group_header)
+    for row in report["by_day"]:
+        ws_days.append([row["date"], row["count"], row["total"], row["paid"], row["pending"]])
+
+    ws_categories.append(["Categoria", "Quantidade", "Total"])
+    for row in sorted(report["by_category"], key=lambda r: r["total"], reverse=True):
+        ws_categories.append([row["category"], row["qty"], row["total"]])
+
+    ws_payments.append(["Modalidade"] + group_header)
+    for row in report["by_payment_method"]:
+        ws_payments.append([row["payment_method"], row["count"], row["total"], row["paid"], row["pending"]])
+
+    ws_clients.append(["Cliente"] + group_header)
+    for row in report["by_client"]:
+        ws_clients.append([row["client"], row["count"], row["total"], row["paid"], row["pending"]])
+
+    wb.save(output_path)
+    return report
+
+
+def export_sales_csv(rows, output_path):
+    """Caminho rápido: vendas em CSV (separador ';' e BOM para abrir no Excel)"""
+    count = 0
+    with open(output_path, "w", encoding="utf-8-sig", newline="") as f:
+        writer = csv.writer(f, delimiter=";")
+        writer.writerow(SALES_HEADER)
+        for row in rows:
+            writer.writerow(sale_cells(row))
+            count += 1
+    return count
+
+
+def export_range_report(clients_data, start_date, end_date, output_path, products=None):
+    """Exporta o relatório de um intervalo para Excel com memória constante"""
+    aggregator = RangeReportAggregator(
+        start_date, end_date, product_categories(products or []), keep_rows=False
+    )
+    entries = iter_sale_entries(clients_data, start_date, end_date)
+    return export_range_stream(aggregator, entries, output_path)
+
+
+def export_range_csv(clients_data, start_date, end_date, output_path):
+    """Exporta as vendas de um intervalo para CSV, sem montar o relatório"""
+    rows = (row for row, _ in iter_sale_entries(clients_data, start_date, end_date))
+    return export_sales_csv(rows, output_path)
@@ -0,0 +1,176 @@
+import calendar
+from datetime import datetime, timedelta
+from reports.report_generator import build_sale_row, iter_item_totals
+from utils.instrumentation import timed
+
+UNCATEGORIZED = "Sem categoria"
+
+
+def _to_cents(value):
+    return int(round(float(value) * 100))
+
+
+def week_range(date_str):
+    """Segunda a domingo da semana que contém date_str (YYYY-MM-DD)"""
+    day = datetime.strptime(date_str, "%Y-%m-%d").date()
+    start = day - timedelta(days=day.weekday())
+    end = start + timedelta(days=6)
+    return start.isoformat(), end.isoformat()
+
+
+def month_range(year, month):
+    """Primeiro e último dia do mês"""
+    last_day = calendar.monthrange(year, month)[1]
+    return f"{year:04d}-{month:02d}-01", f"{year:04d}-{month:02d}-{last_day:02d}"
+
+
+def iter_sale_entries(clients_data, start_date, end_date):
+    """Gera (linha, itens em centavos) das vendas ativas do intervalo, varrendo os clientes"""
+    for client_name, client in clients_data.items():
+        for sale in client.get("sales", []):
+            date_str = sale.get("date")
+            if not date_str or date_str < start_date or date_str > end_date:
+                continue
+            if sale.get("cancelled", False):
+                continue
+            items = [
+                (name, qty, _to_cents(line_total))
+                for name, qty, line_total in iter_item_totals(sale)
+            ]
+            yield build_sale_row(client_name, sale), items
+
+
+class RangeReportAggregator:
+    """Acumula, em uma única passada, o relatório de um intervalo de datas.
+
+    Agrupa por dia, produto, categoria, forma de pagamento e cliente. As
+    entradas podem vir de uma varredura dos clientes (`iter_sale_entries`)
+    ou do índice diário (`DailyAggregates.iter_entries`). Com keep_rows=False
+    as linhas de venda não são guardadas (exportação em streaming).
+    """
+
+    def __init__(self, start_date, end_date, product_categories=None, keep_rows=True):
+        self.start_date = start_date
+        self.end_date = end_date
+        self.product_categories = product_categories or {}
+        self.keep_rows = keep_rows
+        self.sales_rows = []
+        self.sales_count = 0
+        self.total_cents = 0
+        self.paid_cents = 0
+        self.by_day = {}
+        self.by_product = {}
+        self.by_category = {}
+        self.by_payment = {}
+        self.by_client = {}
+
+    @staticmethod
+    def _add_group(groups, key, total_cents, paid_cents):
+        group = groups.get(key)
+        if group is None:
+            group = groups[key] = [0, 0, 0]  # vendas, total, pago
+        group[0] += 1
+        group[1] += total_cents
+        group[2] += paid_cents
+
+    def add(self, row, items):
+        total_cents = _to_cents(row["total"])
+        paid_cents = _to_cents(row["paid_amount"])
+
+        self.sales_count += 1
+        if self.keep_rows:
+            self.sales_rows.append(row)
+        self.total_cents += total_cents
+        self.paid_cents += paid_cents
+        self._add_group(self.by_day, row["date"], total_cents, paid_cents)
+        self._add_group(self.by_payment, row["payment_method"], total_cents, paid_cents)
+        self._add_group(self.by_client, row["client"], total_cents, paid_cents)
+
+        for name, qty, cents in items:
+            product = self.by_product.get(name)
+            if product is None:
+                product = self.by_product[name] = [0, 0]
+            product[0] += qty
+            product[1] += cents
+
+            category = self.product_categories.get(name, UNCATEGORIZED)
+            totals = self.by_category.get(category)
+            if totals is None:
+                totals = self.by_category[category] = [0, 0]
+            totals[0] += qty
+            totals[1] += cents
+
+    def consume(self, entries):
+        for row, items in entries:
+            self.add(row, items)
+        return self
+
+    def stream(self, entries):
+        """Repassa as linhas de venda uma a uma enquanto acumula os totais"""
+        for row, items in entries:
+            self.add(row, items)
+            yield row
+
+    @staticmethod
+    def _group_rows(groups, key_name):
+        return [
+            {
+                key_name: key,
+                "count": count,
+                "total": total / 100,
+                "paid": paid / 100,
+                "pending": max(total - paid, 0) / 100
+            }
+            for key, (count, total, paid) in groups.items()
+        ]
+
+    def result(self):
+        """Relatório no formato de `build_day_report`, com os agrupamentos extras"""
+        return {
+            "start_date": self.start_date,
+            "end_date": self.end_date,
+            "sales_rows": self.sales_rows,
+            "products_rows": [
+                {"name": name, "qty": qty, "total": cents / 100}
+                for name, (qty, cents) in self.by_product.items()
+            ],
+            "summary": {
+                "total_sales": self.total_cents / 100,
+                "total_paid": self.paid_cents / 100,
+                "total_pending": max(self.total_cents - self.paid_cents, 0) / 100,
+                "sales_count": self.sales_count
+            },
+            "by_day": sorted(self._group_rows(self.by_day, "date"), key=lambda r: r["date"]),
+            "by_category": [
+                {"category": category, "qty": qty, "total": cents / 100}
+                for category, (qty, cents) in self.by_category.items()
+            ],
+            "by_payment_method": self._group_rows(self.by_payment, "payment_method"),
+            "by_client": self._group_rows(self.by_client, "client")
+        }
+
+
+def product_categories(products):
+    """Mapa {nome do produto: categoria}"""
+    return {
+        product.get("name"): product.get("category", UNCATEGORIZED)
+        for product in products
+        if product.get("name")
+    }
+
+
+@timed("build_range_report")
+def build_range_report(clients_data, start_date, end_date, products=None):
+    """Relatório de um intervalo arbitrário em uma única passada pelo histórico"""
+    aggregator = RangeReportAggregator(start_date, end_date, product_categories(products or []))
+    return aggregator.consume(iter_sale_entries(clients_data, start_date, end_date)).result()
+
+
+def build_week_report(clients_data, date_str, products=None):
+    start_date, end_date = week_range(date_str)
+    return build_range_report(clients_data, start_date, end_date, products)
+
+
+def build_month_report(clients_data, year, month, products=None):
+    start_date, end_date = month_range(year, month)
+    return build_range_report(clients_data, start_date, end_date, products)
@@ -0,0 +1,159 @@
+"""Geração de comprovantes em lote (ex.: vendas pendentes no fechamento do mês).
+
+Uso: python -m reports.receipt_batch --saida comprovantes.zip
+     python -m reports.receipt_batch --saida comprovantes.pdf --todas --cliente "Ana"
+"""
+import argparse
+import os
+import tempfile
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from reports.receipt_generator import generate_receipt_pdf, generate_receipts_pdf
+from reports.receipt_service import RECEIPT_CLIENT_FIELDS, sale_to_order
+from utils.logger import get_logger
+
+
+def select_sales(clients_data, unpaid_only=True, client_names=None, start_date=None, end_date=None):
+    """Lista (cliente, venda) das vendas ativas que atendem ao filtro"""
+    names = client_names if client_names is not None else clients_data.keys()
+    selected = []
+    for client_name in names:
+        for sale in clients_data.get(client_name, {}).get("sales", []):
+            if sale.get("cancelled", False):
+                continue
+            if unpaid_only and sale.get("paid", False):
+                continue
+            date_str = sale.get("date", "")
+            if start_date and date_str < start_date:
+                continue
+            if end_date and date_str > end_date:
+                continue
+            selected.append((client_name, sale))
+    return selected
+
+
+def receipt_filename(client_name, sale):
+    """Mesmo nome sugerido ao gerar o comprovante de uma venda na interface"""
+    client_name_safe = client_name.replace("/", "-").replace("\\", "-")
+    date_safe = sale.get("date", "").replace("-", "")
+    return f"comprovante_{client_name_safe}_{date_safe}_{sale.get('id', '')}.pdf"
+
+
+def _receipt_jobs(sales, clients_data):
+    jobs = []
+    for client_name, sale in sales:
+        client = clients_data.get(client_name, {})
+        client_data = {key: client[key] for key in RECEIPT_CLIENT_FIELDS if key in client}
+        jobs.append((client_name, client_data, sale_to_order(sale), receipt_filename(client_name, sale)))
+    return jobs
+
+
+def _render_one(job):
+    """Executado nos processos de trabalho; retorna (caminho, erro)"""
+    client_name, client_data, order, output_path, company_data = job
+    try:
+        generate_receipt_pdf(client_name, client_data, order, output_path, company_data=company_data)
+        return output_path, None
+    except Exception as e:
+        return output_path, str(e)
+
+
+def _summary(count, paths, errors, started):
+    """Resultado do lote com a vazão (comprovantes por segundo)"""
+    elapsed = time.perf_counter() - started
+    return {
+        "count": count,
+        "errors": errors,
+        "paths": paths,
+        "elapsed": elapsed,
+        "per_second": count / elapsed if elapsed > 0 else 0.0
+    }
+
+
+def generate_batch_files(sales, clients_data, output_dir, company_data=None, max_workers=None):
+    """Um PDF por venda, renderizados em paralelo por um pool de processos"""
+    started = time.perf_counter()
+    os.makedirs(output_dir, exist_ok=True)
+    jobs = [
+        (client_name, client_data, order, os.path.join(output_dir, filename), company_data)
+        for client_name, client_data, order, filename in _receipt_jobs(sales, clients_data)
+    ]
+
+    paths = []
+    errors = []
+    if jobs:
+        workers = max_workers or os.cpu_count() or 1
+        # Lotes por processo reduzem a troca de mensagens entre processos
+        chunksize = max(1, len(jobs) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for path, error in executor.map(_render_one, jobs, chunksize=chunksize):
+                if error is None:
+                    paths.append(path)
+                else:
+                    errors.append((path, error))
+                    get_logger().error("Erro ao gerar comprovante %s: %s", path, error)
+    return _summary(len(paths), paths, errors, started)
+
+
+def generate_batch_zip(sales, clients_data, zip_path, company_data=None, max_workers=None):
+    """Um PDF por venda, compactados em um único arquivo ZIP"""
+    started = time.perf_counter()
+    with tempfile.TemporaryDirectory() as tmp:
+        result = generate_batch_files(sales, clients_data, tmp, company_data, max_workers)
+        # PDFs já são comprimidos; apenas armazenar deixa o ZIP bem mais rápido
+        with zipfile.ZipFile(zip_path, "w", compression=zipfile.ZIP_STORED) as archive:
+            for path in result["paths"]:
+                archive.write(path, os.path.basename(path))
+    return _summary(result["count"], [zip_path], result["errors"], started)
+
+
+def generate_batch_pdf(sales, clients_data, output_path, company_data=None):
+    """Todos os comprovantes em um único PDF, um por página.
+
+    O layout de um documento do reportlab é sequencial, então este modo roda
+    em um só processo; ainda assim evita abrir e fechar um arquivo por venda.
+    """
+    started = time.perf_counter()
+    jobs = _receipt_jobs(sales, clients_data)
+    if jobs:
+        generate_receipts_pdf(
+            [(client_name, client_data, order) for client_name, client_data, order, _ in jobs],
+            output_path,
+            company_data=company_data
+        )
+    return _summary(len(jobs), [output_path] if jobs else [], [], started)
+
+
+def main():
+    from storage.data_store import get_data_store
+
+    parser = argparse.ArgumentParser(description="Gera comprovantes em lote")
+    parser.add_argument("--saida", required=True, help="arquivo .pdf (único), .zip ou pasta")
+    parser.add_argument("--todas", action="store_true", help="incluir vendas já pagas")
+    parser.add_argument("--cliente", action="append", help="restringir a um cliente (pode repetir)")
+    parser.add_argument("--inicio", help="data inicial YYYY-MM-DD")
+    parser.add_argument("--fim", help="data final YYYY-MM-DD")
+    parser.add_argument("--processos", type=int, default=None)
+    args = parser.parse_args()
+
+    store = get_data_store()
+    clients_data = store.get_clients()
+    sales = select_sales(clients_data, not args.todas, args.cliente, args.inicio, args.fim)
+
+    output = args.saida
+    if output.lower().endswith(".pdf"):
+        result = generate_batch_pdf(sales, clients_data, output, store.get_company())
+    elif output.lower().endswith(".zip"):
+        result = generate_batch_zip(sales, clients_data, output, store.get_company(), args.processos)
+    else:
+        result = generate_batch_files(sales, clients_data, output, store.get_company(), args.processos)
+
+    print(
+        f"{result['count']} comprovantes em {result['elapsed']:.2f} s "
+        f"({result['per_second']:.1f}/s), {len(result['errors'])} erros"
+    )
+
+
+if __name__ == "__main__":
+    main()
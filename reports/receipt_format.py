@@ -0,0 +1,93 @@
+import re
+
+# Formatação compartilhada pelos comprovantes (PDF A4 e impressora térmica),
+# sem depender do reportlab
+
+def number_to_words(value):
+    """Converte número para extenso em português (versão simplificada)"""
+    if value == 0:
+        return "zero reais"
+    
+    reais = int(value)
+    centavos = int(round((value - reais) * 100))
+    
+    # Listas de números
+    unidades = ["zero", "um", "dois", "três", "quatro", "cinco", "seis", "sete", "oito", "nove"]
+    especiais = ["dez", "onze", "doze", "treze", "quatorze", "quinze", "dezesseis", "dezessete", "dezoito", "dezenove"]
+    dezenas = ["", "", "vinte", "trinta", "quarenta", "cinquenta", "sessenta", "setenta", "oitenta", "noventa"]
+    centenas = ["", "cem", "duzentos", "trezentos", "quatrocentos", "quinhentos", "seiscentos", "setecentos", "oitocentos", "novecentos"]
+    
+    def convert_number(num):
+        """Converte um número inteiro para extenso"""
+        if num == 0:
+            return ""
+        if num < 10:
+            return unidades[num]
+        elif num < 20:
+            return especiais[num - 10]
+        elif num < 100:
+            dezena = num // 10
+            unidade = num % 10
+            if unidade == 0:
+                return dezenas[dezena]
+            else:
+                return f"{dezenas[dezena]} e {unidades[unidade]}"
+        elif num < 1000:
+            centena = num // 100
+            resto = num % 100
+            if resto == 0:
+                return centenas[centena]
+            elif centena == 1:
+                return f"cento e {convert_number(resto)}"
+            else:
+                return f"{centenas[centena]} e {convert_number(resto)}"
+        else:
+            # Para valores maiores, usar formato numérico
+            return str(num)
+    
+    reais_text = convert_number(reais) if reais > 0 else ""
+    centavos_text = convert_number(centavos) if centavos > 0 else ""
+    
+    # Montar resultado
+    if reais > 0 and centavos > 0:
+        return f"{reais_text} reais e {centavos_text} centavos"
+    elif reais > 0:
+        return f"{reais_text} reais"
+    elif centavos > 0:
+        return f"{centavos_text} centavos"
+    else:
+        return "zero reais"
+
+def company_lines(company_data=None):
+    """Nome, endereço, CNPJ e telefone da empresa já formatados para o comprovante"""
+    # Informações da empresa (usar dados salvos ou padrão)
+    if company_data:
+        company_name = company_data.get("name", "Cantina Colégio Ativa")
+        company_address = company_data.get("address", "Endereço da Cantina")
+        company_cnpj = company_data.get("cnpj", "")
+        company_phone = company_data.get("phone", "")
+    else:
+        company_name = "Cantina Colégio Ativa"
+        company_address = "Endereço da Cantina"
+        company_cnpj = ""
+        company_phone = ""
+    
+    # Formatar CNPJ e telefone se existirem
+    if company_cnpj:
+        # Se CNPJ estiver apenas com números, formatar
+        cnpj_clean = re.sub(r'\D', '', str(company_cnpj))
+        if len(cnpj_clean) == 14:
+            # Formatar: XX.XXX.XXX/XXXX-XX
+            formatted_cnpj = f"{cnpj_clean[:2]}.{cnpj_clean[2:5]}.{cnpj_clean[5:8]}/{cnpj_clean[8:12]}-{cnpj_clean[12:]}"
+            company_cnpj = f"CNPJ: {formatted_cnpj}"
+        else:
+            company_cnpj = f"CNPJ: {company_cnpj}"
+    else:
+        company_cnpj = "CNPJ: Não informado"
+    
+    if company_phone:
+        company_phone = f"Telefone: {company_phone}"
+    else:
+        company_phone = "Telefone: Não informado"
+    
+    return company_name, company_address, company_cnpj, company_phone
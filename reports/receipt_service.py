@@ -0,0 +1,94 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from utils.logger import get_logger
+
+# Campos do cliente usados no comprovante (o histórico de vendas não é copiado)
+RECEIPT_CLIENT_FIELDS = ("cpf", "matricula")
+
+# Intervalo de verificação dos comprovantes em andamento pela interface (ms)
+POLL_INTERVAL_MS = 100
+
+
+def sale_to_order(sale):
+    """Converte uma venda gravada para o formato de order usado no comprovante"""
+    return {
+        "timestamp": f"{sale.get('date', '')} 00:00:00",
+        "items": sale.get("items", []),
+        "total": sale.get("total", 0.0),
+        "payment_method": sale.get("payment_method", "N/A")
+    }
+
+
+class ReceiptService:
+    """Fila de geração de comprovantes PDF em threads de segundo plano.
+
+    `submit` devolve um Future imediatamente, então o caixa pode seguir para
+    o próximo cliente enquanto o comprovante anterior é montado.
+    """
+
+    def __init__(self, max_workers=2):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="receipt")
+        self._lock = threading.Lock()
+        self._pending = 0
+
+    def submit(self, client_name, client_data, order, output_path, company_data=None):
+        """Enfileira um comprovante; o Future resulta no caminho do arquivo gerado"""
+        # Cópias dos dados: a venda pode ser alterada na interface durante a geração
+        client_data = {
+            key: client_data[key]
+            for key in RECEIPT_CLIENT_FIELDS
+            if client_data and key in client_data
+        }
+        order = dict(order, items=[dict(item) for item in order.get("items", [])])
+        company_data = dict(company_data) if company_data else None
+
+        with self._lock:
+            self._pending += 1
+        return self._executor.submit(
+            self._render, client_name, client_data, order, output_path, company_data
+        )
+
+    def _render(self, client_name, client_data, order, output_path, company_data):
+        # Importado na thread de trabalho: o reportlab não pesa na abertura da janela
+        from reports.receipt_generator import generate_receipt_pdf
+        try:
+            generate_receipt_pdf(client_name, client_data, order, output_path, company_data=company_data)
+            return output_path
+        except Exception as e:
+            get_logger().error("Erro ao gerar comprovante %s: %s", output_path, e)
+            raise
+        finally:
+            # Antes de o Future ser concluído, para a contagem já estar certa ao ser notificado
+            with self._lock:
+                self._pending -= 1
+
+    def pending_count(self):
+        """Comprovantes na fila ou em geração"""
+        with self._lock:
+            return self._pending
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)
+
+
+def poll_future(widget, future, callback, interval_ms=POLL_INTERVAL_MS):
+    """Chama callback(future) na thread da interface Tk quando o Future terminar"""
+    def check():
+        if future.done():
+            callback(future)
+        else:
+            widget.after(interval_ms, check)
+    widget.after(interval_ms, check)
+
+
+_receipt_service = None
+_receipt_service_lock = threading.Lock()
+
+
+def get_receipt_service():
+    """Retorna o serviço de comprovantes compartilhado pelo processo"""
+    global _receipt_service
+    with _receipt_service_lock:
+        if _receipt_service is None:
+            _receipt_service = ReceiptService()
+        return _receipt_service
@@ -1,5 +1,37 @@
 from collections import defaultdict
+from utils.instrumentation import timed
 
+def build_sale_row(client_name, sale):
+    """Linha do relatório para uma venda"""
+    total = float(sale.get("total", 0.0))
+    paid_amount = float(sale.get("paid_amount", 0.0))
+    if sale.get("paid", False) and paid_amount == 0.0:
+        paid_amount = total
+
+    remaining = max(total - paid_amount, 0.0)
+
+    return {
+        "client": client_name,
+        "sale_id": sale.get("id"),
+        "date": sale.get("date"),
+        "total": total,
+        "paid": sale.get("paid", False),
+        "paid_amount": paid_amount,
+        "remaining": remaining,
+        "payment_method": sale.get("payment_method_display", sale.get("payment_method", "N/A")),
+        "installments": sale.get("installments", 1)
+    }
+
+def iter_item_totals(sale):
+    """Gera (produto, quantidade, total da linha) para os itens de uma venda"""
+    for item in sale.get("items", []):
+        name = item.get("name")
+        qty = int(item.get("quantity", 1))
+        line_total = float(item.get("line_total", item.get("price", 0.0) * qty))
+        if name:
+            yield name, qty, line_total
+
+@timed("build_day_report")
 def build_day_report(clients_data, date_str):
     sales_rows = []
     product_totals = defaultdict(lambda: {"qty": 0, "total": 0.0})
@@ -14,35 +46,15 @@ def build_day_report(clients_data, date_str):
             if sale.get("cancelled", False):
                 continue
 
-            total = float(sale.get("total", 0.0))
-            paid_amount = float(sale.get("paid_amount", 0.0))
-            if sale.get("paid", False) and paid_amount == 0.0:
-                paid_amount = total
-
-            remaining = max(total - paid_amount, 0.0)
-
-            sales_rows.append({
-                "client": client_name,
-                "sale_id": sale.get("id"),
-                "date": sale.get("date"),
-                "total": total,
-                "paid": sale.get("paid", False),
-                "paid_amount": paid_amount,
-                "remaining": remaining,
-                "payment_method": sale.get("payment_method_display", sale.get("payment_method", "N/A")),
-                "installments": sale.get("installments", 1)
-            })
-
-            total_sales += total
-            total_paid += paid_amount
-
-            for item in sale.get("items", []):
-                name = item.get("name")
-                qty = int(item.get("quantity", 1))
-                line_total = float(item.get("line_total", item.get("price", 0.0) * qty))
-                if name:
-                    product_totals[name]["qty"] += qty
-                    product_totals[name]["total"] += line_total
+            row = build_sale_row(client_name, sale)
+            sales_rows.append(row)
+
+            total_sales += row["total"]
+            total_paid += row["paid_amount"]
+
+            for name, qty, line_total in iter_item_totals(sale):
+                product_totals[name]["qty"] += qty
+                product_totals[name]["total"] += line_total
 
     total_pending = max(total_sales - total_paid, 0.0)
 
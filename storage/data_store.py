@@ -0,0 +1,415 @@
+import os
+import threading
+from collections import defaultdict
+from storage.repository import get_repository
+from reports.daily_aggregates import DailyAggregates
+from reports.range_report import product_categories
+from models.ledger import ClientLedger
+from utils.client_snapshot import split_client
+from utils.logger import get_logger
+
+# Eventos publicados pelo DataStore (argumentos recebidos pelos callbacks):
+#   "sale_added"       (client_name, sale)
+#   "sale_updated"     (client_name, sale)
+#   "clients_changed"  (names)  -> lista de clientes alterados ou None para todos
+#   "products_changed" ()
+#   "company_changed"  (company_data)
+#   "reloaded"         ()       -> dados recarregados após alteração externa
+EVENTS = (
+    "sale_added",
+    "sale_updated",
+    "clients_changed",
+    "products_changed",
+    "company_changed",
+    "reloaded",
+)
+
+
+def _file_signature(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+class DataStore:
+    """Dados do sistema carregados uma única vez e mantidos em memória.
+
+    Compartilhado pelas janelas Tk e Qt do processo: as leituras vêm da
+    memória, as gravações são serializadas e persistidas pelo repositório,
+    e cada alteração é publicada para que as janelas abertas se atualizem.
+
+    Na abertura só o índice de clientes (cadastro, créditos e total pendente)
+    é lido; o histórico de vendas de cada cliente é carregado na primeira vez
+    em que for pedido (get_client, get_client_sales) ou todo de uma vez por
+    get_clients (relatórios e histórico geral).
+    """
+
+    def __init__(self, repository):
+        self.repository = repository
+        self._lock = threading.RLock()
+        self._listeners = defaultdict(list)
+        self._clients = None  # {nome: cliente}; "sales" só nos já carregados
+        self._loaded = set()  # clientes com o histórico carregado
+        self._ledgers = {}  # {nome: ClientLedger}
+        self._products = None
+        self._company = None
+        self._daily = None
+        self._sale_positions = {}  # {(cliente, id da venda): posição em "sales"}
+        self._next_sale_id = 1
+        self._products_by_name = None
+        self._signatures = {}
+        self._compacted = False
+
+        # A compactação do diário regrava arquivos sem alterar os dados
+        self.repository.add_compaction_listener(self._on_compacted)
+
+    # -----------------------------
+    # EVENTOS
+    # -----------------------------
+    def subscribe(self, event, callback):
+        if event not in EVENTS:
+            raise ValueError(f"Evento desconhecido: {event}")
+        with self._lock:
+            self._listeners[event].append(callback)
+
+    def unsubscribe(self, event, callback):
+        with self._lock:
+            if callback in self._listeners[event]:
+                self._listeners[event].remove(callback)
+
+    def _publish(self, event, *args):
+        with self._lock:
+            callbacks = list(self._listeners[event])
+        for callback in callbacks:
+            try:
+                callback(*args)
+            except Exception as e:
+                get_logger().error("Erro ao notificar %s: %s", event, e)
+
+    # -----------------------------
+    # LEITURA (memória)
+    # -----------------------------
+    def _client_index(self):
+        with self._lock:
+            if self._clients is None:
+                clients, summary = self.repository.load_client_index()
+                self._clients = clients
+                self._loaded = set()
+                self._sale_positions = {}
+                self._ledgers = {}
+                for name, client in clients.items():
+                    owed, last_id, last_date = summary.get(name, (0.0, 0, ""))
+                    self._ledgers[name] = ClientLedger(
+                        float(client.get("credits", 0.0)), owed, last_id, last_date
+                    )
+                last_id = max((ledger.last_sale_id for ledger in self._ledgers.values()), default=0)
+                self._next_sale_id = max(self._next_sale_id, last_id + 1)
+                self._remember_signatures()
+            return self._clients
+
+    def _load_history(self, client_name):
+        """Cliente com o histórico carregado (None se não existir); requer o lock"""
+        client = self._client_index().get(client_name)
+        if client is not None and client_name not in self._loaded:
+            client.update(self.repository.load_client_history(client_name))
+            self._adopt_history(client_name, client)
+        return client
+
+    def _adopt_history(self, client_name, client):
+        for position, sale in enumerate(client.setdefault("sales", [])):
+            self._sale_positions[(client_name, sale.get("id"))] = position
+        self._loaded.add(client_name)
+
+    def get_client_index(self):
+        """Dicionário de clientes compartilhado, sem garantia do histórico de vendas.
+
+        Basta para nomes, créditos e cadastro; não deve ser alterado diretamente.
+        """
+        return self._client_index()
+
+    def get_ledger(self, client_name):
+        """Resumo da conta do cliente (créditos, pendente, última venda), sem ler o histórico"""
+        with self._lock:
+            self._client_index()
+            return self._ledgers.get(client_name) or ClientLedger()
+
+    def get_ledgers(self):
+        """{nome: ClientLedger} de todos os clientes (cópia, O(clientes))"""
+        with self._lock:
+            self._client_index()
+            return {name: ClientLedger(**vars(ledger)) for name, ledger in self._ledgers.items()}
+
+    def get_clients(self):
+        """Todos os clientes com o histórico de vendas (carrega os que faltam)"""
+        with self._lock:
+            clients = self._client_index()
+            missing = [name for name in clients if name not in self._loaded]
+            if missing:
+                full = self.repository.load_clients()
+                for name in missing:
+                    clients[name].update(split_client(full.get(name, {}))[1])
+                    self._adopt_history(name, clients[name])
+            return clients
+
+    def get_client(self, client_name):
+        """Cliente com o histórico de vendas carregado"""
+        with self._lock:
+            return self._load_history(client_name)
+
+    def get_client_sales(self, client_name):
+        client = self.get_client(client_name)
+        return client.get("sales", []) if client else []
+
+    def get_products(self):
+        with self._lock:
+            if self._products is None:
+                self._products = self.repository.load_products()
+                self._remember_signatures()
+            return self._products
+
+    def get_company(self):
+        with self._lock:
+            if self._company is None:
+                self._company = self.repository.load_company()
+                self._remember_signatures()
+            return self._company
+
+    def _product_index(self):
+        with self._lock:
+            if self._products_by_name is None:
+                self._products_by_name = {}
+                for product in self.get_products():
+                    self._products_by_name.setdefault(product.get("name"), product)
+            return self._products_by_name
+
+    def get_sale(self, client_name, sale_id):
+        with self._lock:
+            client = self._load_history(client_name)
+            position = self._sale_positions.get((client_name, sale_id))
+            if client is None or position is None:
+                return None
+            return client["sales"][position]
+
+    def get_product(self, name):
+        return self._product_index().get(name)
+
+    def next_sale_id(self):
+        """Reserva o próximo id de venda (único entre todos os clientes e crescente)"""
+        with self._lock:
+            self._client_index()
+            sale_id = self._next_sale_id
+            self._next_sale_id += 1
+            return sale_id
+
+    def get_daily_aggregates(self):
+        """Agregados por dia, construídos uma vez e mantidos a cada gravação"""
+        with self._lock:
+            if self._daily is None:
+                self._daily = DailyAggregates(self.get_clients())
+            return self._daily
+
+    def day_report(self, date_str):
+        return self.range_report(date_str, date_str)
+
+    def range_report(self, start_date, end_date):
+        """Relatório do intervalo (agrupado por dia, produto, categoria, pagamento e cliente)"""
+        with self._lock:
+            categories = product_categories(self.get_products())
+            return self.get_daily_aggregates().range_report(start_date, end_date, categories)
+
+    def find_sales(self, client_name=None, date=None):
+        """Lista (cliente, venda) filtrando por cliente e/ou data exata"""
+        if client_name is not None:
+            client = self.get_client(client_name)
+            clients = {client_name: client} if client is not None else {}
+        else:
+            clients = self.get_clients()
+
+        rows = []
+        for name, client in clients.items():
+            for sale in client.get("sales", []):
+                if date and sale.get("date") != date:
+                    continue
+                rows.append((name, sale))
+        return rows
+
+    # -----------------------------
+    # ESCRITA (memória + repositório)
+    # -----------------------------
+    def add_sale(self, client_name, sale, credits=None):
+        with self._lock:
+            client = self._load_history(client_name)
+            self.repository.add_sale(client_name, sale, credits)
+            if client is None:
+                client = self._clients[client_name] = {"credits": 0.0, "sales": []}
+                self._loaded.add(client_name)
+                self._ledgers[client_name] = ClientLedger()
+            ledger = self._ledgers[client_name]
+            sales = client["sales"]
+            self._sale_positions[(client_name, sale.get("id"))] = len(sales)
+            if isinstance(sale.get("id"), int):
+                self._next_sale_id = max(self._next_sale_id, sale["id"] + 1)
+            sales.append(sale)
+            ledger.add_sale(sale)
+            if credits is not None:
+                client["credits"] = credits
+                ledger.credits = float(credits)
+            if self._daily is not None:
+                self._daily.add_sale(client_name, sale)
+            self._remember_signatures()
+        self._publish("sale_added", client_name, sale)
+
+    def update_sale(self, client_name, sale):
+        with self._lock:
+            client = self._load_history(client_name)
+            index = self._sale_positions.get((client_name, sale.get("id")))
+            if client is None or index is None:
+                return
+            sales = client["sales"]
+            self.repository.update_sale(client_name, sale)
+            old_sale = sales[index]
+            sales[index] = sale
+            self._ledgers[client_name].replace_sale(old_sale, sale)
+            if self._daily is not None:
+                self._daily.update_sale(client_name, old_sale, sale)
+            self._remember_signatures()
+        self._publish("sale_updated", client_name, sale)
+
+    def set_credits(self, updates):
+        with self._lock:
+            clients = self._client_index()
+            self.repository.set_credits(updates)
+            for name, credits in updates.items():
+                if name in clients:
+                    clients[name]["credits"] = credits
+                    self._ledgers[name].credits = float(credits)
+            self._remember_signatures()
+        self._publish("clients_changed", list(updates.keys()))
+
+    def settle_clients(self, updates):
+        with self._lock:
+            clients = {name: self._load_history(name) for name in updates}
+            self.repository.settle_clients(updates)
+            for name, credits in updates.items():
+                client = clients.get(name)
+                if client is None:
+                    continue
+                client["credits"] = credits
+                self._ledgers[name].settle(credits)
+                for sale in client.get("sales", []):
+                    if sale.get("paid", False):
+                        continue
+                    sale["paid"] = True
+                    if self._daily is not None:
+                        self._daily.update_sale(name, sale, sale)
+            self._remember_signatures()
+        self._publish("clients_changed", list(updates.keys()))
+
+    def save_clients(self, data):
+        with self._lock:
+            self.repository.save_clients(data)
+            self._clients = data
+            self._loaded = set()
+            self._sale_positions = {}
+            self._ledgers = {}
+            for name, client in data.items():
+                self._adopt_history(name, client)
+                self._ledgers[name] = ClientLedger.from_client(client)
+                self._next_sale_id = max(self._next_sale_id, self._ledgers[name].last_sale_id + 1)
+            self._daily = None
+            self._remember_signatures()
+        self._publish("clients_changed", None)
+
+    def save_products(self, products):
+        with self._lock:
+            self.repository.save_products(products)
+            self._products = products
+            self._products_by_name = None
+            self._remember_signatures()
+        self._publish("products_changed")
+
+    def adjust_stock(self, deltas):
+        with self._lock:
+            products_by_name = self._product_index()
+            self.repository.adjust_stock(deltas)
+            for name, qty in deltas.items():
+                product = products_by_name.get(name)
+                if product is not None and qty:
+                    product["stock"] = int(product.get("stock", 0)) + qty
+            self._remember_signatures()
+        self._publish("products_changed")
+
+    def save_company(self, data):
+        with self._lock:
+            self.repository.save_company(data)
+            self._company = data
+            self._remember_signatures()
+        self._publish("company_changed", data)
+
+    def compact(self):
+        """Manutenção periódica do armazenamento"""
+        with self._lock:
+            self.repository.compact()
+            self._remember_signatures()
+
+    # -----------------------------
+    # ALTERAÇÕES EXTERNAS
+    # -----------------------------
+    def _remember_signatures(self):
+        with self._lock:
+            self._signatures = {
+                path: _file_signature(path)
+                for path in self.repository.watched_paths()
+            }
+
+    def _on_compacted(self):
+        # Chamado pela thread de compactação; não usa o lock para não bloquear
+        # quem aguarda a compactação terminar enquanto o detém
+        self._compacted = True
+
+    def check_external_changes(self):
+        """Recarrega os dados se outro processo alterou os arquivos (apenas os.stat)"""
+        with self._lock:
+            # Durante a compactação o snapshot e o diário mudam antes de o
+            # listener avisar: comparar agora confundiria a própria compactação
+            # com uma alteração externa e recarregaria tudo no meio de uma venda
+            if self.repository.is_compacting():
+                return False
+            if self._compacted:
+                self._compacted = False
+                self._remember_signatures()
+                return False
+            if not self._signatures:
+                return False
+            current = {
+                path: _file_signature(path)
+                for path in self.repository.watched_paths()
+            }
+            if current == self._signatures:
+                return False
+
+            get_logger().info("Alteração externa detectada nos dados; recarregando")
+            self._clients = None
+            self._client_index()
+            self._products = self.repository.load_products()
+            self._company = self.repository.load_company()
+            self._daily = None
+            self._products_by_name = None
+            self._remember_signatures()
+        self._publish("reloaded")
+        return True
+
+
+_data_store = None
+_data_store_lock = threading.Lock()
+
+
+def get_data_store():
+    """Retorna o DataStore compartilhado pelo processo"""
+    global _data_store
+    with _data_store_lock:
+        if _data_store is None:
+            _data_store = DataStore(get_repository())
+        return _data_store
@@ -0,0 +1,148 @@
+from storage.repository import (
+    Repository, CLIENTS_PATH, PRODUCTS_PATH, COMPANY_PATH, DEFAULT_COMPANY
+)
+from utils.client_snapshot import client_summary, split_client
+from utils.file_utils import load_json, save_json
+from utils.sales_journal import apply_record, get_journal, record_clients
+
+
+class JsonRepository(Repository):
+    """Repositório sobre os arquivos JSON originais (com diário de vendas)"""
+
+    def __init__(self, clients_path=CLIENTS_PATH, products_path=PRODUCTS_PATH, company_path=COMPANY_PATH):
+        self.clients_path = clients_path
+        self.products_path = products_path
+        self.company_path = company_path
+        self.journal = get_journal(clients_path)
+        # Snapshot lido por load_client_index e históricos já montados com o diário
+        self._snapshot = None
+        self._histories = {}
+
+    # Clientes
+    def load_clients(self):
+        return self.journal.load()
+
+    def save_clients(self, data):
+        self.journal.reset(data)
+        self._snapshot = None
+        self._histories = {}
+
+    def load_client_index(self):
+        return self._load_snapshot()
+
+    def _load_snapshot(self):
+        """Lê o índice do snapshot e monta o histórico dos clientes com vendas no diário"""
+        snapshot, records = self.journal.load_snapshot()
+        clients, summary = snapshot.index()
+
+        # Clientes alterados por registros ainda no diário: montar só o histórico deles
+        touched = {}
+        for record in records:
+            for name in record_clients(record):
+                if name not in touched and (record.get("op") == "sale" or name in clients):
+                    touched[name] = dict(clients.get(name, {"credits": 0.0}), **snapshot.history(name))
+        seen = {}
+        for record in records:
+            apply_record(touched, record, seen)
+
+        histories = {}
+        for name, client in touched.items():
+            clients[name], histories[name] = split_client(client)
+            summary[name] = client_summary(client)
+
+        self._snapshot = snapshot
+        self._histories = histories
+        return clients, summary
+
+    def load_client_history(self, client_name):
+        history = self._histories.pop(client_name, None)
+        if history is not None:
+            return history
+        if self._snapshot is None:
+            # Snapshot regravado (save_clients): reler só o índice, uma vez
+            self._load_snapshot()
+            history = self._histories.pop(client_name, None)
+            if history is not None:
+                return history
+        return self._snapshot.history(client_name)
+
+    def set_credits(self, updates):
+        # Como nas vendas: um registro no diário, incorporado na compactação
+        self.journal.append_credits(dict(updates))
+
+    def settle_clients(self, updates):
+        self.journal.append_settle(dict(updates))
+
+    # Vendas
+    def add_sale(self, client_name, sale, credits=None):
+        self.journal.append_sale(client_name, sale, credits)
+
+    def update_sale(self, client_name, sale):
+        # Um registro no diário; a compactação incorpora a alteração ao snapshot
+        self.journal.append_update(client_name, sale)
+
+    def get_sale(self, client_name, sale_id):
+        for sale in self.load_clients().get(client_name, {}).get("sales", []):
+            if sale.get("id") == sale_id:
+                return sale
+        return None
+
+    def find_sales(self, client_name=None, date=None):
+        rows = []
+        for name, client in self.load_clients().items():
+            if client_name is not None and name != client_name:
+                continue
+            for sale in client.get("sales", []):
+                if date and sale.get("date") != date:
+                    continue
+                rows.append((name, sale))
+        return rows
+
+    def unpaid_sales(self, client_name):
+        sales = self.load_clients().get(client_name, {}).get("sales", [])
+        return [sale for sale in sales if not sale.get("paid", False)]
+
+    # Produtos
+    def load_products(self):
+        return load_json(self.products_path, [])
+
+    def save_products(self, products):
+        if not save_json(self.products_path, products):
+            raise OSError(f"Não foi possível salvar {self.products_path}")
+
+    def adjust_stock(self, deltas):
+        products = self.load_products()
+        products_by_name = {}
+        for product in products:
+            products_by_name.setdefault(product.get("name"), product)
+        for name, qty in deltas.items():
+            product = products_by_name.get(name)
+            if product is not None and qty:
+                product["stock"] = int(product.get("stock", 0)) + qty
+        self.save_products(products)
+
+    # Empresa
+    def load_company(self):
+        return load_json(self.company_path, dict(DEFAULT_COMPANY))
+
+    def save_company(self, data):
+        if not save_json(self.company_path, data):
+            raise OSError(f"Não foi possível salvar {self.company_path}")
+
+    def compact(self):
+        self.journal.compact()
+
+    def add_compaction_listener(self, callback):
+        self.journal.compaction_listeners.append(callback)
+
+    def is_compacting(self):
+        return self.journal.is_compacting()
+
+    def watched_paths(self):
+        return [
+            self.clients_path,
+            self.journal.journal_path,
+            self.journal.sealed_path,
+            self.products_path,
+            self.company_path
+        ]
@@ -0,0 +1,166 @@
+import os
+import threading
+from abc import ABC, abstractmethod
+
+# Backend de armazenamento: "json" (padrão, compatível) ou "sqlite"
+STORAGE_ENV = "PDV_STORAGE"
+DATA_DIR = "data"
+CLIENTS_PATH = os.path.join(DATA_DIR, "clients.json")
+PRODUCTS_PATH = os.path.join(DATA_DIR, "products.json")
+COMPANY_PATH = os.path.join(DATA_DIR, "company.json")
+SQLITE_PATH = os.path.join(DATA_DIR, "sistema.db")
+
+DEFAULT_COMPANY = {
+    "name": "Cantina Colégio Ativa",
+    "cnpj": "",
+    "phone": "",
+    "address": ""
+}
+
+
+class Repository(ABC):
+    """Interface comum de acesso a clientes, vendas, produtos e empresa.
+
+    Os dados trafegam nos mesmos formatos dos arquivos JSON originais:
+    clientes como dicionário {nome: {"credits", "sales", ...}}, vendas como
+    dicionários e produtos como lista ordenada.
+
+    Os métodos abstratos são obrigatórios: um backend incompleto falha ao ser
+    criado, não na primeira chamada. Os demais têm implementação padrão.
+    """
+
+    # Clientes
+    @abstractmethod
+    def load_clients(self):
+        raise NotImplementedError
+
+    @abstractmethod
+    def save_clients(self, data):
+        """Substitui todos os clientes (e suas vendas)"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def load_client_index(self):
+        """Clientes sem o histórico de vendas, para abrir a tela sem ler tudo.
+
+        Retorna ({nome: dados sem "sales"},
+                 {nome: (total pendente, maior id de venda, data da última venda)}).
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def load_client_history(self, client_name):
+        """Histórico de um cliente: {"sales": [...]} (e demais campos de histórico)"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def set_credits(self, updates):
+        """Atualiza créditos de vários clientes: {nome: créditos}"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def settle_clients(self, updates):
+        """Marca as vendas pendentes como pagas e grava o novo saldo: {nome: créditos}"""
+        raise NotImplementedError
+
+    # Vendas
+    @abstractmethod
+    def add_sale(self, client_name, sale, credits=None):
+        """Registra uma venda (criando o cliente se necessário)"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def update_sale(self, client_name, sale):
+        """Regrava uma venda existente, identificada pelo id"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_sale(self, client_name, sale_id):
+        raise NotImplementedError
+
+    @abstractmethod
+    def find_sales(self, client_name=None, date=None):
+        """Lista (cliente, venda) filtrando por cliente e/ou data exata"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def unpaid_sales(self, client_name):
+        raise NotImplementedError
+
+    # Produtos
+    @abstractmethod
+    def load_products(self):
+        raise NotImplementedError
+
+    @abstractmethod
+    def save_products(self, products):
+        raise NotImplementedError
+
+    @abstractmethod
+    def adjust_stock(self, deltas):
+        """Soma quantidades ao estoque: {nome do produto: quantidade}"""
+        raise NotImplementedError
+
+    # Empresa
+    @abstractmethod
+    def load_company(self):
+        raise NotImplementedError
+
+    @abstractmethod
+    def save_company(self, data):
+        raise NotImplementedError
+
+    def compact(self):
+        """Manutenção periódica do armazenamento (pode ser no-op)"""
+
+    def add_compaction_listener(self, callback):
+        """Registra callback chamado ao fim de uma compactação em segundo plano"""
+
+    def is_compacting(self):
+        """Compactação em segundo plano em andamento (arquivos mudando sem alterar os dados)"""
+        return False
+
+    def watched_paths(self):
+        """Arquivos usados para detectar alterações feitas por outros processos"""
+        return []
+
+    def import_from(self, other):
+        """Copia todos os dados de outro repositório"""
+        self.save_clients(other.load_clients())
+        self.save_products(other.load_products())
+        self.save_company(other.load_company())
+
+
+_repository = None
+_repository_lock = threading.Lock()
+
+
+def create_repository(backend=None):
+    """Cria o repositório do backend configurado em PDV_STORAGE"""
+    backend = (backend or os.environ.get(STORAGE_ENV, "json")).strip().lower()
+
+    if backend == "sqlite":
+        from storage.json_repository import JsonRepository
+        from storage.sqlite_repository import SQLiteRepository
+
+        is_new = not os.path.exists(SQLITE_PATH)
+        repository = SQLiteRepository(SQLITE_PATH)
+        if is_new:
+            # Primeira execução com SQLite: migrar os arquivos JSON existentes
+            repository.import_from(JsonRepository())
+        return repository
+
+    if backend == "json":
+        from storage.json_repository import JsonRepository
+        return JsonRepository()
+
+    raise ValueError(f"Backend de armazenamento desconhecido: {backend}")
+
+
+def get_repository():
+    """Retorna o repositório compartilhado pelo processo"""
+    global _repository
+    with _repository_lock:
+        if _repository is None:
+            _repository = create_repository()
+        return _repository
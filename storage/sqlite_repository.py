@@ -0,0 +1,309 @@
+import json
+import os
+import sqlite3
+import threading
+from storage.repository import Repository, DEFAULT_COMPANY
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS clients (
+    name TEXT PRIMARY KEY,
+    credits REAL NOT NULL DEFAULT 0,
+    extra TEXT NOT NULL DEFAULT '{}'
+);
+CREATE TABLE IF NOT EXISTS sales (
+    rowid INTEGER PRIMARY KEY,
+    client TEXT NOT NULL REFERENCES clients(name) ON DELETE CASCADE,
+    sale_id INTEGER,
+    date TEXT,
+    total REAL NOT NULL DEFAULT 0,
+    paid INTEGER NOT NULL DEFAULT 0,
+    cancelled INTEGER NOT NULL DEFAULT 0,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_sales_client ON sales(client, sale_id);
+CREATE INDEX IF NOT EXISTS idx_sales_date ON sales(date);
+CREATE INDEX IF NOT EXISTS idx_sales_unpaid ON sales(client) WHERE paid = 0;
+CREATE TABLE IF NOT EXISTS sale_items (
+    sale_rowid INTEGER NOT NULL REFERENCES sales(rowid) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    quantity INTEGER NOT NULL DEFAULT 1,
+    price REAL NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_sale_items_sale ON sale_items(sale_rowid);
+CREATE INDEX IF NOT EXISTS idx_sale_items_name ON sale_items(name);
+CREATE TABLE IF NOT EXISTS products (
+    position INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_products_name ON products(name);
+CREATE TABLE IF NOT EXISTS settings (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+def _dumps(value):
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+class SQLiteRepository(Repository):
+    """Repositório SQLite (WAL) com índices por cliente, data e produto"""
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        parent = os.path.dirname(db_path)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+
+        self._lock = threading.RLock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+    # Auxiliares
+    def _ensure_client(self, client_name):
+        self.conn.execute(
+            "INSERT OR IGNORE INTO clients (name, credits, extra) VALUES (?, 0, '{}')",
+            (client_name,)
+        )
+
+    def _insert_sale(self, client_name, sale):
+        cursor = self.conn.execute(
+            "INSERT INTO sales (client, sale_id, date, total, paid, cancelled, data) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                client_name,
+                sale.get("id"),
+                sale.get("date"),
+                float(sale.get("total", 0.0)),
+                1 if sale.get("paid", False) else 0,
+                1 if sale.get("cancelled", False) else 0,
+                _dumps(sale)
+            )
+        )
+        self.conn.executemany(
+            "INSERT INTO sale_items (sale_rowid, name, quantity, price) VALUES (?, ?, ?, ?)",
+            [
+                (
+                    cursor.lastrowid,
+                    item.get("name", ""),
+                    int(item.get("quantity", 1)),
+                    float(item.get("price", 0.0))
+                )
+                for item in sale.get("items", [])
+            ]
+        )
+
+    # Clientes
+    def load_clients(self):
+        with self._lock:
+            data = {}
+            for name, credits, extra in self.conn.execute(
+                "SELECT name, credits, extra FROM clients ORDER BY rowid"
+            ):
+                client = json.loads(extra)
+                client["credits"] = credits
+                client["sales"] = []
+                data[name] = client
+
+            for client_name, sale_data in self.conn.execute(
+                "SELECT client, data FROM sales ORDER BY rowid"
+            ):
+                data[client_name]["sales"].append(json.loads(sale_data))
+            return data
+
+    def load_client_index(self):
+        with self._lock:
+            clients = {}
+            for name, credits, extra in self.conn.execute(
+                "SELECT name, credits, extra FROM clients ORDER BY rowid"
+            ):
+                client = json.loads(extra)
+                client["credits"] = credits
+                clients[name] = client
+
+            summary = {
+                name: (owed or 0.0, last_sale_id or 0, last_sale_date or "")
+                for name, owed, last_sale_id, last_sale_date in self.conn.execute(
+                    "SELECT client, SUM(CASE WHEN paid = 0 AND cancelled = 0 THEN total ELSE 0 END), "
+                    "MAX(sale_id), MAX(date) FROM sales GROUP BY client"
+                )
+            }
+            return clients, summary
+
+    def load_client_history(self, client_name):
+        with self._lock:
+            return {
+                "sales": [
+                    json.loads(sale_data)
+                    for (sale_data,) in self.conn.execute(
+                        "SELECT data FROM sales WHERE client = ? ORDER BY rowid",
+                        (client_name,)
+                    )
+                ]
+            }
+
+    def save_clients(self, data):
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM sale_items")
+            self.conn.execute("DELETE FROM sales")
+            self.conn.execute("DELETE FROM clients")
+            for name, client in data.items():
+                extra = {k: v for k, v in client.items() if k not in ("credits", "sales")}
+                self.conn.execute(
+                    "INSERT INTO clients (name, credits, extra) VALUES (?, ?, ?)",
+                    (name, float(client.get("credits", 0.0)), _dumps(extra))
+                )
+                for sale in client.get("sales", []):
+                    self._insert_sale(name, sale)
+
+    def set_credits(self, updates):
+        with self._lock, self.conn:
+            self.conn.executemany(
+                "UPDATE clients SET credits = ? WHERE name = ?",
+                [(float(credits), name) for name, credits in updates.items()]
+            )
+
+    def settle_clients(self, updates):
+        with self._lock, self.conn:
+            for name, credits in updates.items():
+                self.conn.execute(
+                    "UPDATE clients SET credits = ? WHERE name = ?",
+                    (float(credits), name)
+                )
+                pending = self.conn.execute(
+                    "SELECT rowid, data FROM sales WHERE client = ? AND paid = 0",
+                    (name,)
+                ).fetchall()
+                for rowid, sale_data in pending:
+                    sale = json.loads(sale_data)
+                    sale["paid"] = True
+                    self.conn.execute(
+                        "UPDATE sales SET paid = 1, data = ? WHERE rowid = ?",
+                        (_dumps(sale), rowid)
+                    )
+
+    # Vendas
+    def add_sale(self, client_name, sale, credits=None):
+        with self._lock, self.conn:
+            self._ensure_client(client_name)
+            self._insert_sale(client_name, sale)
+            if credits is not None:
+                self.conn.execute(
+                    "UPDATE clients SET credits = ? WHERE name = ?",
+                    (float(credits), client_name)
+                )
+
+    def update_sale(self, client_name, sale):
+        with self._lock, self.conn:
+            self.conn.execute(
+                "UPDATE sales SET date = ?, total = ?, paid = ?, cancelled = ?, data = ? "
+                "WHERE client = ? AND sale_id = ?",
+                (
+                    sale.get("date"),
+                    float(sale.get("total", 0.0)),
+                    1 if sale.get("paid", False) else 0,
+                    1 if sale.get("cancelled", False) else 0,
+                    _dumps(sale),
+                    client_name,
+                    sale.get("id")
+                )
+            )
+
+    def get_sale(self, client_name, sale_id):
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT data FROM sales WHERE client = ? AND sale_id = ?",
+                (client_name, sale_id)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def find_sales(self, client_name=None, date=None):
+        query = "SELECT client, data FROM sales"
+        conditions = []
+        params = []
+        if client_name is not None:
+            conditions.append("client = ?")
+            params.append(client_name)
+        if date:
+            conditions.append("date = ?")
+            params.append(date)
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY rowid"
+
+        with self._lock:
+            return [(name, json.loads(sale_data)) for name, sale_data in self.conn.execute(query, params)]
+
+    def unpaid_sales(self, client_name):
+        with self._lock:
+            return [
+                json.loads(sale_data)
+                for (sale_data,) in self.conn.execute(
+                    "SELECT data FROM sales WHERE client = ? AND paid = 0 ORDER BY rowid",
+                    (client_name,)
+                )
+            ]
+
+    # Produtos
+    def load_products(self):
+        with self._lock:
+            return [
+                json.loads(product_data)
+                for (product_data,) in self.conn.execute("SELECT data FROM products ORDER BY position")
+            ]
+
+    def save_products(self, products):
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM products")
+            self.conn.executemany(
+                "INSERT INTO products (position, name, data) VALUES (?, ?, ?)",
+                [(position, product.get("name", ""), _dumps(product)) for position, product in enumerate(products)]
+            )
+
+    def adjust_stock(self, deltas):
+        # Nomes repetidos: só o primeiro produto da lista, como no JSON e no DataStore
+        with self._lock, self.conn:
+            for name, qty in deltas.items():
+                if not qty:
+                    continue
+                row = self.conn.execute(
+                    "SELECT position, data FROM products WHERE name = ? ORDER BY position LIMIT 1", (name,)
+                ).fetchone()
+                if row is None:
+                    continue
+                position, product_data = row
+                product = json.loads(product_data)
+                product["stock"] = int(product.get("stock", 0)) + qty
+                self.conn.execute(
+                    "UPDATE products SET data = ? WHERE position = ?",
+                    (_dumps(product), position)
+                )
+
+    # Empresa
+    def load_company(self):
+        with self._lock:
+            row = self.conn.execute("SELECT value FROM settings WHERE key = 'company'").fetchone()
+        return json.loads(row[0]) if row else dict(DEFAULT_COMPANY)
+
+    def save_company(self, data):
+        with self._lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO settings (key, value) VALUES ('company', ?)",
+                (_dumps(data),)
+            )
+
+    def compact(self):
+        with self._lock:
+            self.conn.execute("PRAGMA wal_checkpoint(PASSIVE)")
+
+    def watched_paths(self):
+        return [self.db_path, f"{self.db_path}-wal"]
@@ -0,0 +1 @@
+# Testes unitários (python -m pytest)
@@ -0,0 +1,48 @@
+from models.cart import CART_LIMIT_CENTS, Cart, to_cents
+
+
+def test_to_cents_arredonda():
+    assert to_cents(0.1) == 10
+    assert to_cents(2.675) == 268
+    assert to_cents("4.50") == 450
+
+
+def test_total_em_centavos_sem_erro_de_ponto_flutuante():
+    cart = Cart()
+    for _ in range(10):
+        cart.add("Bala", 0.1)
+    cart.add("Suco", 0.2)
+    assert cart.total_cents == 120
+    assert cart.total == 1.2
+    assert cart.items["Bala"].subtotal == 1.0
+
+
+def test_diminuir_e_remover_atualizam_o_total():
+    cart = Cart()
+    cart.add("Coxinha", 6.5)
+    cart.add("Coxinha", 6.5)
+    cart.add("Suco", 5.0)
+    cart.decrease("Coxinha")
+    assert cart.total_cents == 1150
+    cart.decrease("Coxinha")
+    assert "Coxinha" not in cart
+    cart.remove("Suco")
+    assert cart.total_cents == 0 and not cart
+
+
+def test_eventos_publicados():
+    cart = Cart()
+    events = []
+    cart.subscribe(lambda event, name: events.append((event, name)))
+    cart.add("Bolo", 7.0)
+    cart.add("Bolo", 7.0)
+    cart.decrease("Bolo")
+    cart.clear()
+    assert events == [("added", "Bolo"), ("changed", "Bolo"), ("changed", "Bolo"), ("cleared", None)]
+
+
+def test_limite_da_compra():
+    cart = Cart()
+    cart.add("Item", (CART_LIMIT_CENTS - 100) / 100)
+    assert cart.fits(1.0)
+    assert not cart.fits(1.01)
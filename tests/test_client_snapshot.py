@@ -0,0 +1,40 @@
+import pytest
+
+from utils.client_snapshot import SNAPSHOT_FORMATS, ClientSnapshot, dump_snapshot
+
+CLIENTS = {
+    "Ana": {
+        "credits": 12.5,
+        "matricula": "2026001",
+        "sales": [
+            {"id": 1, "date": "2026-03-02", "total": 10.0, "paid": True},
+            {"id": 3, "date": "2026-03-04", "total": 7.5, "paid": False},
+        ],
+    },
+    "José Ávila": {"credits": 0.0, "sales": []},
+}
+
+
+@pytest.mark.parametrize("snapshot_format", SNAPSHOT_FORMATS)
+def test_ida_e_volta(snapshot_format):
+    snapshot = ClientSnapshot(dump_snapshot(CLIENTS, snapshot_format))
+    assert snapshot.full() == CLIENTS
+    assert snapshot.history("Ana") == {"sales": CLIENTS["Ana"]["sales"]}
+    assert snapshot.history("Inexistente") == {}
+
+
+@pytest.mark.parametrize("snapshot_format", SNAPSHOT_FORMATS)
+def test_indice_com_resumo(snapshot_format):
+    clients, summary = ClientSnapshot(dump_snapshot(CLIENTS, snapshot_format)).index()
+    assert clients["Ana"] == {"credits": 12.5, "matricula": "2026001"}
+    assert summary["Ana"] == (7.5, 3, "2026-03-04")
+
+
+def test_snapshot_indexado_truncado():
+    content = dump_snapshot(CLIENTS, "indexed")
+    with pytest.raises(ValueError):
+        ClientSnapshot(content[:-5])
+
+
+def test_snapshot_vazio():
+    assert ClientSnapshot(b"").full() == {}
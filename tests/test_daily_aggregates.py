@@ -0,0 +1,66 @@
+from reports.daily_aggregates import DailyAggregates
+from reports.report_generator import build_day_report
+
+DAY = "2026-03-02"
+
+
+def make_sale(sale_id, items, paid=True, date=DAY):
+    total = round(sum(price * quantity for _, price, quantity in items), 2)
+    return {
+        "id": sale_id,
+        "date": date,
+        "timestamp": f"{date} 10:00:00",
+        "items": [{"name": name, "price": price, "quantity": quantity} for name, price, quantity in items],
+        "total": total,
+        "paid": paid,
+    }
+
+
+def clients():
+    return {
+        "Ana": {"sales": [make_sale(1, [("Suco", 0.1, 3), ("Bolo", 7.0, 1)])]},
+        "Bruno": {"sales": [make_sale(2, [("Suco", 0.1, 1)], paid=False), make_sale(3, [("Bolo", 7.0, 2)])]},
+    }
+
+
+def summary(report):
+    return {key: round(report["summary"][key], 2) for key in ("total_sales", "total_paid", "total_pending")}
+
+
+def test_relatorio_igual_ao_da_varredura():
+    data = clients()
+    report = DailyAggregates(data).day_report(DAY)
+    expected = build_day_report(data, DAY)
+    assert summary(report) == summary(expected)
+    assert len(report["sales_rows"]) == 3
+
+
+def test_cancelamento_retira_a_venda_dos_totais():
+    data = clients()
+    aggregates = DailyAggregates(data)
+    old_sale = data["Ana"]["sales"][0]
+    cancelled = dict(old_sale, cancelled=True)
+    aggregates.update_sale("Ana", old_sale, cancelled)
+    data["Ana"]["sales"][0] = cancelled
+
+    bucket = aggregates.buckets[DAY]
+    assert bucket.total_cents == 1410
+    assert bucket.products == {"Suco": [1, 10], "Bolo": [2, 1400]}
+    assert summary(aggregates.day_report(DAY)) == summary(build_day_report(data, DAY))
+
+
+def test_adicionar_e_remover_volta_ao_estado_anterior():
+    aggregates = DailyAggregates(clients())
+    before = aggregates.buckets[DAY].total_cents, dict(aggregates.buckets[DAY].products)
+    sale = make_sale(9, [("Suco", 0.1, 7)])
+    aggregates.add_sale("Carla", sale)
+    aggregates.remove_sale("Carla", sale)
+    bucket = aggregates.buckets[DAY]
+    assert (bucket.total_cents, bucket.products) == before
+
+
+def test_dia_sem_vendas_sai_do_indice():
+    sale = make_sale(1, [("Bolo", 7.0, 1)], date="2026-03-03")
+    aggregates = DailyAggregates({"Ana": {"sales": [sale]}})
+    aggregates.update_sale("Ana", sale, dict(sale, cancelled=True))
+    assert aggregates.dates == [] and aggregates.buckets == {}
@@ -0,0 +1,49 @@
+import pytest
+
+pytest.importorskip("PySide6")
+
+from managers.sales_table_model import SalesIndex  # noqa: E402
+
+CLIENTS = {
+    "Ana": {"sales": [
+        {"id": 1, "date": "2026-03-02", "total": 10.0, "paid": True},
+        {"id": 4, "date": "2026-03-05", "total": 7.5, "paid": False},
+    ]},
+    "Bruno": {"sales": [
+        {"id": 2, "date": "2026-03-02", "total": 4.0, "paid": True},
+        {"id": 3, "date": "2026-03-04", "total": 9.0, "paid": True},
+    ]},
+}
+
+
+def sale_ids(index, record_ids):
+    return [index.records[record_id][1] for record_id in record_ids]
+
+
+def test_intervalo_inclui_as_duas_pontas():
+    index = SalesIndex(CLIENTS)
+    assert sorted(sale_ids(index, index.query(start_date="2026-03-02", end_date="2026-03-04"))) == [1, 2, 3]
+    assert sale_ids(index, index.query(start_date="2026-03-05", end_date="2026-03-05")) == [4]
+
+
+def test_intervalo_aberto_e_vazio():
+    index = SalesIndex(CLIENTS)
+    assert len(index.query()) == 4
+    assert sale_ids(index, index.query(start_date="2026-03-04")) == [3, 4]
+    assert sale_ids(index, index.query(end_date="2026-03-01")) == []
+    assert index.query(start_date="2026-03-06", end_date="2026-03-01") == []
+
+
+def test_filtro_por_cliente_em_ordem_cronologica():
+    index = SalesIndex(CLIENTS)
+    assert sale_ids(index, index.query("Bruno")) == [2, 3]
+    assert sale_ids(index, index.query("Ana", end_date="2026-03-04")) == [1]
+    assert index.query("Carla") == []
+
+
+def test_venda_adicionada_entra_na_posicao_da_data():
+    index = SalesIndex(CLIENTS)
+    record_id = index.add("Carla", {"id": 5, "date": "2026-03-03", "total": 3.0})
+    assert sale_ids(index, index.query(start_date="2026-03-03", end_date="2026-03-04")) == [5, 3]
+    assert index.matches(record_id, "Carla", "2026-03-03", "2026-03-03")
+    assert not index.matches(record_id, "Ana")
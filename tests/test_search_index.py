@@ -0,0 +1,53 @@
+from utils.search_index import ProductSearchIndex, normalize
+
+PRODUCTS = [
+    {"name": "Pão de Queijo", "category": "Salgados"},
+    {"name": "Coxinha de Frango", "category": "Salgados"},
+    {"name": "Suco de Laranja", "category": "Bebidas"},
+    {"name": "Bolo de Chocolate", "category": "Doces"},
+    {"name": "Pão Integral", "category": "Lanches"},
+]
+
+
+def names(index, query="", category=None):
+    return [PRODUCTS[doc_id]["name"] for doc_id in index.search(query, category)]
+
+
+def test_normalize_remove_acentos_e_pontuacao():
+    assert normalize("  Pão-de-Queijo! ") == "pao de queijo"
+
+
+def test_busca_vazia_mantem_ordem_original():
+    assert names(ProductSearchIndex(PRODUCTS)) == [product["name"] for product in PRODUCTS]
+
+
+def test_busca_por_prefixo_sem_acento():
+    index = ProductSearchIndex(PRODUCTS)
+    assert names(index, "pao de q") == ["Pão de Queijo"]
+    assert names(index, "pa") == ["Pão de Queijo", "Pão Integral"]
+
+
+def test_busca_por_trigrama_no_meio_da_palavra():
+    index = ProductSearchIndex(PRODUCTS)
+    assert names(index, "ranj") == ["Suco de Laranja"]
+    assert names(index, "colat") == ["Bolo de Chocolate"]
+    assert names(index, "xyz") == []
+
+
+def test_trigrama_so_aceita_trecho_confirmado_no_nome():
+    # "teg" e "gra" existem em "integral", mas "tegra" não está em "frango"
+    index = ProductSearchIndex(PRODUCTS)
+    assert names(index, "tegra") == ["Pão Integral"]
+    assert names(index, "rang") == ["Coxinha de Frango"]
+
+
+def test_palavra_exata_antes_do_prefixo_e_do_trecho():
+    products = [{"name": "Caramelo"}, {"name": "Pão Melado"}, {"name": "Bolo de Mel"}]
+    index = ProductSearchIndex(products)
+    assert [products[doc_id]["name"] for doc_id in index.search("mel")] == ["Bolo de Mel", "Pão Melado", "Caramelo"]
+
+
+def test_filtro_de_categoria():
+    index = ProductSearchIndex(PRODUCTS)
+    assert names(index, "pao", category="Lanches") == ["Pão Integral"]
+    assert names(index, category="salgados") == ["Pão de Queijo", "Coxinha de Frango"]
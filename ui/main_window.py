@@ -1,19 +1,21 @@
 import os
-import json
 import subprocess
 import platform
 from datetime import datetime
 import customtkinter as ctk
 from tkinter import messagebox, filedialog
-from PIL import Image, ImageDraw
 
-# Importar managers (ainda usando PySide6, mas podemos adaptar depois)
-from managers.product_manager import ProductManager
-from managers.client_manager import ClientManager
-from widgets.company_dialog import CompanyDialog
-from widgets.confirmation_dialog import ConfirmationDialog
+# Gerenciadores (PySide6) e diálogos usados só sob demanda são importados nos
+# métodos que os abrem: o PySide6 sozinho dobra o tempo de abertura do caixa
 from widgets.alert_dialog import AlertDialog
-from widgets.sales_selection_dialog import SalesSelectionDialog
+from widgets.product_button import ProductCard
+from storage.data_store import get_data_store
+from models.cart import Cart
+from utils.search_index import ProductSearchIndex
+from utils import instrumentation
+from utils.instrumentation import measure, timed
+from reports.receipt_service import get_receipt_service, poll_future
+from reports.escpos_receipt import render_receipt, print_receipt, printer_paper_mm, thermal_printer_configured
 
 # Configuração do CustomTkinter
 ctk.set_appearance_mode("dark")
@@ -29,16 +31,27 @@ COLORS = {
     "text_gray": "#a0a0a0"
 }
 
+# Intervalo da manutenção periódica do armazenamento (compactação do diário) em ms
+STORAGE_COMPACT_INTERVAL_MS = 5 * 60 * 1000
+# Intervalo da verificação de alterações externas nos arquivos de dados (ms)
+EXTERNAL_CHECK_INTERVAL_MS = 5000
+# Espera após a última tecla antes de filtrar os produtos (ms)
+SEARCH_DEBOUNCE_MS = 150
+# Intervalo do resumo de desempenho gravado no log quando o diagnóstico está ligado (ms)
+DIAGNOSTICS_LOG_INTERVAL_MS = 10 * 60 * 1000
+# Espera após o último <Configure> antes de refazer o layout do grid (ms)
+LAYOUT_DEBOUNCE_MS = 80
+# Abaixo desta altura de janela o Total usa a fonte menor
+COMPACT_HEIGHT = 760
+
 class MainWindow(ctk.CTk):
     """Janela principal do sistema PDV com CustomTkinter"""
     
     def __init__(self):
         super().__init__()
         
-        # Caminhos dos arquivos
-        self.products_path = "data/products.json"
-        self.clients_path = "data/clients.json"
-        self.company_path = "data/company.json"
+        # Dados em memória compartilhados com os gerenciadores (JSON ou SQLite, conforme PDV_STORAGE)
+        self.store = get_data_store()
         
         # Carregar informações da empresa
         self.company_data = self.load_company_data()
@@ -51,13 +64,25 @@ class MainWindow(ctk.CTk):
         
         # Estado da aplicação
         self.total = 0.0
-        self.cart = {}  # {name: {"price": float, "qty": int}}
+        self.cart = Cart()  # total mantido em centavos; avisa cada alteração
+        self.cart.subscribe(self.on_cart_changed)
+        self.cart_rows = {}  # {nome: widgets da linha do carrinho}
         self.current_client = None
         self.client_credits = 0.0
         self.filtered_products = []
+        self.filtered_keys = []
         self.current_category = "Todos"
         self.selected_cart_item = None  # Item selecionado no carrinho
         self.current_columns = 4  # Número atual de colunas no grid
+        self.product_cards = {}  # {chave do produto: ProductCard} reaproveitados entre filtros
+        self.card_positions = {}  # {chave do produto: (linha, coluna)} dos cards visíveis
+        self.search_job = None
+        self.layout_job = None  # passada de layout pendente (agrupa rajadas de resize)
+        self.total_fonts = {}  # {tamanho: CTkFont} do valor total, criadas uma vez
+        self.total_font_size = 36
+        self.search_index = ProductSearchIndex()
+        self.qt_bridge = None  # janelas PySide6 (gerenciadores), criada sob demanda
+        self.diagnostics_dialog = None
         
         # Configurar grid principal
         self.grid_columnconfigure(0, weight=35, minsize=350)  # Sidebar com tamanho mínimo
@@ -75,9 +100,21 @@ class MainWindow(ctk.CTk):
         self.load_products()
         self.load_clients()
         
+        # Atualizar a interface quando os dados mudarem (inclusive pelos gerenciadores)
+        self.subscribe_store_events()
+        
+        # Manutenção periódica do armazenamento em segundo plano
+        self.after(STORAGE_COMPACT_INTERVAL_MS, self.compact_storage)
+        self.after(EXTERNAL_CHECK_INTERVAL_MS, self.check_external_changes)
+        self.after(DIAGNOSTICS_LOG_INTERVAL_MS, self.log_diagnostics)
+        
+        # Fechar também os gerenciadores abertos
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+        
         # Bind teclado
         self.bind("<F12>", lambda e: self.finish_order())
         self.bind("<Control-l>", lambda e: self.clear_cart())
+        self.bind("<Control-d>", lambda e: self.open_diagnostics())
         
         # Focar na janela
         self.focus_set()
@@ -233,6 +270,15 @@ class MainWindow(ctk.CTk):
         self.cart_scroll.grid(row=1, column=0, sticky="nsew", pady=(0, 8))
         self.cart_scroll.grid_columnconfigure(0, weight=1)
         
+        self.cart_empty_label = ctk.CTkLabel(
+            self.cart_scroll,
+            text="Carrinho vazio",
+            font=ctk.CTkFont(size=12),
+            text_color=COLORS["text_gray"],
+            fg_color="transparent"
+        )
+        self.cart_empty_label.pack(pady=20)
+        
         # Botões de controle do carrinho - Sempre visíveis
         cart_controls = ctk.CTkFrame(cart_section, fg_color="transparent")
         cart_controls.grid(row=2, column=0, sticky="nsew", pady=(5, 0))
@@ -327,7 +373,7 @@ class MainWindow(ctk.CTk):
         self.total_value_label = ctk.CTkLabel(
             footer,
             text="R$ 0,00",
-            font=ctk.CTkFont(size=36, weight="bold"),
+            font=self.get_total_font(self.total_font_size),
             text_color=COLORS["green"]
         )
         self.total_value_label.grid(row=1, column=0, sticky="w", pady=(0, 20))
@@ -362,6 +408,15 @@ class MainWindow(ctk.CTk):
         )
         self.btn_finish.grid(row=0, column=1, sticky="ew", padx=(5, 0))
         
+        # Andamento dos comprovantes gerados em segundo plano
+        self.receipt_status_label = ctk.CTkLabel(
+            footer,
+            text="",
+            font=ctk.CTkFont(size=11),
+            text_color=COLORS["text_gray"]
+        )
+        self.receipt_status_label.grid(row=3, column=0, sticky="w", pady=(5, 0))
+        
         # Menu superior (simulado com botões)
         menu_frame = ctk.CTkFrame(sidebar, fg_color="transparent", height=40)
         menu_frame.grid(row=5, column=0, sticky="ew", padx=20, pady=(10, 0))
@@ -482,24 +537,66 @@ class MainWindow(ctk.CTk):
         self.after(100, self.update_products_grid_columns)
     
     def load_products(self):
-        """Carrega produtos do arquivo JSON"""
-        if not os.path.exists(self.products_path):
-            return
-        
+        """Carrega produtos do DataStore"""
         try:
-            with open(self.products_path, "r", encoding="utf-8") as f:
-                self.all_products = json.load(f)
-            
-            # Validar e limitar preços dos produtos existentes
-            for product in self.all_products:
+            # Validar e limitar preços dos produtos existentes (sem alterar o DataStore)
+            self.all_products = []
+            for product in self.store.get_products():
                 if "price" in product and product["price"] > 9999:
-                    product["price"] = 9999
+                    product = dict(product, price=9999)
+                self.all_products.append(product)
         except Exception as e:
             print(f"Erro ao carregar produtos: {e}")
             self.all_products = []
         
-        self.filtered_products = self.all_products.copy()
-        self.display_products()
+        self.sync_product_cards()
+        self.search_index = ProductSearchIndex()
+        for doc_id, key in enumerate(self.product_keys):
+            if key is not None:
+                self.search_index.add(doc_id, self.all_products[doc_id])
+        self.apply_product_filters()
+    
+    def sync_product_cards(self):
+        """Cria ou recria apenas os cards de produtos novos ou alterados"""
+        self.product_keys = []
+        wanted = {}
+        occurrences = {}
+        for product in self.all_products:
+            name = product.get("name")
+            price = product.get("price")
+            if name is None or price is None:
+                self.product_keys.append(None)
+                continue
+            # Nomes repetidos recebem chaves distintas
+            key = (name, occurrences.get(name, 0))
+            occurrences[name] = key[1] + 1
+            self.product_keys.append(key)
+            wanted[key] = (price, product.get("icon", "📦"), product.get("category", "Salgados"))
+        
+        for key in list(self.product_cards):
+            card = self.product_cards[key]
+            if wanted.get(key) != card.signature:
+                card.destroy()
+                del self.product_cards[key]
+                self.card_positions.pop(key, None)
+        
+        for key, signature in wanted.items():
+            if key in self.product_cards:
+                continue
+            price, icon, category = signature
+            # Criar card de produto (sem tamanho fixo para ser responsivo)
+            card = ProductCard(
+                self.products_grid,
+                name=key[0],
+                price=price,
+                icon=icon,
+                category=category
+            )
+            
+            # Bind click
+            for widget in [card, card.image_label, card.name_label, card.price_label]:
+                widget.bind("<Button-1>", lambda e, c=card: self.add_to_cart(c.name, c.price))
+            self.product_cards[key] = card
     
     def load_products_grid(self, grid_layout=None):
         """Método de compatibilidade para ProductManager (PySide6)"""
@@ -510,8 +607,7 @@ class MainWindow(ctk.CTk):
     def calculate_columns(self):
         """Calcula o número de colunas baseado no tamanho disponível"""
         try:
-            # Obter largura disponível do frame de produtos
-            self.update_idletasks()
+            # Obter largura disponível do frame de produtos (já atualizada pelo <Configure>)
             products_frame_width = self.products_scroll.winfo_width()
             
             if products_frame_width < 100:
@@ -539,120 +635,96 @@ class MainWindow(ctk.CTk):
             return 4  # Fallback
     
     def update_products_grid_columns(self):
-        """Atualiza o número de colunas do grid de produtos"""
+        """Atualiza o número de colunas do grid de produtos; retorna True se mudou"""
         columns = self.calculate_columns()
-        
-        if columns != self.current_columns:
-            self.current_columns = columns
-            
-            # Limpar configuração anterior
-            for i in range(10):  # Limpar até 10 colunas
-                self.products_grid.grid_columnconfigure(i, weight=0)
-            
-            # Configurar novas colunas
-            for i in range(columns):
-                self.products_grid.grid_columnconfigure(i, weight=1, uniform="col")
+        if columns == self.current_columns:
+            return False
+        
+        # Soltar as colunas que deixaram de existir e configurar as novas
+        for i in range(columns, max(columns, self.current_columns)):
+            self.products_grid.grid_columnconfigure(i, weight=0, uniform="")
+        for i in range(columns):
+            self.products_grid.grid_columnconfigure(i, weight=1, uniform="col")
+        self.current_columns = columns
+        return True
+    
+    def get_total_font(self, size):
+        """Fonte do valor total no tamanho pedido, reaproveitada entre redimensionamentos"""
+        font = self.total_fonts.get(size)
+        if font is None:
+            font = ctk.CTkFont(size=size, weight="bold")
+            self.total_fonts[size] = font
+        return font
     
     def adjust_total_font_size(self):
         """Ajusta o tamanho da fonte do Total baseado na altura da janela"""
         if not hasattr(self, 'total_value_label'):
             return
         
-        try:
-            # Obter altura atual da janela
-            window_height = self.winfo_height()
-            
-            # Se a janela está muito baixa (menos de 760px), reduzir fonte
-            if window_height < 760:
-                # Fonte menor: 28px
-                self.total_value_label.configure(
-                    font=ctk.CTkFont(size=28, weight="bold")
-                )
-            else:
-                # Fonte normal: 36px
-                self.total_value_label.configure(
-                    font=ctk.CTkFont(size=36, weight="bold")
-                )
-        except Exception as e:
-            # Se houver erro, manter fonte padrão
-            pass
+        # Janela baixa: fonte menor (28px); senão a normal (36px)
+        size = 28 if self.winfo_height() < COMPACT_HEIGHT else 36
+        if size != self.total_font_size:
+            self.total_font_size = size
+            self.total_value_label.configure(font=self.get_total_font(size))
     
     def on_window_resize(self, event=None):
-        """Callback quando a janela é redimensionada"""
+        """Callback do <Configure>: agenda uma única passada de layout por rajada"""
         if event and event.widget == self:
-            # Atualizar número de colunas
-            old_columns = self.current_columns
-            self.update_products_grid_columns()
-            
-            # Ajustar tamanho da fonte do Total baseado na altura
+            if self.layout_job is not None:
+                self.after_cancel(self.layout_job)
+            self.layout_job = self.after(LAYOUT_DEBOUNCE_MS, self.apply_layout)
+    
+    def apply_layout(self):
+        """Ajusta fonte e colunas ao tamanho final da janela"""
+        self.layout_job = None
+        try:
             self.adjust_total_font_size()
-            
-            # Se o número de colunas mudou, redesenhar produtos
-            if old_columns != self.current_columns:
-                self.after(100, self.display_products)  # Delay para evitar múltiplos redraws
+            # Só reposiciona os cards existentes quando o número de colunas muda
+            if self.update_products_grid_columns():
+                self.display_products()
+        except Exception as e:
+            print(f"Erro ao ajustar o layout: {e}")
     
+    @timed("display_products")
     def display_products(self):
-        """Exibe produtos no grid"""
+        """Exibe no grid os cards dos produtos filtrados, reposicionando só o que mudou"""
         # Atualizar número de colunas antes de exibir
         self.update_products_grid_columns()
         columns = self.current_columns
         
-        # Limpar produtos existentes
-        for widget in self.products_grid.winfo_children():
-            widget.destroy()
-        
-        # Adicionar produtos
-        row = 0
-        col = 0
-        
-        for product in self.filtered_products:
-            name = product.get("name")
-            price = product.get("price")
-            icon = product.get("icon", "📦")
-            category = product.get("category", "Salgados")
-            
-            if name is None or price is None:
-                continue
-            
-            # Criar card de produto (sem tamanho fixo para ser responsivo)
-            from widgets.product_button import ProductCard
-            card = ProductCard(
-                self.products_grid,
-                name=name,
-                price=price,
-                icon=icon,
-                category=category
-            )
-            card.grid(row=row, column=col, padx=10, pady=10, sticky="nsew")
-            
-            # Bind click
-            card.bind("<Button-1>", lambda e, n=name, p=price: self.add_to_cart(n, p))
-            for widget in [card.image_label, card.name_label, card.price_label]:
-                widget.bind("<Button-1>", lambda e, n=name, p=price: self.add_to_cart(n, p))
-            
-            col += 1
-            if col >= columns:
-                col = 0
-                row += 1
+        positions = {}
+        for index, key in enumerate(self.filtered_keys):
+            positions[key] = divmod(index, columns)
+        
+        for key, card in self.product_cards.items():
+            position = positions.get(key)
+            if position is None:
+                if key in self.card_positions:
+                    card.grid_remove()
+                    del self.card_positions[key]
+            elif self.card_positions.get(key) != position:
+                card.grid(row=position[0], column=position[1], padx=10, pady=10, sticky="nsew")
+                self.card_positions[key] = position
+                instrumentation.count("cards reposicionados")
     
     def on_search(self, event=None):
-        """Filtra produtos conforme busca"""
-        search_term = self.search_entry.get().lower()
+        """Agenda a filtragem para depois que o usuário parar de digitar"""
+        if self.search_job is not None:
+            self.after_cancel(self.search_job)
+        self.search_job = self.after(SEARCH_DEBOUNCE_MS, self.apply_product_filters)
+    
+    def apply_product_filters(self):
+        """Filtra produtos pela busca e pela categoria atual"""
+        if self.search_job is not None:
+            self.after_cancel(self.search_job)
+            self.search_job = None
         
-        if not search_term:
-            self.filtered_products = self.all_products.copy()
-        else:
-            self.filtered_products = [
-                p for p in self.all_products
-                if search_term in p.get("name", "").lower()
-            ]
-        
-        # Aplicar filtro de categoria também
-        if self.current_category != "Todos":
-            self.filtered_products = [
-                p for p in self.filtered_products
-                if p.get("category", "").lower() == self.current_category.lower()
-            ]
+        # Busca sem acentos por prefixo/trecho, já ordenada por relevância
+        category = None if self.current_category == "Todos" else self.current_category
+        doc_ids = self.search_index.search(self.search_entry.get(), category)
+        
+        self.filtered_products = [self.all_products[doc_id] for doc_id in doc_ids]
+        self.filtered_keys = [self.product_keys[doc_id] for doc_id in doc_ids]
         
         self.display_products()
     
@@ -668,36 +740,12 @@ class MainWindow(ctk.CTk):
                 btn.configure(fg_color=COLORS["bg_panel"], hover_color="#333333")
         
         # Aplicar filtro
-        search_term = self.search_entry.get().lower()
-        if not search_term:
-            if category == "Todos":
-                self.filtered_products = self.all_products.copy()
-            else:
-                # Filtro por categoria real do produto
-                self.filtered_products = [
-                    p for p in self.all_products
-                    if p.get("category", "").lower() == category.lower()
-                ]
-        else:
-            self.on_search()
-        
-        self.display_products()
+        self.apply_product_filters()
     
     def load_company_data(self):
-        """Carrega informações da empresa do arquivo JSON"""
-        if not os.path.exists(self.company_path):
-            # Retornar valores padrão se arquivo não existir
-            return {
-                "name": "Cantina Colégio Ativa",
-                "cnpj": "",
-                "phone": "",
-                "address": ""
-            }
-        
+        """Carrega informações da empresa do DataStore"""
         try:
-            with open(self.company_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                return data
+            return self.store.get_company()
         except Exception as e:
             print(f"Erro ao carregar dados da empresa: {e}")
             return {
@@ -708,18 +756,15 @@ class MainWindow(ctk.CTk):
             }
     
     def save_company_data(self):
-        """Salva informações da empresa no arquivo JSON"""
-        # Garantir que o diretório existe
-        os.makedirs("data", exist_ok=True)
-        
+        """Salva informações da empresa no DataStore"""
         try:
-            with open(self.company_path, "w", encoding="utf-8") as f:
-                json.dump(self.company_data, f, ensure_ascii=False, indent=2)
+            self.store.save_company(self.company_data)
         except Exception as e:
             self.show_alert("Erro", f"Erro ao salvar dados da empresa: {e}", "error")
     
     def edit_company_info(self):
         """Abre diálogo para editar informações da empresa"""
+        from widgets.company_dialog import CompanyDialog
         dialog = CompanyDialog(self, self.company_data)
         self.wait_window(dialog)
         
@@ -736,14 +781,11 @@ class MainWindow(ctk.CTk):
             
             self.show_alert("Sucesso", "Informações da empresa atualizadas com sucesso!", "info")
     
+    @timed("load_clients")
     def load_clients(self):
-        """Carrega clientes do arquivo JSON"""
-        if not os.path.exists(self.clients_path):
-            return
-        
+        """Carrega o índice de clientes do DataStore (sem o histórico de vendas)"""
         try:
-            with open(self.clients_path, "r", encoding="utf-8") as f:
-                self.clients_data = json.load(f)
+            self.clients_data = self.store.get_client_index()
         except Exception as e:
             print(f"Erro ao carregar clientes: {e}")
             self.clients_data = {}
@@ -776,9 +818,7 @@ class MainWindow(ctk.CTk):
     
     def on_client_selected(self, choice):
         """Callback quando cliente é selecionado"""
-        # Recarregar dados do arquivo para garantir que está atualizado
-        self.load_clients()
-        
+        # Os dados em memória já refletem todas as gravações (eventos do DataStore)
         if choice and choice in self.clients_data:
             self.current_client = choice
             self.refresh_client_info()
@@ -790,138 +830,133 @@ class MainWindow(ctk.CTk):
     
     def add_to_cart(self, name, price):
         """Adiciona produto ao carrinho"""
-        # Calcular novo total antes de adicionar
-        current_total = sum(item["price"] * item["qty"] for item in self.cart.values())
-        new_total = current_total + price
-        
         # Validar se o total não ultrapassa 9999
-        if new_total > 9999:
-            self.show_alert(
-                "Limite Excedido",
-                f"O total da compra não pode ultrapassar R$ 9.999,00!\n\n"
-                f"Total atual: R$ {current_total:.2f}\n"
-                f"Tentativa de adicionar: R$ {price:.2f}\n"
-                f"Total seria: R$ {new_total:.2f}\n\n"
-                f"Limite máximo permitido: R$ 9.999,00",
-                "warning"
-            )
+        if name in self.cart:
+            price = self.cart.items[name].price
+        if not self.cart.fits(price):
+            self.show_limit_alert(price, "Tentativa de adicionar")
             return
         
-        if name in self.cart:
-            self.cart[name]["qty"] += 1
+        self.cart.add(name, price)
+    
+    def show_limit_alert(self, price, action_text):
+        """Avisa que o item não cabe no limite de R$ 9.999,00"""
+        current_total = self.cart.total
+        self.show_alert(
+            "Limite Excedido",
+            f"O total da compra não pode ultrapassar R$ 9.999,00!\n\n"
+            f"Total atual: R$ {current_total:.2f}\n"
+            f"{action_text}: R$ {price:.2f}\n"
+            f"Total seria: R$ {current_total + price:.2f}\n\n"
+            f"Limite máximo permitido: R$ 9.999,00",
+            "warning"
+        )
+    
+    @timed("on_cart_changed")
+    def on_cart_changed(self, event, name):
+        """Atualiza apenas a linha do carrinho afetada pela alteração"""
+        if event == "added":
+            self.create_cart_row(name)
+        elif event == "changed":
+            self.update_cart_row(name)
+        elif event == "removed":
+            self.cart_rows.pop(name)["frame"].destroy()
+            if self.selected_cart_item == name:
+                self.selected_cart_item = None
+        elif event == "cleared":
+            for row in self.cart_rows.values():
+                row["frame"].destroy()
+            self.cart_rows = {}
+            self.selected_cart_item = None
+        
+        # Se o carrinho estiver vazio, mostrar mensagem
+        if self.cart:
+            self.cart_empty_label.pack_forget()
         else:
-            self.cart[name] = {"price": price, "qty": 1}
+            self.cart_empty_label.pack(pady=20)
         
-        self.update_cart_display()
         self.update_total()
     
-    def update_cart_display(self):
-        """Atualiza a exibição do carrinho"""
-        # Limpar carrinho
-        for widget in self.cart_scroll.winfo_children():
-            widget.destroy()
+    def create_cart_row(self, name):
+        """Cria a linha de um item novo no carrinho"""
+        item_frame = ctk.CTkFrame(
+            self.cart_scroll,
+            corner_radius=10,
+            fg_color=COLORS["bg_panel"],
+            border_width=1,
+            border_color="#3a3a3a",
+            height=50  # Altura mínima para garantir visibilidade
+        )
+        item_frame.pack(fill="x", padx=5, pady=3)
+        item_frame.grid_columnconfigure(0, weight=1)
+        item_frame.grid_columnconfigure(1, weight=0)
+        
+        # Hover em azul enquanto o item não estiver selecionado
+        def on_enter_hover(event):
+            if self.selected_cart_item != name:
+                item_frame.configure(border_color="#0077cc", border_width=2)
+        
+        def on_leave_hover(event):
+            if self.selected_cart_item != name:
+                item_frame.configure(border_color="#3a3a3a", border_width=1)
+            else:
+                item_frame.configure(border_color=COLORS["green"], border_width=2)
         
-        # Se o carrinho estiver vazio, mostrar mensagem
-        if not self.cart:
-            empty_label = ctk.CTkLabel(
-                self.cart_scroll,
-                text="Carrinho vazio",
-                font=ctk.CTkFont(size=12),
-                text_color=COLORS["text_gray"],
-                fg_color="transparent"
-            )
-            empty_label.pack(pady=20)
+        item_label = ctk.CTkLabel(
+            item_frame,
+            text="",
+            font=ctk.CTkFont(size=11),
+            anchor="w",
+            fg_color="transparent"
+        )
+        item_label.grid(row=0, column=0, sticky="w", padx=8, pady=8)
+        
+        price_label = ctk.CTkLabel(
+            item_frame,
+            text="",
+            font=ctk.CTkFont(size=11, weight="bold"),
+            text_color=COLORS["green"],
+            anchor="e",
+            fg_color="transparent"
+        )
+        price_label.grid(row=0, column=1, sticky="e", padx=8, pady=8)
+        
+        for widget in (item_frame, item_label, price_label):
+            # Clique simples (e duplo, mantido para compatibilidade) remove uma unidade
+            widget.bind("<Button-1>", lambda e: self.decrease_item_quantity(name))
+            widget.bind("<Double-Button-1>", lambda e: self.decrease_item_quantity(name))
+            widget.bind("<Enter>", on_enter_hover)
+            widget.bind("<Leave>", on_leave_hover)
+        
+        self.cart_rows[name] = {
+            "frame": item_frame,
+            "item_label": item_label,
+            "price_label": price_label
+        }
+        self.update_cart_row(name)
+    
+    def update_cart_row(self, name):
+        """Atualiza quantidade, subtotal e destaque de uma linha do carrinho"""
+        row = self.cart_rows.get(name)
+        item = self.cart.items.get(name)
+        if row is None or item is None:
             return
         
-        # Adicionar itens
-        for name, item in self.cart.items():
-            price = item["price"]
-            qty = item["qty"]
-            subtotal = price * qty
-            
-            # Determinar cor do frame (selecionado ou não)
-            is_selected = (self.selected_cart_item == name)
-            frame_color = COLORS["green"] if is_selected else COLORS["bg_panel"]
-            border_color = COLORS["green"] if is_selected else "#3a3a3a"
-            
-            item_frame = ctk.CTkFrame(
-                self.cart_scroll,
-                corner_radius=10,
-                fg_color=frame_color,
-                border_width=2 if is_selected else 1,
-                border_color=border_color,
-                height=50  # Altura mínima para garantir visibilidade
-            )
-            item_frame.pack(fill="x", padx=5, pady=3)
-            item_frame.grid_columnconfigure(0, weight=1)
-            item_frame.grid_columnconfigure(1, weight=0)
-            
-            # Funções de hover para aplicar cor azul - usar closures para capturar corretamente cada item_frame
-            def create_hover_handlers(frame, item_name):
-                def on_enter_hover(event):
-                    # Verificar se ainda não está selecionado (pode ter mudado)
-                    current_selected = (self.selected_cart_item == item_name)
-                    if not current_selected:
-                        frame.configure(border_color="#0077cc", border_width=2)
-                
-                def on_leave_hover(event):
-                    # Verificar se ainda não está selecionado (pode ter mudado)
-                    current_selected = (self.selected_cart_item == item_name)
-                    if not current_selected:
-                        frame.configure(border_color="#3a3a3a", border_width=1)
-                    else:
-                        frame.configure(border_color=COLORS["green"], border_width=2)
-                
-                return on_enter_hover, on_leave_hover
-            
-            on_enter_hover, on_leave_hover = create_hover_handlers(item_frame, name)
-            
-            # Bind eventos de hover
-            item_frame.bind("<Enter>", on_enter_hover)
-            item_frame.bind("<Leave>", on_leave_hover)
-            
-            # Bind clique simples para remover uma unidade
-            item_frame.bind("<Button-1>", lambda e, n=name: self.decrease_item_quantity(n))
-            # Bind duplo clique para subtrair unidade (mantido para compatibilidade)
-            item_frame.bind("<Double-Button-1>", lambda e, n=name: self.decrease_item_quantity(n))
-            
-            item_text = f"{name} (x{qty})"
-            item_label = ctk.CTkLabel(
-                item_frame,
-                text=item_text,
-                font=ctk.CTkFont(size=11),
-                anchor="w",
-                fg_color="transparent"
-            )
-            item_label.grid(row=0, column=0, sticky="w", padx=8, pady=8)
-            item_label.bind("<Button-1>", lambda e, n=name: self.decrease_item_quantity(n))
-            item_label.bind("<Double-Button-1>", lambda e, n=name: self.decrease_item_quantity(n))
-            # Bind hover nos labels também - usar as mesmas funções criadas
-            item_label.bind("<Enter>", on_enter_hover)
-            item_label.bind("<Leave>", on_leave_hover)
-            
-            price_text = f"R$ {subtotal:.2f}"
-            price_label = ctk.CTkLabel(
-                item_frame,
-                text=price_text,
-                font=ctk.CTkFont(size=11, weight="bold"),
-                text_color=COLORS["green"] if not is_selected else COLORS["bg_dark"],
-                anchor="e",
-                fg_color="transparent"
-            )
-            price_label.grid(row=0, column=1, sticky="e", padx=8, pady=8)
-            price_label.bind("<Button-1>", lambda e, n=name: self.decrease_item_quantity(n))
-            price_label.bind("<Double-Button-1>", lambda e, n=name: self.decrease_item_quantity(n))
-            # Bind hover nos labels também - usar as mesmas funções criadas
-            price_label.bind("<Enter>", on_enter_hover)
-            price_label.bind("<Leave>", on_leave_hover)
-        
-        # Forçar atualização do scroll
-        self.cart_scroll.update()
+        is_selected = (self.selected_cart_item == name)
+        row["frame"].configure(
+            fg_color=COLORS["green"] if is_selected else COLORS["bg_panel"],
+            border_width=2 if is_selected else 1,
+            border_color=COLORS["green"] if is_selected else "#3a3a3a"
+        )
+        row["item_label"].configure(text=f"{name} (x{item.qty})")
+        row["price_label"].configure(
+            text=f"R$ {item.subtotal:.2f}",
+            text_color=COLORS["green"] if not is_selected else COLORS["bg_dark"]
+        )
     
     def update_total(self):
         """Atualiza o total da venda"""
-        self.total = sum(item["price"] * item["qty"] for item in self.cart.values())
+        self.total = self.cart.total
         
         # Garantir que o total não ultrapasse 9999 (segurança extra)
         if self.total > 9999:
@@ -937,94 +972,51 @@ class MainWindow(ctk.CTk):
     def select_cart_item(self, item_name):
         """Seleciona um item do carrinho"""
         if item_name in self.cart:
+            previous = self.selected_cart_item
             self.selected_cart_item = item_name
-            self.update_cart_display()
+            self.update_cart_row(previous)
+            self.update_cart_row(item_name)
     
-    def remove_selected_item(self):
-        """Remove item selecionado do carrinho"""
+    def target_cart_item(self):
+        """Item selecionado ou, se nenhum, o último incluído"""
         if self.selected_cart_item and self.selected_cart_item in self.cart:
-            del self.cart[self.selected_cart_item]
-            self.selected_cart_item = None
-            self.update_cart_display()
-            self.update_total()
-        elif self.cart:
-            # Se nenhum item selecionado, remove o último
-            last_item = list(self.cart.keys())[-1]
-            del self.cart[last_item]
-            self.update_cart_display()
-            self.update_total()
+            return self.selected_cart_item
+        return self.cart.last_name()
+    
+    def remove_selected_item(self):
+        """Remove item selecionado do carrinho (ou o último, se nenhum selecionado)"""
+        item_name = self.target_cart_item()
+        if item_name:
+            self.cart.remove(item_name)
     
     def decrease_item_quantity(self, item_name):
-        """Diminui quantidade de um item específico (usado no duplo clique)"""
+        """Diminui quantidade de um item específico (usado no clique)"""
         if item_name in self.cart:
-            if self.cart[item_name]["qty"] > 1:
-                self.cart[item_name]["qty"] -= 1
-            else:
-                del self.cart[item_name]
-                if self.selected_cart_item == item_name:
-                    self.selected_cart_item = None
-            self.update_cart_display()
-            self.update_total()
+            self.cart.decrease(item_name)
     
     def decrease_selected_item(self):
-        """Diminui quantidade do item selecionado"""
-        if self.selected_cart_item and self.selected_cart_item in self.cart:
-            if self.cart[self.selected_cart_item]["qty"] > 1:
-                self.cart[self.selected_cart_item]["qty"] -= 1
-            else:
-                del self.cart[self.selected_cart_item]
-                self.selected_cart_item = None
-            self.update_cart_display()
-            self.update_total()
-        elif self.cart:
-            # Se nenhum item selecionado, diminui o último
-            last_item = list(self.cart.keys())[-1]
-            if self.cart[last_item]["qty"] > 1:
-                self.cart[last_item]["qty"] -= 1
-            else:
-                del self.cart[last_item]
-            self.update_cart_display()
-            self.update_total()
+        """Diminui quantidade do item selecionado (ou do último, se nenhum selecionado)"""
+        item_name = self.target_cart_item()
+        if item_name:
+            self.cart.decrease(item_name)
     
     def increase_selected_item(self):
-        """Aumenta quantidade do item selecionado"""
-        item_to_increase = None
+        """Aumenta quantidade do item selecionado (ou do último, se nenhum selecionado)"""
+        item_name = self.target_cart_item()
+        if not item_name:
+            return
         
-        if self.selected_cart_item and self.selected_cart_item in self.cart:
-            item_to_increase = self.selected_cart_item
-        elif self.cart:
-            # Se nenhum item selecionado, aumenta o último
-            item_to_increase = list(self.cart.keys())[-1]
-        
-        if item_to_increase:
-            # Calcular novo total antes de aumentar
-            current_total = sum(item["price"] * item["qty"] for item in self.cart.values())
-            item_price = self.cart[item_to_increase]["price"]
-            new_total = current_total + item_price
-            
-            # Validar se o total não ultrapassa 9999
-            if new_total > 9999:
-                self.show_alert(
-                    "Limite Excedido",
-                    f"O total da compra não pode ultrapassar R$ 9.999,00!\n\n"
-                    f"Total atual: R$ {current_total:.2f}\n"
-                    f"Tentativa de adicionar mais: R$ {item_price:.2f}\n"
-                    f"Total seria: R$ {new_total:.2f}\n\n"
-                    f"Limite máximo permitido: R$ 9.999,00",
-                    "warning"
-                )
-                return
-            
-            self.cart[item_to_increase]["qty"] += 1
-            self.update_cart_display()
-            self.update_total()
+        # Validar se o total não ultrapassa 9999
+        item_price = self.cart.items[item_name].price
+        if not self.cart.fits(item_price):
+            self.show_limit_alert(item_price, "Tentativa de adicionar mais")
+            return
+        
+        self.cart.increase(item_name)
     
     def clear_cart(self):
         """Limpa o carrinho"""
-        self.cart = {}
-        self.selected_cart_item = None
-        self.update_cart_display()
-        self.update_total()
+        self.cart.clear()
     
     def select_payment_method(self, method):
         """Seleciona método de pagamento"""
@@ -1058,9 +1050,9 @@ class MainWindow(ctk.CTk):
             self.show_alert("Atenção", "Selecione um cliente primeiro!")
             return
         
-        # Verificar se o cliente tem vendas
+        # Verificar se o cliente tem vendas (histórico carregado só agora)
         client_data = self.clients_data.get(self.current_client, {})
-        sales = client_data.get("sales", [])
+        sales = self.store.get_client_sales(self.current_client)
         
         if not sales:
             self.show_alert(
@@ -1072,12 +1064,14 @@ class MainWindow(ctk.CTk):
             return
         
         # Abrir diálogo de seleção de vendas
+        from widgets.sales_selection_dialog import SalesSelectionDialog
         dialog = SalesSelectionDialog(
             self,
             self.current_client,
             sales,
             self.company_data,
-            client_data  # Passar dados completos do cliente
+            client_data,  # Passar dados completos do cliente
+            on_receipt_submitted=lambda future: self.track_receipt(future, open_after=False)
         )
         self.wait_window(dialog)
     
@@ -1100,39 +1094,73 @@ class MainWindow(ctk.CTk):
         if not file_path:
             return
         
+        # Gerar em segundo plano: o caixa já pode atender o próximo cliente
+        client_data = self.clients_data.get(self.current_client, {})
+        future = get_receipt_service().submit(
+            self.current_client,
+            client_data,
+            order,
+            file_path,
+            company_data=self.company_data
+        )
+        self.track_receipt(future, open_after)
+    
+    def print_thermal_receipt(self, order):
+        """Imprime o comprovante na impressora térmica configurada"""
         try:
-            from reports.receipt_generator import generate_receipt_pdf
-            
             client_data = self.clients_data.get(self.current_client, {})
-            generate_receipt_pdf(
-                self.current_client,
-                client_data,
-                order,
-                file_path,
-                company_data=self.company_data
+            receipt = render_receipt(
+                self.current_client, client_data, order, self.company_data, paper_mm=printer_paper_mm()
             )
-            
-            # Abrir PDF automaticamente se solicitado
-            if open_after:
-                self.open_pdf(file_path)
-            else:
-                # Criar diálogo customizado que abre o PDF ao clicar OK
-                dialog = AlertDialog(
-                    self,
-                    "Comprovante Gerado",
-                    f"Comprovante salvo com sucesso!\n\nLocal: {file_path}",
-                    "info",
-                    show_back_button=False,
-                    on_ok_callback=lambda: self.open_pdf(file_path)
-                )
-                self.wait_window(dialog)
-        except Exception as e:
+            print_receipt(receipt)
+        except OSError as e:
             self.show_alert(
                 "Erro",
-                f"Erro ao gerar comprovante:\n{str(e)}",
+                f"Erro ao imprimir comprovante:\n{str(e)}",
                 "error"
             )
     
+    def track_receipt(self, future, open_after=False):
+        """Acompanha um comprovante em geração e avisa quando terminar"""
+        self.update_receipt_status()
+        poll_future(self, future, lambda f: self.on_receipt_done(f, open_after))
+    
+    def update_receipt_status(self):
+        pending = get_receipt_service().pending_count()
+        if pending:
+            self.receipt_status_label.configure(text=f"⏳ Gerando comprovante ({pending} na fila)...")
+        else:
+            self.receipt_status_label.configure(text="")
+    
+    def on_receipt_done(self, future, open_after):
+        """Chamado na thread da interface quando um comprovante fica pronto"""
+        self.update_receipt_status()
+        
+        error = future.exception()
+        if error is not None:
+            self.show_alert(
+                "Erro",
+                f"Erro ao gerar comprovante:\n{str(error)}",
+                "error"
+            )
+            return
+        
+        file_path = future.result()
+        # Abrir PDF automaticamente se solicitado
+        if open_after:
+            self.open_pdf(file_path)
+        else:
+            # Criar diálogo customizado que abre o PDF ao clicar OK
+            dialog = AlertDialog(
+                self,
+                "Comprovante Gerado",
+                f"Comprovante salvo com sucesso!\n\nLocal: {file_path}",
+                "info",
+                show_back_button=False,
+                on_ok_callback=lambda: self.open_pdf(file_path)
+            )
+            self.wait_window(dialog)
+    
     def finish_order(self):
         """Finaliza a venda"""
         if not self.current_client:
@@ -1150,7 +1178,6 @@ class MainWindow(ctk.CTk):
         # Validar crédito do aluno se método de pagamento for "Crédito Aluno"
         if self.selected_payment == "Crédito Aluno":
             # Atualizar informações do cliente para garantir dados atuais
-            self.load_clients()
             self.refresh_client_info()
             
             # Verificar se o cliente tem crédito suficiente
@@ -1174,26 +1201,18 @@ class MainWindow(ctk.CTk):
                 # Se clicou em OK, apenas fecha o diálogo
                 return
         
-        # Construir ordem
-        items = []
-        for name, item in self.cart.items():
-            items.append({
-                "name": name,
-                "price": item["price"],
-                "quantity": item["qty"]
-            })
-        
-        order = {
-            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "items": items,
-            "total": self.total,
-            "payment_method": self.selected_payment
-        }
-        
-        # Salvar venda
-        self.add_order_to_client(self.current_client, order)
+        # Construir ordem e salvar venda (o tempo do diálogo de confirmação não entra na medição)
+        with measure("finish_order"):
+            order = {
+                "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                "items": self.cart.to_order_items(),
+                "total": self.total,
+                "payment_method": self.selected_payment
+            }
+            self.add_order_to_client(self.current_client, order)
         
         # Diálogo de confirmação estilizado
+        from widgets.confirmation_dialog import ConfirmationDialog
         dialog = ConfirmationDialog(
             self,
             self.current_client,
@@ -1202,110 +1221,140 @@ class MainWindow(ctk.CTk):
         )
         self.wait_window(dialog)
         
-        if dialog.result:
-            # Gerar e abrir comprovante da venda recém-criada
-            self.generate_receipt_for_sale(order, open_after=True)
-        
-        # Limpar carrinho
-        self.clear_cart()
-        self.selected_payment = None
-        for btn in self.payment_buttons.values():
-            btn.configure(fg_color=COLORS["bg_dark"], hover_color="#333333")
+        with measure("finish_order: comprovante e limpeza"):
+            if dialog.result:
+                if thermal_printer_configured():
+                    # Comprovante de balcão direto na impressora térmica (PDV_PRINTER)
+                    self.print_thermal_receipt(order)
+                else:
+                    # Gerar e abrir comprovante da venda recém-criada
+                    self.generate_receipt_for_sale(order, open_after=True)
+            
+            # Limpar carrinho
+            self.clear_cart()
+            self.selected_payment = None
+            for btn in self.payment_buttons.values():
+                btn.configure(fg_color=COLORS["bg_dark"], hover_color="#333333")
     
+    @timed("add_order_to_client")
     def add_order_to_client(self, client_name, order):
         """Adiciona ordem ao cliente"""
-        if client_name not in self.clients_data:
-            self.clients_data[client_name] = {
-                "credits": 0.0,
-                "sales": []
-            }
-        
-        client = self.clients_data[client_name]
-        client["sales"].append({
-            "id": len(client.get("sales", [])) + 1,
+        sale = {
+            # Id único entre todos os clientes (len(sales) + 1 repetia ids entre clientes)
+            "id": self.store.next_sale_id(),
             "items": order["items"],
             "total": order["total"],
             "paid": self.selected_payment != "Crédito Aluno",
             "date": order["timestamp"].split(" ")[0],
             "timestamp": order["timestamp"],  # Salvar timestamp completo para cálculo de tempo
             "payment_method": order["payment_method"]
-        })
+        }
         
         # Processar crédito se necessário
+        new_credits = None
         if self.selected_payment == "Crédito Aluno":
             if self.client_credits >= self.total:
-                client["credits"] = self.client_credits - self.total
+                new_credits = self.client_credits - self.total
                 # Marcar como pago
-                client["sales"][-1]["paid"] = True
+                sale["paid"] = True
             else:
                 # Fica pendente
-                client["sales"][-1]["paid"] = False
+                sale["paid"] = False
         
-        # Salvar
-        with open(self.clients_path, "w", encoding="utf-8") as f:
-            json.dump(self.clients_data, f, indent=4, ensure_ascii=False)
+        # Gravar apenas a venda (diário no JSON, uma transação no SQLite);
+        # saldo e ComboBox são atualizados pelo evento "sale_added"
+        self.store.add_sale(client_name, sale, new_credits)
+    
+    def subscribe_store_events(self):
+        """Inscreve a janela nos eventos de alteração do DataStore"""
+        self.store.subscribe("sale_added", self.on_store_sale_added)
+        self.store.subscribe("sale_updated", self.on_store_sale_added)
+        self.store.subscribe("clients_changed", self.on_store_clients_changed)
+        self.store.subscribe("products_changed", self.load_products)
+        self.store.subscribe("reloaded", self.on_store_reloaded)
+    
+    def on_store_sale_added(self, client_name, sale):
+        """Atualiza ComboBox e saldo após uma venda registrada ou alterada"""
+        if len(self.client_combo.cget("values")) != len(self.clients_data):
+            self.client_combo.configure(values=sorted(self.clients_data.keys()))
+        if client_name == self.current_client:
+            self.refresh_client_info()
+    
+    def on_store_clients_changed(self, names):
+        """Atualiza a interface quando clientes são alterados (ex.: gerenciador de clientes)"""
+        if names is None:
+            self.load_clients()
+        elif len(self.client_combo.cget("values")) != len(self.clients_data):
+            self.client_combo.configure(values=sorted(self.clients_data.keys()))
         
-        # Recarregar e atualizar informações do cliente
-        self.load_clients()
-        if self.current_client:
+        if self.current_client and (names is None or self.current_client in names):
             self.refresh_client_info()
     
+    def on_store_reloaded(self):
+        """Reaplica todos os dados após uma alteração externa nos arquivos"""
+        self.company_data = self.load_company_data()
+        self.title_label.configure(text=self.company_data.get("name", "Cantina Colégio Ativa"))
+        self.title(self.company_data.get("name", "Cantina Colégio Ativa"))
+        self.load_products()
+        self.load_clients()
+        self.refresh_client_info()
+    
+    def compact_storage(self):
+        """Manutenção periódica do armazenamento (compacta o diário de vendas)"""
+        self.store.compact()
+        self.after(STORAGE_COMPACT_INTERVAL_MS, self.compact_storage)
+    
+    def log_diagnostics(self):
+        """Resumo periódico de desempenho no log (só com o diagnóstico ligado)"""
+        instrumentation.log_summary()
+        self.after(DIAGNOSTICS_LOG_INTERVAL_MS, self.log_diagnostics)
+    
+    def open_diagnostics(self):
+        """Abre o painel de diagnóstico (Ctrl+D), ligando a medição"""
+        if self.diagnostics_dialog is not None and self.diagnostics_dialog.winfo_exists():
+            self.diagnostics_dialog.lift()
+            self.diagnostics_dialog.focus_set()
+            return
+        from widgets.diagnostics_dialog import DiagnosticsDialog
+        instrumentation.enable()
+        self.diagnostics_dialog = DiagnosticsDialog(self)
+    
+    def check_external_changes(self):
+        """Verifica se outro processo alterou os arquivos de dados"""
+        self.store.check_external_changes()
+        self.after(EXTERNAL_CHECK_INTERVAL_MS, self.check_external_changes)
+    
+    def get_qt_bridge(self):
+        """Ponte Qt/Tk criada na primeira abertura de um gerenciador (PySide6)"""
+        if self.qt_bridge is None:
+            from ui.qt_bridge import QtBridge
+            self.qt_bridge = QtBridge(self)
+        return self.qt_bridge
+    
     def open_product_manager(self):
-        """Abre gerenciador de produtos (PySide6)"""
-        # Por enquanto, manter compatibilidade com PySide6
+        """Abre gerenciador de produtos (PySide6) sem bloquear o caixa"""
         try:
-            from PySide6.QtWidgets import QApplication
-            import sys
-            
-            if not hasattr(self, '_qt_app'):
-                self._qt_app = QApplication.instance()
-                if self._qt_app is None:
-                    self._qt_app = QApplication(sys.argv)
-            
-            # Criar um parent dummy para o ProductManager
-            from PySide6.QtWidgets import QWidget
-            dummy_parent = QWidget()
-            dummy_parent.hide()
-            
-            manager = ProductManager(dummy_parent, self.products_path)
-            # Substituir o parent para que o refresh funcione
-            manager.parent = self
-            manager.exec()
-            
-            # Recarregar produtos
-            self.load_products()
+            from managers.product_manager import ProductManager
+            # O grid é atualizado pelo evento "products_changed" do DataStore
+            self.get_qt_bridge().show("products", lambda: ProductManager(None, self.store))
         except Exception as e:
             self.show_alert("Erro", f"Não foi possível abrir o gerenciador: {e}", "error")
     
     def open_client_manager(self):
-        """Abre gerenciador de clientes (PySide6)"""
+        """Abre gerenciador de clientes (PySide6) sem bloquear o caixa"""
         try:
-            from PySide6.QtWidgets import QApplication
-            import sys
-            
-            if not hasattr(self, '_qt_app'):
-                self._qt_app = QApplication.instance()
-                if self._qt_app is None:
-                    self._qt_app = QApplication(sys.argv)
-            
-            # Criar um parent dummy para o ClientManager
-            from PySide6.QtWidgets import QWidget
-            dummy_parent = QWidget()
-            dummy_parent.hide()
-            
-            manager = ClientManager(dummy_parent)
-            manager.exec()
-            
-            # Recarregar clientes após fechar o gerenciador
-            self.load_clients()
-            
-            # Atualizar informações do cliente selecionado se houver
-            # Também atualizar o ComboBox caso tenha sido adicionado novo cliente
-            if self.current_client:
-                self.refresh_client_info()
-            else:
-                # Se não havia cliente selecionado, atualizar o ComboBox
-                client_names = sorted(self.clients_data.keys())
-                self.client_combo.configure(values=client_names)
+            from managers.client_manager import ClientManager
+            # Saldo e ComboBox são atualizados pelos eventos do DataStore
+            self.get_qt_bridge().show("clients", lambda: ClientManager(None, self.store))
         except Exception as e:
             self.show_alert("Erro", f"Não foi possível abrir o gerenciador: {e}", "error")
+    
+    def on_close(self):
+        """Fecha os gerenciadores abertos junto com o caixa"""
+        if self.layout_job is not None:
+            self.after_cancel(self.layout_job)
+            self.layout_job = None
+        if self.qt_bridge is not None:
+            self.qt_bridge.close_all()
+        instrumentation.log_summary()
+        self.destroy()
@@ -0,0 +1,79 @@
+import sys
+from utils.logger import get_logger
+
+# Intervalo em que o laço do Tk processa os eventos pendentes do Qt (ms)
+QT_PUMP_INTERVAL_MS = 10
+
+
+class QtBridge:
+    """Mantém as janelas PySide6 abertas ao lado da janela Tk, sem exec() modal.
+
+    Há um único QApplication no processo. Enquanto houver janela Qt aberta,
+    o laço do Tk chama processEvents() a cada QT_PUMP_INTERVAL_MS; sem janelas
+    o bombeamento para e o Qt não consome CPU. As janelas conversam com o
+    caixa pelos eventos do DataStore, então nada é recarregado ao fechá-las.
+
+    Diálogos curtos abertos com exec() dentro de um gerenciador (edição de
+    produto, confirmações) ainda pausam o Tk enquanto estiverem abertos.
+    """
+
+    def __init__(self, tk_root):
+        from PySide6.QtWidgets import QApplication
+        self.tk_root = tk_root
+        self.app = QApplication.instance() or QApplication(sys.argv)
+        # Fechar o último gerenciador não deve encerrar o processo
+        self.app.setQuitOnLastWindowClosed(False)
+        self.windows = {}  # {chave: janela aberta}
+        self._pump_job = None
+
+    def show(self, key, factory):
+        """Abre (ou traz para frente) a janela identificada por key.
+
+        factory() cria a janela na primeira vez; uma janela já aberta é
+        reaproveitada em vez de duplicada.
+        """
+        window = self.windows.get(key)
+        if window is None:
+            window = factory()
+            self.windows[key] = window
+            window.finished.connect(lambda _result, key=key: self._forget(key))
+        window.show()
+        window.raise_()
+        window.activateWindow()
+        self._start_pump()
+        return window
+
+    def _forget(self, key):
+        window = self.windows.pop(key, None)
+        if window is not None:
+            window.deleteLater()
+
+    def _start_pump(self):
+        if self._pump_job is None:
+            self._pump_job = self.tk_root.after(QT_PUMP_INTERVAL_MS, self._pump)
+
+    def _process_events(self):
+        from PySide6.QtCore import QEvent
+        self.app.processEvents()
+        # Sem exec(), o processEvents() não entrega o DeferredDelete do deleteLater:
+        # sem isto as janelas fechadas ficariam na memória até o fim da sessão
+        self.app.sendPostedEvents(None, QEvent.Type.DeferredDelete)
+
+    def _pump(self):
+        self._pump_job = None
+        try:
+            self._process_events()
+        except Exception as e:
+            get_logger().error("Erro ao processar eventos do Qt: %s", e)
+        if self.windows:
+            self._pump_job = self.tk_root.after(QT_PUMP_INTERVAL_MS, self._pump)
+
+    def close_all(self):
+        """Fecha as janelas Qt (ao encerrar o caixa)"""
+        for window in list(self.windows.values()):
+            window.close()
+        self.windows.clear()
+        if self._pump_job is not None:
+            self.tk_root.after_cancel(self._pump_job)
+            self._pump_job = None
+        self._process_events()
@@ -0,0 +1,136 @@
+import json
+from models.ledger import ClientLedger
+from utils.file_utils import COMPACT_SEPARATORS, dumps_json, gc_paused
+from utils.instrumentation import timed
+
+# Formatos de gravação do snapshot de clientes: JSON completo sem indentação
+# (padrão), JSON completo indentado ou, por opção, o snapshot indexado abaixo
+SNAPSHOT_FORMATS = ("compact", "indented", "indexed")
+
+# Snapshot indexado de clientes:
+#   linha 1: {"format": INDEX_FORMAT, "clients": {nome: dados sem o histórico},
+#             "summary": {nome: [pendente, último id, data da última venda, início, tamanho]}}
+#   demais:  uma linha JSON por cliente com o histórico ({"sales": [...], ...}),
+#            no trecho [início, início + tamanho) contado a partir da linha 2
+# O índice é lido sozinho na abertura; cada histórico só quando necessário.
+INDEX_FORMAT = "clients-index/1"
+
+# Campos de histórico carregados sob demanda
+HISTORY_FIELDS = ("sales", "credit_history")
+
+
+def client_summary(client):
+    """(total pendente, maior id de venda, data da última venda) do cliente"""
+    return ClientLedger.from_client(client).summary()
+
+
+def split_client(client):
+    """Separa (dados do índice, histórico)"""
+    fields = {}
+    history = {}
+    for key, value in client.items():
+        if key in HISTORY_FIELDS:
+            history[key] = value
+        else:
+            fields[key] = value
+    return fields, history
+
+
+def _dumps(value):
+    return json.dumps(value, ensure_ascii=False, separators=COMPACT_SEPARATORS).encode("utf-8")
+
+
+def dump_indexed(clients_data):
+    """Conteúdo (bytes) do snapshot indexado"""
+    clients = {}
+    summary = {}
+    lines = []
+    offset = 0
+    with gc_paused():
+        for name, client in clients_data.items():
+            fields, history = split_client(client)
+            line = _dumps(history) + b"\n"
+            clients[name] = fields
+            summary[name] = [*client_summary(client), offset, len(line)]
+            lines.append(line)
+            offset += len(line)
+        header = _dumps({"format": INDEX_FORMAT, "clients": clients, "summary": summary})
+    return b"".join([header, b"\n", *lines])
+
+
+@timed("dump_snapshot")
+def dump_snapshot(clients_data, snapshot_format="compact"):
+    """Conteúdo do snapshot no formato pedido (um de SNAPSHOT_FORMATS)"""
+    if snapshot_format == "indexed":
+        return dump_indexed(clients_data)
+    return dumps_json(clients_data, compact=snapshot_format == "compact")
+
+
+class ClientSnapshot:
+    """Snapshot de clientes lido do disco (JSON completo ou formato indexado).
+
+    No formato indexado o construtor interpreta apenas o índice (ValueError se
+    o arquivo estiver incompleto) e `history` decodifica o trecho de um
+    cliente. O JSON completo é decodificado por inteiro.
+    """
+
+    def __init__(self, content=b""):
+        self.content = content
+        self.full_data = None
+        self.clients = {}
+        self.summary = {}
+        self.body_start = 0
+
+        header_end = content.find(b"\n")
+        header = None
+        if header_end > 0:
+            try:
+                header = json.loads(content[:header_end].decode("utf-8"))
+            except ValueError:
+                header = None
+        if isinstance(header, dict) and header.get("format") == INDEX_FORMAT:
+            self.clients = header["clients"]
+            self.summary = header["summary"]
+            self.body_start = header_end + 1
+        elif content.strip():
+            # clients.json completo; ValueError se estiver corrompido
+            with gc_paused():
+                self.full_data = json.loads(content.decode("utf-8"))
+            for name, client in self.full_data.items():
+                self.clients[name] = split_client(client)[0]
+                self.summary[name] = list(client_summary(client))
+
+        # Sem a soma de verificação, um arquivo rasgado só é percebido pelo tamanho
+        if self.full_data is None and self.summary:
+            body_size = max(values[3] + values[4] for values in self.summary.values())
+            if self.body_start + body_size != len(content):
+                raise ValueError("snapshot de clientes incompleto")
+
+    def index(self):
+        """({nome: dados sem histórico}, {nome: (pendente, último id, data da última venda)})"""
+        clients = {name: dict(fields) for name, fields in self.clients.items()}
+        summary = {name: tuple(values[:3]) for name, values in self.summary.items()}
+        return clients, summary
+
+    def history(self, client_name):
+        """Histórico de um cliente ({"sales": [...], ...}); vazio se não existir"""
+        if self.full_data is not None:
+            client = self.full_data.get(client_name, {})
+            return json.loads(json.dumps(split_client(client)[1]))
+        values = self.summary.get(client_name)
+        if values is None:
+            return {}
+        start = self.body_start + values[3]
+        return json.loads(self.content[start:start + values[4]].decode("utf-8"))
+
+    def full(self):
+        """Dicionário completo de clientes (todos os históricos)"""
+        if self.full_data is not None:
+            return self.full_data
+        data = {}
+        with gc_paused():
+            for name, fields in self.clients.items():
+                client = dict(fields)
+                client.update(self.history(name))
+                data[name] = client
+        return data
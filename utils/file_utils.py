@@ -1,32 +1,191 @@
+import gc
+import hashlib
 import json
 import os
-import shutil
+from contextlib import contextmanager
+from utils.instrumentation import timed
 from utils.logger import get_logger
 
-def load_json(path, default):
+# Cópias anteriores mantidas ao lado do arquivo (arquivo.bak1 é a mais recente)
+BACKUP_COUNT = 3
+# Soma de verificação do conteúdo atual (arquivo.sha256)
+CHECKSUM_SUFFIX = ".sha256"
+# Cópia do arquivo recusado por soma divergente (arquivo.rejeitado)
+REJECTED_SUFFIX = ".rejeitado"
+# Formato compacto: JSON sem indentação (o encoder em C só é usado sem indent)
+COMPACT_SEPARATORS = (",", ":")
+
+
+@contextmanager
+def gc_paused():
+    """Pausa o coletor de lixo ao criar muitos dicionários de uma vez"""
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _digest(content):
+    return hashlib.sha256(content).hexdigest()
+
+
+def backup_paths(path):
+    # "arquivo.bak" é o backup único das versões anteriores
+    return [f"{path}.bak{number}" for number in range(1, BACKUP_COUNT + 1)] + [f"{path}.bak"]
+
+
+def fsync_dir(path):
+    """Torna duráveis as criações e renomeações de arquivos no diretório de path (no-op no Windows)"""
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    fd = os.open(os.path.dirname(path) or ".", os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _write_synced(path, content):
+    with open(path, "wb") as f:
+        f.write(content)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def _keep_backup(path, current, backup):
+    """Guarda a versão atual em backup sem tirar path do lugar (hard link ou cópia)"""
+    if os.path.exists(backup):
+        os.remove(backup)
+    try:
+        os.link(path, backup)
+    except (OSError, AttributeError):
+        # Sistema de arquivos sem hard links: cópia gravada com fsync
+        _write_synced(f"{backup}.tmp", current)
+        os.replace(f"{backup}.tmp", backup)
+
+
+def _accepted_digests(path):
+    """Somas aceitas para o arquivo: a da versão atual e a da anterior"""
+    try:
+        with open(f"{path}{CHECKSUM_SUFFIX}", "r", encoding="ascii") as f:
+            return f.read().split()
+    except OSError:
+        return []
+
+
+def _parse_json(content):
+    with gc_paused():
+        return json.loads(content.decode("utf-8"))
+
+
+@timed("load_verified")
+def load_verified(path, parse, default):
+    """Lê o arquivo conferindo a soma e o interpreta com parse(bytes).
+
+    Se estiver ausente, danificado (parse com ValueError) ou com soma
+    divergente da registrada, recorre ao backup mais recente que parse
+    aceitar; o arquivo recusado é copiado para .rejeitado. Sem arquivo de
+    soma (ex.: removido após uma edição manual), o conteúdo é aceito se
+    parse o aceitar.
+    """
     logger = get_logger()
-    if not os.path.exists(path):
+    if not os.path.exists(path) and not os.path.exists(backup_paths(path)[0]):
         return default
+
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except (OSError, json.JSONDecodeError) as e:
+        with open(path, "rb") as f:
+            content = f.read()
+        digests = _accepted_digests(path)
+        if digests and _digest(content) not in digests:
+            _write_synced(f"{path}{REJECTED_SUFFIX}", content)
+            raise ValueError(f"soma de verificação divergente (cópia em {path}{REJECTED_SUFFIX})")
+        return parse(content)
+    except (OSError, ValueError) as e:
         logger.error("Falha ao carregar %s: %s", path, e)
-        return default
 
-def save_json(path, data):
+    for backup in backup_paths(path):
+        try:
+            with open(backup, "rb") as f:
+                data = parse(f.read())
+        except (OSError, ValueError):
+            continue
+        logger.warning("%s restaurado a partir de %s", path, backup)
+        return data
+
+    logger.error("Nenhum backup válido de %s; usando valores padrão", path)
+    return default
+
+
+@timed("write_atomic")
+def write_atomic(path, content):
+    """Grava bytes de forma atômica e durável; retorna False em caso de erro.
+
+    Ordem: conteúdo em .tmp (fsync), soma de verificação com a nova versão e
+    a atual (fsync), rodízio dos backups com a versão atual ligada (hard link)
+    em .bak1, rename do .tmp e fsync do diretório. O rename é o único passo que
+    altera path, que nunca deixa de existir: uma queda ou leitura concorrente
+    em qualquer ponto vê a versão anterior ou a nova.
+    """
     logger = get_logger()
     parent = os.path.dirname(path)
     if parent:
         os.makedirs(parent, exist_ok=True)
     tmp_path = f"{path}.tmp"
+    checksum_path = f"{path}{CHECKSUM_SUFFIX}"
     try:
-        with open(tmp_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=4, ensure_ascii=False)
-        if os.path.exists(path):
-            shutil.copy2(path, f"{path}.bak")
+        _write_synced(tmp_path, content)
+
+        exists = os.path.exists(path)
+        digests = [_digest(content)]
+        if exists:
+            # Soma do arquivo em disco (não da anterior registrada: uma gravação
+            # interrompida pode ter registrado uma versão que não chegou a entrar)
+            with open(path, "rb") as f:
+                current = f.read()
+            digests.append(_digest(current))
+        _write_synced(f"{checksum_path}.tmp", "\n".join(digests).encode("ascii"))
+        os.replace(f"{checksum_path}.tmp", checksum_path)
+
+        if exists:
+            backups = backup_paths(path)[:BACKUP_COUNT]
+            for older, newer in zip(reversed(backups[1:]), reversed(backups[:-1])):
+                if os.path.exists(newer):
+                    os.replace(newer, older)
+            _keep_backup(path, current, backups[0])
         os.replace(tmp_path, path)
+        fsync_dir(path)
+        return True
     except OSError as e:
         logger.error("Falha ao salvar %s: %s", path, e)
         if os.path.exists(tmp_path):
             os.remove(tmp_path)
+        return False
+
+
+@timed("dumps_json")
+def dumps_json(data, compact=False):
+    """Conteúdo JSON em bytes; compact=True grava sem indentação (arquivos de dados grandes)"""
+    if compact:
+        with gc_paused():
+            text = json.dumps(data, ensure_ascii=False, separators=COMPACT_SEPARATORS)
+    else:
+        text = json.dumps(data, indent=4, ensure_ascii=False)
+    return text.encode("utf-8")
+
+
+def load_json(path, default):
+    """Carrega o JSON conferindo a soma; se estiver danificado, recorre aos backups"""
+    return load_verified(path, _parse_json, default)
+
+
+def save_json(path, data, compact=False):
+    """Grava o JSON de forma atômica e durável (ver write_atomic)"""
+    try:
+        content = dumps_json(data, compact)
+    except (TypeError, ValueError) as e:
+        get_logger().error("Falha ao salvar %s: %s", path, e)
+        return False
+    return write_atomic(path, content)
@@ -0,0 +1,146 @@
+import os
+import threading
+import time
+from collections import deque
+from functools import wraps
+from utils.logger import get_logger
+
+# Medição ligada desde a abertura (PDV_DIAGNOSTICS=1); também é ligada ao abrir o painel
+DIAGNOSTICS_ENV = "PDV_DIAGNOSTICS"
+# Amostras mantidas por operação para calcular p50/p95
+SAMPLE_LIMIT = 1000
+
+_enabled = os.environ.get(DIAGNOSTICS_ENV, "").strip().lower() in ("1", "true", "sim")
+_lock = threading.Lock()
+_samples = {}  # {operação: deque de durações em segundos}
+_stats = {}  # {operação: [chamadas, total, máximo]} desde o último reset
+_counters = {}  # {contador: valor}
+
+
+def is_enabled():
+    return _enabled
+
+
+def enable(value=True):
+    global _enabled
+    _enabled = bool(value)
+
+
+def reset():
+    with _lock:
+        _samples.clear()
+        _stats.clear()
+        _counters.clear()
+
+
+def record(name, seconds):
+    """Registra uma duração medida por fora (segundos)"""
+    with _lock:
+        samples = _samples.get(name)
+        if samples is None:
+            samples = _samples[name] = deque(maxlen=SAMPLE_LIMIT)
+            _stats[name] = [0, 0.0, 0.0]
+        samples.append(seconds)
+        stats = _stats[name]
+        stats[0] += 1
+        stats[1] += seconds
+        if seconds > stats[2]:
+            stats[2] = seconds
+
+
+def count(name, amount=1):
+    """Soma amount ao contador (ex.: cards reposicionados, bytes gravados)"""
+    if not _enabled:
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + amount
+
+
+class measure:
+    """Context manager que mede o bloco com o relógio monotônico.
+
+    Desligado, não lê o relógio nem registra nada.
+    """
+
+    __slots__ = ("name", "started")
+
+    def __init__(self, name):
+        self.name = name
+        self.started = None
+
+    def __enter__(self):
+        if _enabled:
+            self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.started is not None:
+            record(self.name, time.perf_counter() - self.started)
+        return False
+
+
+def timed(name):
+    """Decorador: mede cada chamada da função sob o nome informado"""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(name, time.perf_counter() - started)
+        return wrapper
+    return decorator
+
+
+def _percentile(ordered, fraction):
+    index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def snapshot():
+    """({operação: {"count", "total", "p50", "p95", "max"}}, {contador: valor}); tempos em ms.
+
+    p50/p95 usam as últimas SAMPLE_LIMIT amostras; count, total e max, todas as chamadas.
+    """
+    with _lock:
+        samples = {name: sorted(values) for name, values in _samples.items()}
+        stats = {name: list(values) for name, values in _stats.items()}
+        counters = dict(_counters)
+
+    operations = {}
+    for name, ordered in samples.items():
+        calls, total, maximum = stats[name]
+        operations[name] = {
+            "count": calls,
+            "total": total * 1000,
+            "p50": _percentile(ordered, 0.50) * 1000,
+            "p95": _percentile(ordered, 0.95) * 1000,
+            "max": maximum * 1000,
+        }
+    return operations, counters
+
+
+def summary_lines():
+    """Resumo em texto, operações ordenadas pelo tempo total"""
+    operations, counters = snapshot()
+    lines = [f"{'Operação':<36} {'chamadas':>8} {'p50 ms':>9} {'p95 ms':>9} {'máx ms':>9} {'total ms':>10}"]
+    for name, values in sorted(operations.items(), key=lambda item: item[1]["total"], reverse=True):
+        lines.append(
+            f"{name:<36} {values['count']:>8} {values['p50']:>9.1f} {values['p95']:>9.1f} "
+            f"{values['max']:>9.1f} {values['total']:>10.1f}"
+        )
+    for name, value in sorted(counters.items()):
+        lines.append(f"{name}: {value}")
+    return lines
+
+
+def log_summary():
+    """Grava o resumo no log da aplicação (nada se desligado ou sem medições)"""
+    if not _enabled:
+        return
+    lines = summary_lines()
+    if len(lines) > 1:
+        get_logger().info("Diagnóstico de desempenho:\n%s", "\n".join(lines))
@@ -0,0 +1,277 @@
+import json
+import os
+import threading
+from utils.client_snapshot import SNAPSHOT_FORMATS, ClientSnapshot, dump_snapshot
+from utils.file_utils import fsync_dir, load_verified, write_atomic
+from utils.instrumentation import timed
+from utils.logger import get_logger
+
+# Sufixos dos arquivos do diário ao lado do snapshot (ex.: data/clients.json.journal)
+JOURNAL_SUFFIX = ".journal"
+SEALED_SUFFIX = ".journal.compacting"
+
+# Quantidade de registros que dispara uma compactação em segundo plano
+COMPACT_THRESHOLD = 200
+
+# Formato do snapshot: "compact" (padrão, JSON sem indentação), "indented" ou
+# "indexed" (índice de clientes e um histórico por linha, lido sob demanda)
+SNAPSHOT_FORMAT_ENV = "PDV_SNAPSHOT_FORMAT"
+
+
+# Registros do diário (uma linha JSON cada):
+#   {"op": "sale", "client", "sale", ["credits"]}  venda nova (e saldo resultante)
+#   {"op": "update", "client", "sale"}             venda regravada pelo id (pagamento, cancelamento)
+#   {"op": "credits", "updates": {nome: saldo}}    saldos definidos (clientes existentes)
+#   {"op": "settle", "updates": {nome: saldo}}     dívidas quitadas: saldo e vendas pagas
+
+
+def record_clients(record):
+    """Clientes alterados pelo registro"""
+    op = record.get("op")
+    if op in ("sale", "update"):
+        return [record["client"]]
+    if op in ("credits", "settle"):
+        return list(record["updates"])
+    return []
+
+
+def _replace_sale(clients_data, client_name, sale):
+    client = clients_data.get(client_name)
+    if client is None:
+        return
+    sales = client.get("sales", [])
+    for index, current in enumerate(sales):
+        if current.get("id") == sale.get("id"):
+            sales[index] = sale
+            return
+
+
+def apply_record(clients_data, record, seen=None):
+    """Aplica um registro do diário sobre o dicionário de clientes.
+
+    Reaplicar um registro já incorporado não altera o resultado.
+    """
+    op = record.get("op")
+    if op == "update":
+        _replace_sale(clients_data, record["client"], record["sale"])
+        return
+    if op in ("credits", "settle"):
+        for name, credits in record["updates"].items():
+            client = clients_data.get(name)
+            if client is None:
+                continue
+            client["credits"] = credits
+            if op == "settle":
+                for sale in client.get("sales", []):
+                    sale["paid"] = True
+        return
+    if op != "sale":
+        return
+
+    client_name = record["client"]
+    client = clients_data.setdefault(client_name, {"credits": 0.0, "sales": []})
+    sales = client.setdefault("sales", [])
+    sale = record["sale"]
+
+    # Evita duplicar vendas se um segmento já compactado for reaplicado após falha
+    if seen is not None:
+        keys = seen.get(client_name)
+        if keys is None:
+            keys = {(s.get("id"), s.get("timestamp")) for s in sales}
+            seen[client_name] = keys
+        key = (sale.get("id"), sale.get("timestamp"))
+        if key in keys:
+            return
+        keys.add(key)
+
+    sales.append(sale)
+    if "credits" in record:
+        client["credits"] = record["credits"]
+
+
+def read_records(path):
+    """Lê os registros de um arquivo de diário, ignorando uma última linha incompleta"""
+    records = []
+    if not os.path.exists(path):
+        return records
+
+    with open(path, "r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                # Linha truncada por queda de energia no meio da escrita
+                get_logger().warning("Registro inválido em %s linha %d ignorado", path, line_number)
+    return records
+
+
+class SalesJournal:
+    """Diário append-only de vendas sobre o snapshot de clientes.
+
+    Cada venda finalizada ou alterada grava um único registro compacto (uma
+    linha JSON) com fsync, em vez de reescrever o snapshot inteiro. Periodicamente o
+    diário é selado e incorporado ao snapshot por uma thread em segundo plano.
+    """
+
+    def __init__(self, snapshot_path, compact_threshold=COMPACT_THRESHOLD, snapshot_format=None):
+        self.snapshot_path = snapshot_path
+        if snapshot_format is None:
+            snapshot_format = os.environ.get(SNAPSHOT_FORMAT_ENV, "compact").strip().lower()
+        if snapshot_format not in SNAPSHOT_FORMATS:
+            get_logger().warning("Formato de snapshot desconhecido: %s; usando compact", snapshot_format)
+            snapshot_format = "compact"
+        self.snapshot_format = snapshot_format
+        self.journal_path = f"{snapshot_path}{JOURNAL_SUFFIX}"
+        self.sealed_path = f"{snapshot_path}{SEALED_SUFFIX}"
+        self.compact_threshold = compact_threshold
+        self._lock = threading.Lock()
+        self._compact_thread = None
+        self.compaction_listeners = []
+        self._pending = len(read_records(self.journal_path))
+
+    def _read_snapshot(self):
+        return load_verified(self.snapshot_path, ClientSnapshot, ClientSnapshot())
+
+    def _write_snapshot(self, data):
+        return write_atomic(self.snapshot_path, dump_snapshot(data, self.snapshot_format))
+
+    def load_snapshot(self):
+        """(snapshot, registros pendentes do diário) lidos de forma consistente"""
+        with self._lock:
+            # O segmento selado é lido antes do snapshot: se a compactação terminar
+            # entre as duas leituras, os registros repetidos são descartados por apply_record
+            sealed = read_records(self.sealed_path)
+            snapshot = self._read_snapshot()
+            return snapshot, sealed + read_records(self.journal_path)
+
+    def load(self):
+        """Carrega o snapshot completo e reaplica os registros pendentes do diário"""
+        snapshot, records = self.load_snapshot()
+        data = snapshot.full()
+        seen = {}
+        for record in records:
+            apply_record(data, record, seen)
+        return data
+
+    @timed("journal.append")
+    def append(self, record):
+        """Grava um registro no diário de forma durável"""
+        line = json.dumps(record, ensure_ascii=False, separators=(",", ":"))
+        parent = os.path.dirname(self.journal_path)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+
+        with self._lock:
+            created = not os.path.exists(self.journal_path)
+            with open(self.journal_path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            if created:
+                # Sem isto a entrada do arquivo novo pode sumir numa queda de energia
+                fsync_dir(self.journal_path)
+            self._pending += 1
+            should_compact = self._pending >= self.compact_threshold
+
+        if should_compact:
+            self.compact()
+
+    def append_sale(self, client_name, sale, credits=None):
+        """Registra uma venda (e o saldo resultante do cliente, se alterado)"""
+        record = {"op": "sale", "client": client_name, "sale": sale}
+        if credits is not None:
+            record["credits"] = credits
+        self.append(record)
+
+    def append_update(self, client_name, sale):
+        """Registra a nova versão de uma venda existente (identificada pelo id)"""
+        self.append({"op": "update", "client": client_name, "sale": sale})
+
+    def append_credits(self, updates):
+        """Registra os novos saldos ({nome: créditos}) de clientes existentes"""
+        self.append({"op": "credits", "updates": updates})
+
+    def append_settle(self, updates):
+        """Registra a quitação: novos saldos e todas as vendas dos clientes pagas"""
+        self.append({"op": "settle", "updates": updates})
+
+    def compact(self, wait=False):
+        """Incorpora o diário ao snapshot em segundo plano"""
+        with self._lock:
+            if not self.is_compacting():
+                # Selar o diário atual; novas vendas passam a ir para um arquivo novo
+                if not os.path.exists(self.sealed_path):
+                    if self._pending == 0 or not os.path.exists(self.journal_path):
+                        return
+                    os.replace(self.journal_path, self.sealed_path)
+                    fsync_dir(self.sealed_path)
+                    self._pending = 0
+
+                self._compact_thread = threading.Thread(
+                    target=self._merge_sealed,
+                    name="sales-journal-compaction",
+                    daemon=True
+                )
+                self._compact_thread.start()
+            thread = self._compact_thread
+
+        if wait:
+            thread.join()
+
+    def _merge_sealed(self):
+        """Aplica o segmento selado sobre o snapshot e o remove"""
+        logger = get_logger()
+        try:
+            data = self._read_snapshot().full()
+            seen = {}
+            for record in read_records(self.sealed_path):
+                apply_record(data, record, seen)
+            if self._write_snapshot(data):
+                os.remove(self.sealed_path)
+                fsync_dir(self.sealed_path)
+                for callback in list(self.compaction_listeners):
+                    callback()
+        except OSError as e:
+            # O segmento selado permanece e é reaplicado na próxima carga/compactação
+            logger.error("Falha ao compactar diário de %s: %s", self.snapshot_path, e)
+
+    def is_compacting(self):
+        """Compactação em andamento (snapshot sendo regravado ou segmento removido)"""
+        thread = self._compact_thread
+        return thread is not None and thread.is_alive()
+
+    def wait(self):
+        """Aguarda uma compactação em andamento terminar"""
+        thread = self._compact_thread
+        if thread is not None:
+            thread.join()
+
+    def reset(self, data):
+        """Grava um snapshot completo e descarta o diário já incorporado nele"""
+        self.wait()
+        with self._lock:
+            if not self._write_snapshot(data):
+                raise OSError(f"Não foi possível salvar {self.snapshot_path}")
+            for path in (self.sealed_path, self.journal_path):
+                if os.path.exists(path):
+                    os.remove(path)
+            fsync_dir(self.journal_path)
+            self._pending = 0
+
+
+_journals = {}
+_journals_lock = threading.Lock()
+
+
+def get_journal(snapshot_path):
+    """Retorna o diário compartilhado para o snapshot informado"""
+    key = os.path.abspath(snapshot_path)
+    with _journals_lock:
+        journal = _journals.get(key)
+        if journal is None:
+            journal = SalesJournal(snapshot_path)
+            _journals[key] = journal
+        return journal
@@ -0,0 +1,116 @@
+import re
+import unicodedata
+
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+
+# Tamanho dos n-gramas usados para buscas no meio das palavras
+NGRAM_SIZE = 3
+
+
+def normalize(text):
+    """Minúsculas, sem acentos e apenas letras/números separados por espaço"""
+    text = unicodedata.normalize("NFKD", str(text or ""))
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return _NON_ALNUM.sub(" ", text.lower()).strip()
+
+
+def _bits(bitmap):
+    """Posições ligadas de um bitmap (int), em ordem crescente"""
+    while bitmap:
+        lowest = bitmap & -bitmap
+        yield lowest.bit_length() - 1
+        bitmap ^= lowest
+
+
+class ProductSearchIndex:
+    """Índice de busca de produtos: prefixos e n-gramas dos nomes, sem acentos.
+
+    Os conjuntos de produtos são bitmaps (int, um bit por produto), então
+    combinar termos da busca e o filtro de categoria é uma interseção (&)
+    em vez de uma nova varredura da lista. Consultas como "pao de q"
+    encontram "Pão de Queijo".
+    """
+
+    def __init__(self, products=None):
+        self.names = {}  # {id: nome normalizado}
+        self.tokens = {}  # {id: [palavras do nome]}
+        self.prefixes = {}  # {prefixo de palavra: bitmap}
+        self.ngrams = {}  # {n-grama: bitmap}
+        self.categories = {}  # {categoria normalizada: bitmap}
+        self.all_bits = 0
+        if products:
+            for doc_id, product in enumerate(products):
+                self.add(doc_id, product)
+
+    def add(self, doc_id, product):
+        """Indexa um produto com o identificador informado (ex.: posição na lista)"""
+        bit = 1 << doc_id
+        name = normalize(product.get("name", ""))
+        tokens = name.split()
+        self.names[doc_id] = name
+        self.tokens[doc_id] = tokens
+        self.all_bits |= bit
+
+        for token in tokens:
+            for end in range(1, len(token) + 1):
+                prefix = token[:end]
+                self.prefixes[prefix] = self.prefixes.get(prefix, 0) | bit
+            for start in range(len(token) - NGRAM_SIZE + 1):
+                gram = token[start:start + NGRAM_SIZE]
+                self.ngrams[gram] = self.ngrams.get(gram, 0) | bit
+
+        category = normalize(product.get("category", ""))
+        self.categories[category] = self.categories.get(category, 0) | bit
+
+    def _term_bits(self, term):
+        """Produtos com alguma palavra começando por term ou contendo term"""
+        bits = self.prefixes.get(term, 0)
+        if len(term) < NGRAM_SIZE:
+            return bits
+
+        candidates = self.all_bits
+        for start in range(len(term) - NGRAM_SIZE + 1):
+            candidates &= self.ngrams.get(term[start:start + NGRAM_SIZE], 0)
+            if not candidates:
+                return bits
+        # Os n-gramas só pré-selecionam; confirmar a substring no nome
+        for doc_id in _bits(candidates & ~bits):
+            if term in self.names[doc_id]:
+                bits |= 1 << doc_id
+        return bits
+
+    def _score(self, doc_id, terms, query):
+        tokens = self.tokens[doc_id]
+        score = 0
+        for term in terms:
+            if term in tokens:
+                score += 3
+            elif any(token.startswith(term) for token in tokens):
+                score += 2
+            else:
+                score += 1
+        if self.names[doc_id].startswith(query):
+            score += 2
+        return score
+
+    def search(self, query="", category=None):
+        """Ids dos produtos que casam com a busca e a categoria.
+
+        Sem busca, mantém a ordem original; com busca, os mais relevantes
+        (palavra exata, depois prefixo, depois trecho) vêm primeiro.
+        """
+        bits = self.all_bits
+        if category is not None:
+            bits &= self.categories.get(normalize(category), 0)
+
+        query = normalize(query)
+        terms = query.split()
+        for term in terms:
+            if not bits:
+                break
+            bits &= self._term_bits(term)
+
+        doc_ids = list(_bits(bits))
+        if terms:
+            doc_ids.sort(key=lambda doc_id: -self._score(doc_id, terms, query))
+        return doc_ids
@@ -0,0 +1,60 @@
+import builtins
+import sys
+import time
+
+# Quantidade de módulos listados no relatório (os de maior tempo próprio)
+TOP_MODULES = 15
+
+
+class StartupProfile:
+    """Mede a abertura do caixa: tempo de import de cada módulo e até o primeiro quadro.
+
+    Ativado por `python main.py --profile-startup`. Os imports são medidos
+    envolvendo builtins.__import__; o tempo próprio de um módulo exclui os
+    imports feitos por ele (mesma ideia do `python -X importtime`).
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.imports = []  # [(módulo, tempo próprio, tempo acumulado)]
+        self.marks = []  # [(etapa, segundos desde o início)]
+        self.import_total = 0.0  # soma dos imports de nível mais alto
+        self._stack = []
+        self._original_import = None
+
+    def install(self):
+        self._original_import = builtins.__import__
+        builtins.__import__ = self._import
+
+    def uninstall(self):
+        if self._original_import is not None:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        if level or name in sys.modules:
+            return self._original_import(name, globals, locals, fromlist, level)
+
+        self._stack.append(0.0)
+        started = time.perf_counter()
+        try:
+            return self._original_import(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - started
+            children = self._stack.pop()
+            self.imports.append((name, elapsed - children, elapsed))
+            if self._stack:
+                self._stack[-1] += elapsed
+            else:
+                self.import_total += elapsed
+
+    def mark(self, label):
+        self.marks.append((label, time.perf_counter() - self.started))
+
+    def report(self):
+        lines = ["Perfil de abertura do PDV", f"Imports: {self.import_total * 1000:.1f} ms"]
+        for name, own, cumulative in sorted(self.imports, key=lambda item: item[1], reverse=True)[:TOP_MODULES]:
+            lines.append(f"  {own * 1000:8.1f} ms  (acumulado {cumulative * 1000:8.1f} ms)  {name}")
+        for label, elapsed in self.marks:
+            lines.append(f"{label}: {elapsed * 1000:.1f} ms")
+        return "\n".join(lines)
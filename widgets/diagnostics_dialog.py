@@ -0,0 +1,100 @@
+import customtkinter as ctk
+from utils import instrumentation
+
+# Cores do tema escuro
+COLORS = {
+    "bg_dark": "#242424",
+    "bg_panel": "#2b2b2b",
+    "green": "#2ed573",
+    "red": "#ff4757",
+    "text_light": "#ffffff",
+    "text_gray": "#a0a0a0"
+}
+
+# Intervalo de atualização da tabela (ms)
+DIAGNOSTICS_REFRESH_MS = 1000
+
+
+class DiagnosticsDialog(ctk.CTkToplevel):
+    """Painel de diagnóstico: p50/p95/máximo de cada operação medida.
+
+    Não é modal: fica aberto ao lado do caixa enquanto as vendas acontecem.
+    """
+
+    def __init__(self, parent):
+        super().__init__(parent)
+
+        self.title("Diagnóstico de Desempenho")
+        self.geometry("820x460")
+        self.configure(fg_color=COLORS["bg_dark"])
+        self.refresh_job = None
+
+        main_frame = ctk.CTkFrame(self, fg_color=COLORS["bg_panel"], corner_radius=15)
+        main_frame.pack(fill="both", expand=True, padx=20, pady=20)
+
+        title_label = ctk.CTkLabel(
+            main_frame,
+            text="Tempos por operação",
+            font=ctk.CTkFont(size=20, weight="bold"),
+            text_color=COLORS["text_light"]
+        )
+        title_label.pack(pady=(15, 10))
+
+        self.textbox = ctk.CTkTextbox(
+            main_frame,
+            font=ctk.CTkFont(family="Courier", size=12),
+            fg_color=COLORS["bg_dark"],
+            text_color=COLORS["text_light"],
+            wrap="none"
+        )
+        self.textbox.pack(fill="both", expand=True, padx=15)
+
+        buttons_frame = ctk.CTkFrame(main_frame, fg_color="transparent")
+        buttons_frame.pack(pady=15)
+
+        reset_button = ctk.CTkButton(
+            buttons_frame,
+            text="Zerar",
+            width=120,
+            fg_color=COLORS["red"],
+            hover_color="#e84150",
+            command=self.reset
+        )
+        reset_button.pack(side="left", padx=10)
+
+        close_button = ctk.CTkButton(
+            buttons_frame,
+            text="Fechar",
+            width=120,
+            fg_color=COLORS["green"],
+            hover_color="#26c463",
+            text_color=COLORS["bg_dark"],
+            command=self.close
+        )
+        close_button.pack(side="left", padx=10)
+
+        self.protocol("WM_DELETE_WINDOW", self.close)
+        self.refresh()
+
+    def refresh(self):
+        """Redesenha a tabela e agenda a próxima atualização"""
+        lines = instrumentation.summary_lines()
+        if len(lines) == 1:
+            lines.append("Nenhuma medição ainda. Use o caixa normalmente com este painel aberto.")
+        self.textbox.configure(state="normal")
+        self.textbox.delete("1.0", "end")
+        self.textbox.insert("1.0", "\n".join(lines))
+        self.textbox.configure(state="disabled")
+        self.refresh_job = self.after(DIAGNOSTICS_REFRESH_MS, self.refresh)
+
+    def reset(self):
+        instrumentation.reset()
+        if self.refresh_job is not None:
+            self.after_cancel(self.refresh_job)
+        self.refresh()
+
+    def close(self):
+        if self.refresh_job is not None:
+            self.after_cancel(self.refresh_job)
+            self.refresh_job = None
+        self.destroy()
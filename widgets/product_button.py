@@ -1,5 +1,4 @@
 import customtkinter as ctk
-from PIL import Image, ImageTk
 import os
 import hashlib
 
@@ -33,6 +32,8 @@ class ProductCard(ctk.CTkFrame):
         self.icon = icon
         self.category = category
         self.selected = False
+        # Dados exibidos no card; se mudarem o card precisa ser recriado
+        self.signature = (price, icon, category)
         
         # Gerar cor baseada na categoria
         card_color = get_category_color(category, name)
@@ -2,6 +2,7 @@ import customtkinter as ctk
 from datetime import datetime, timedelta
 from tkinter import filedialog
 import calendar
+from reports.receipt_service import get_receipt_service, sale_to_order
 
 # Cores do tema escuro
 COLORS = {
@@ -13,6 +14,9 @@ COLORS = {
     "text_gray": "#a0a0a0"
 }
 
+# Quantidade de vendas exibidas por página ("Carregar mais" mostra a próxima)
+SALES_PAGE_SIZE = 30
+
 def format_time_ago(date_str, timestamp_str=None):
     """Retorna string formatada de há quanto tempo foi a venda"""
     try:
@@ -80,11 +84,18 @@ def convert_dd_mm_yyyy_to_yyyy_mm_dd(date_str):
 class SalesSelectionDialog(ctk.CTkToplevel):
     """Diálogo para selecionar uma venda e gerar comprovante"""
     
-    def __init__(self, parent, client_name, sales_data, company_data, client_data=None):
+    def __init__(self, parent, client_name, sales_data, company_data, client_data=None, on_receipt_submitted=None):
         super().__init__(parent)
         
         self.client_name = client_name
-        self.sales_data = sales_data.copy() if sales_data else []
+        # Se informado, o comprovante é gerado em segundo plano e o Future é repassado
+        self.on_receipt_submitted = on_receipt_submitted
+        # Ordenar vendas por data uma única vez (mais recente primeiro); os filtros preservam a ordem
+        self.sales_data = sorted(
+            sales_data or [],
+            key=lambda x: x.get("date", ""),
+            reverse=True
+        )
         self.company_data = company_data
         self.client_data = client_data or {}
         self.selected_sale = None
@@ -220,11 +231,26 @@ class SalesSelectionDialog(ctk.CTkToplevel):
         scroll_frame.pack(fill="both", expand=True, padx=20, pady=(0, 15))
         
         self.sales_list_frame = scroll_frame
-        self.sales_widgets = []
+        self.sales_widgets = []  # linhas criadas (reaproveitadas a cada filtro)
+        self.selected_row = None
+        self.visible_count = 0
         
-        # Carregar vendas
-        self.filtered_sales = self.sales_data.copy()
-        self.display_sales()
+        self.empty_label = ctk.CTkLabel(
+            scroll_frame,
+            text="Nenhuma venda encontrada",
+            font=ctk.CTkFont(size=14),
+            text_color=COLORS["text_gray"]
+        )
+        self.load_more_btn = ctk.CTkButton(
+            scroll_frame,
+            text="Carregar mais",
+            font=ctk.CTkFont(size=12),
+            corner_radius=10,
+            height=30,
+            fg_color=COLORS["bg_panel"],
+            hover_color="#333333",
+            command=self.load_more
+        )
         
         # Botões de ação
         buttons_frame = ctk.CTkFrame(main_frame, fg_color="transparent")
@@ -257,6 +283,10 @@ class SalesSelectionDialog(ctk.CTkToplevel):
         )
         self.generate_btn.grid(row=0, column=1, sticky="ew", padx=(5, 0))
         
+        # Carregar vendas
+        self.filtered_sales = self.sales_data.copy()
+        self.display_sales()
+        
         # Centralizar após criar a janela
         self.after(100, self._center_on_screen)
     
@@ -284,41 +314,58 @@ class SalesSelectionDialog(ctk.CTkToplevel):
             pass
     
     def display_sales(self):
-        """Exibe a lista de vendas"""
-        # Limpar lista anterior
-        for widget in self.sales_list_frame.winfo_children():
-            widget.destroy()
-        self.sales_widgets.clear()
-        
+        """Exibe a primeira página da lista de vendas filtrada"""
+        self.visible_count = min(SALES_PAGE_SIZE, len(self.filtered_sales))
+        self.render_rows()
+        # Voltar ao topo da lista ao trocar o filtro
+        try:
+            self.sales_list_frame._parent_canvas.yview_moveto(0)
+        except Exception:
+            pass
+
+    def render_rows(self):
+        """Mostra as linhas visíveis reaproveitando os widgets já criados"""
+        self.load_more_btn.pack_forget()
+        if self.selected_row is not None:
+            self.selected_row["frame"].configure(border_color=COLORS["bg_panel"])
+            self.selected_row = None
+
         if not self.filtered_sales:
-            empty_label = ctk.CTkLabel(
-                self.sales_list_frame,
-                text="Nenhuma venda encontrada",
-                font=ctk.CTkFont(size=14),
-                text_color=COLORS["text_gray"]
-            )
-            empty_label.pack(pady=20)
-            return
-        
-        # Ordenar vendas por data (mais recente primeiro)
-        sorted_sales = sorted(
-            self.filtered_sales,
-            key=lambda x: x.get("date", ""),
-            reverse=True
-        )
-        
-        for sale in sorted_sales:
-            self.create_sale_item(sale)
-    
-    def create_sale_item(self, sale):
-        """Cria um item de venda na lista"""
-        sale_id = sale.get("id", 0)
-        date_str = sale.get("date", "")
-        timestamp_str = sale.get("timestamp", None)
-        total = sale.get("total", 0.0)
-        payment_method = sale.get("payment_method", "N/A")
-        time_ago = format_time_ago(date_str, timestamp_str)
-        
+            self.empty_label.pack(pady=20)
+        else:
+            self.empty_label.pack_forget()
+
+        while len(self.sales_widgets) < self.visible_count:
+            self.sales_widgets.append(self.create_sale_item())
+
+        for index, row in enumerate(self.sales_widgets):
+            if index < self.visible_count:
+                self.bind_sale_item(row, self.filtered_sales[index])
+                # Manter o destaque da venda selecionada ao carregar mais linhas
+                if self.selected_sale is not None and row["sale"] is self.selected_sale:
+                    row["frame"].configure(border_color=COLORS["green"])
+                    self.selected_row = row
+                if not row["visible"]:
+                    row["frame"].pack(fill="x", padx=5, pady=5)
+                    row["visible"] = True
+            elif row["visible"]:
+                row["frame"].pack_forget()
+                row["visible"] = False
+
+        remaining = len(self.filtered_sales) - self.visible_count
+        if remaining > 0:
+            self.load_more_btn.configure(text=f"Carregar mais ({remaining} restantes)")
+            self.load_more_btn.pack(pady=10)
+
+    def load_more(self):
+        """Mostra a próxima página de vendas"""
+        self.visible_count = min(self.visible_count + SALES_PAGE_SIZE, len(self.filtered_sales))
+        self.render_rows()
+
+    def create_sale_item(self):
+        """Cria os widgets de uma linha da lista (reaproveitada entre filtros)"""
+        row = {"sale": None, "visible": False}
+
         # Frame do item
         item_frame = ctk.CTkFrame(
             self.sales_list_frame,
@@ -327,76 +374,85 @@ class SalesSelectionDialog(ctk.CTkToplevel):
             border_width=2,
             border_color=COLORS["bg_panel"]
         )
-        item_frame.pack(fill="x", padx=5, pady=5)
         item_frame.grid_columnconfigure(1, weight=1)
-        
-        # Bind para seleção
-        def select_sale(s):
-            self.selected_sale = s
-            # Atualizar visual de todos os itens
-            for w in self.sales_widgets:
-                w["frame"].configure(border_color=COLORS["bg_panel"])
-            item_frame.configure(border_color=COLORS["green"])
-            self.generate_btn.configure(state="normal")
-        
-        item_frame.bind("<Button-1>", lambda e, s=sale: select_sale(s))
-        
+        row["frame"] = item_frame
+
         # ID da venda
-        id_label = ctk.CTkLabel(
+        row["id_label"] = ctk.CTkLabel(
             item_frame,
-            text=f"#{sale_id}",
+            text="",
             font=ctk.CTkFont(size=12, weight="bold"),
             text_color=COLORS["green"],
             width=50
         )
-        id_label.grid(row=0, column=0, sticky="w", padx=10, pady=10)
-        id_label.bind("<Button-1>", lambda e, s=sale: select_sale(s))
-        
+        row["id_label"].grid(row=0, column=0, sticky="w", padx=10, pady=10)
+
         # Informações da venda
         info_frame = ctk.CTkFrame(item_frame, fg_color="transparent")
         info_frame.grid(row=0, column=1, sticky="ew", padx=(0, 10), pady=10)
         info_frame.grid_columnconfigure(0, weight=1)
-        
-        # Data e tempo relativo - Converter para DD-MM-YYYY para exibição
-        date_display = convert_yyyy_mm_dd_to_dd_mm_yyyy(date_str)
-        date_label = ctk.CTkLabel(
+
+        # Data e tempo relativo
+        row["date_label"] = ctk.CTkLabel(
             info_frame,
-            text=f"{date_display} ({time_ago})",
+            text="",
             font=ctk.CTkFont(size=13, weight="bold"),
             text_color=COLORS["text_light"],
             anchor="w"
         )
-        date_label.grid(row=0, column=0, sticky="w", pady=(0, 5))
-        date_label.bind("<Button-1>", lambda e, s=sale: select_sale(s))
-        
+        row["date_label"].grid(row=0, column=0, sticky="w", pady=(0, 5))
+
         # Método de pagamento
-        method_label = ctk.CTkLabel(
+        row["method_label"] = ctk.CTkLabel(
             info_frame,
-            text=f"Método: {payment_method}",
+            text="",
             font=ctk.CTkFont(size=11),
             text_color=COLORS["text_gray"],
             anchor="w"
         )
-        method_label.grid(row=1, column=0, sticky="w")
-        method_label.bind("<Button-1>", lambda e, s=sale: select_sale(s))
-        
+        row["method_label"].grid(row=1, column=0, sticky="w")
+
         # Valor
-        value_label = ctk.CTkLabel(
+        row["value_label"] = ctk.CTkLabel(
             item_frame,
-            text=f"R$ {total:.2f}",
+            text="",
             font=ctk.CTkFont(size=16, weight="bold"),
             text_color=COLORS["green"],
             width=120
         )
-        value_label.grid(row=0, column=2, sticky="e", padx=10, pady=10)
-        value_label.bind("<Button-1>", lambda e, s=sale: select_sale(s))
-        
-        # Armazenar referência
-        self.sales_widgets.append({
-            "frame": item_frame,
-            "sale": sale
-        })
-    
+        row["value_label"].grid(row=0, column=2, sticky="e", padx=10, pady=10)
+
+        # Bind para seleção (a venda é lida da linha no momento do clique)
+        for widget in (item_frame, row["id_label"], row["date_label"], row["method_label"], row["value_label"]):
+            widget.bind("<Button-1>", lambda e, r=row: self.select_sale_item(r))
+
+        return row
+
+    def bind_sale_item(self, row, sale):
+        """Preenche uma linha da lista com os dados de uma venda"""
+        if row["sale"] is sale:
+            return
+        row["sale"] = sale
+
+        date_str = sale.get("date", "")
+        time_ago = format_time_ago(date_str, sale.get("timestamp", None))
+        # Converter para DD-MM-YYYY para exibição
+        date_display = convert_yyyy_mm_dd_to_dd_mm_yyyy(date_str)
+
+        row["id_label"].configure(text=f"#{sale.get('id', 0)}")
+        row["date_label"].configure(text=f"{date_display} ({time_ago})")
+        row["method_label"].configure(text=f"Método: {sale.get('payment_method', 'N/A')}")
+        row["value_label"].configure(text=f"R$ {sale.get('total', 0.0):.2f}")
+
+    def select_sale_item(self, row):
+        """Seleciona a venda exibida na linha"""
+        if self.selected_row is not None:
+            self.selected_row["frame"].configure(border_color=COLORS["bg_panel"])
+        self.selected_row = row
+        self.selected_sale = row["sale"]
+        row["frame"].configure(border_color=COLORS["green"])
+        self.generate_btn.configure(state="normal")
+
     def apply_filters(self):
         """Aplica filtros de data"""
         date_start = self.date_start_entry.get().strip()
@@ -423,18 +479,18 @@ class SalesSelectionDialog(ctk.CTkToplevel):
                 pass
         
         self.filtered_sales = filtered
-        self.display_sales()
         self.selected_sale = None
         self.generate_btn.configure(state="disabled")
+        self.display_sales()
     
     def clear_filters(self):
         """Limpa os filtros"""
         self.date_start_entry.delete(0, ctk.END)
         self.date_end_entry.delete(0, ctk.END)
         self.filtered_sales = self.sales_data.copy()
-        self.display_sales()
         self.selected_sale = None
         self.generate_btn.configure(state="disabled")
+        self.display_sales()
     
     def generate_receipt(self):
         """Gera o comprovante da venda selecionada"""
@@ -456,25 +512,26 @@ class SalesSelectionDialog(ctk.CTkToplevel):
         if not file_path:
             return
         
+        # Converter venda para formato de order
+        order = sale_to_order(self.selected_sale)
+        
+        # Usar dados completos do cliente se disponíveis
+        future = get_receipt_service().submit(
+            self.client_name,
+            self.client_data,
+            order,
+            file_path,
+            company_data=self.company_data
+        )
+        
+        if self.on_receipt_submitted is not None:
+            # A janela principal acompanha a geração; o diálogo já pode fechar
+            self.on_receipt_submitted(future)
+            self.cancel_action()
+            return
+        
         try:
-            from reports.receipt_generator import generate_receipt_pdf
-            
-            # Converter venda para formato de order
-            order = {
-                "timestamp": f"{self.selected_sale.get('date', '')} 00:00:00",
-                "items": self.selected_sale.get("items", []),
-                "total": self.selected_sale.get("total", 0.0),
-                "payment_method": self.selected_sale.get("payment_method", "N/A")
-            }
-            
-            # Usar dados completos do cliente se disponíveis
-            generate_receipt_pdf(
-                self.client_name,
-                self.client_data,
-                order,
-                file_path,
-                company_data=self.company_data
-            )
+            future.result()
             
             # Mostrar sucesso e abrir PDF
             from widgets.alert_dialog import AlertDialog